@@ -20,7 +20,11 @@ class ReservationAdmin(admin.ModelAdmin):
     inlines = (TicketInLine,)
 
 
+@admin.register(ShowSession)
+class ShowSessionAdmin(admin.ModelAdmin):
+    readonly_fields = ("tickets_sold",)
+
+
 admin.site.register(ShowTheme)
 admin.site.register(PlanetariumDome)
 admin.site.register(AstronomyShow)
-admin.site.register(ShowSession)
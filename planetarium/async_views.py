@@ -0,0 +1,154 @@
+from functools import partial
+
+from asgiref.sync import (
+    iscoroutinefunction,
+    markcoroutinefunction,
+    sync_to_async
+)
+from django.core.exceptions import ValidationError
+from django.http import Http404
+from rest_framework import status
+from rest_framework.response import Response
+
+from planetarium.seat_map import get_seat_map
+from planetarium.views import (
+    AstronomyShowViewSet,
+    ShowSessionViewSet,
+    ReservationViewSet
+)
+
+
+# Serve viewset actions with coroutines under ASGI.
+#
+# Authentication, permissions and throttling run in a single thread
+# hop before the handler. Async handlers query the database with
+# the async ORM, sync handlers (e.g. updates) run in a thread.
+# (A docstring here would describe every undocumented action
+# of the viewsets in the schema.)
+class AsyncViewSetMixin:
+    @classmethod
+    def as_view(cls, actions=None, **initkwargs):
+        view = super().as_view(actions, **initkwargs)
+        return markcoroutinefunction(view)
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+
+            handler = self.http_method_not_allowed
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(
+                    self, request.method.lower(), self.http_method_not_allowed
+                )
+            if not iscoroutinefunction(handler):
+                handler = sync_to_async(handler)
+            response = await handler(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(
+            request, response, *args, **kwargs
+        )
+        return self.response
+
+    async def aget_object(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            obj = await queryset.aget(
+                **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+            )
+        except (
+                queryset.model.DoesNotExist,
+                TypeError,
+                ValueError,
+                ValidationError
+        ):
+            raise Http404
+        self.check_object_permissions(self.request, obj)
+        return obj
+
+
+def documented_as(sync_action):
+    """
+    Document an async action like the sync action it replaces:
+    its docstring and its @extend_schema annotation.
+    """
+    def decorator(async_action):
+        async_action.__doc__ = sync_action.__doc__
+        if hasattr(sync_action, "kwargs"):
+            async_action.kwargs = sync_action.kwargs
+        return async_action
+    return decorator
+
+
+class AsyncAstronomyShowViewSet(AsyncViewSetMixin, AstronomyShowViewSet):
+    @documented_as(AstronomyShowViewSet.list)
+    async def list(self, request, *args, **kwargs):
+        return await self.acached_response(
+            partial(self.aconditional_response, self.list_astronomy_shows),
+            request,
+            *args,
+            **kwargs
+        )
+
+    async def list_astronomy_shows(self, request, *args, **kwargs):
+        values_serializer = self.get_values_serializer()
+        queryset = self.get_values_queryset(values_serializer)
+        rows = [row async for row in queryset]
+        # Show themes are fetched with the rows of the page.
+        data = await sync_to_async(values_serializer.to_representation)(rows)
+        return Response(data, status=status.HTTP_200_OK)
+
+
+class AsyncShowSessionViewSet(AsyncViewSetMixin, ShowSessionViewSet):
+    @documented_as(ShowSessionViewSet.list)
+    async def list(self, request, *args, **kwargs):
+        return await self.aconditional_response(
+            self.list_show_sessions, request, *args, **kwargs
+        )
+
+    async def list_show_sessions(self, request, *args, **kwargs):
+        values_serializer = self.get_values_serializer()
+        queryset = self.get_values_queryset(values_serializer)
+        # The cursor paginator fetches the page itself,
+        # so it runs in one thread hop like a single async query.
+        page = await sync_to_async(self.paginate_queryset)(queryset)
+        return self.get_paginated_response(
+            values_serializer.to_representation(page)
+        )
+
+    @documented_as(ShowSessionViewSet.retrieve)
+    async def retrieve(self, request, *args, **kwargs):
+        return await self.aconditional_response(
+            self.retrieve_show_session, request, *args, **kwargs
+        )
+
+    async def retrieve_show_session(self, request, *args, **kwargs):
+        show_session = await self.aget_object()
+        show_session.seat_map = await sync_to_async(get_seat_map)(
+            show_session.id, show_session
+        )
+        serializer = self.get_serializer(show_session)
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+class AsyncReservationViewSet(AsyncViewSetMixin, ReservationViewSet):
+    @documented_as(ReservationViewSet.create)
+    async def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        # Transactions are not available to the async ORM, so the
+        # reservation is validated and saved in a single thread hop.
+        data = await sync_to_async(self.save_reservation)(serializer)
+        return Response(data, status=status.HTTP_201_CREATED)
+
+    def save_reservation(self, serializer):
+        serializer.is_valid(raise_exception=True)
+        self.perform_create(serializer)
+        return serializer.data
@@ -0,0 +1,133 @@
+import random
+from datetime import datetime, timedelta, timezone
+
+from django.contrib.auth import get_user_model
+
+from planetarium.models import (
+    AstronomyShow,
+    PlanetariumDome,
+    Reservation,
+    ShowSession,
+    ShowSessionDailyRollup,
+    ShowTheme,
+    Ticket
+)
+
+
+BATCH_SIZE = 5000
+TICKETS_PER_RESERVATION = 4
+FIRST_SHOW_TIME = datetime(2024, 11, 1, 10, tzinfo=timezone.utc)
+
+WORDS = (
+    "black hole", "big bang", "andromeda", "milky way", "nebula",
+    "supernova", "pulsar", "dark matter", "comet", "exoplanet",
+    "aurora", "red giant", "quasar", "eclipse", "saturn rings",
+)
+
+
+def seed(scale: float = 1.0, random_seed: int = 0) -> dict:
+    """
+    Fill the database with a realistic catalog and sales history:
+    at scale 1, 20 domes, 5000 show sessions and about 200000 tickets.
+    Ticket counters and daily rollups are set directly, bypassing the
+    signals.
+    Return the number of objects created per model.
+    """
+    rnd = random.Random(random_seed)
+
+    def scaled(count):
+        return max(1, int(count * scale))
+
+    show_themes = ShowTheme.objects.bulk_create(
+        ShowTheme(name=f"{word.title()} {number}")
+        for number in range(scaled(3)) for word in WORDS
+    )
+    planetarium_domes = PlanetariumDome.objects.bulk_create(
+        PlanetariumDome(
+            name=f"Dome {number}",
+            rows=rnd.randint(10, 25),
+            seats_in_row=rnd.randint(15, 30),
+        )
+        for number in range(20)
+    )
+    astronomy_shows = AstronomyShow.objects.bulk_create(
+        AstronomyShow(
+            title=f"{rnd.choice(WORDS).title()} {number}",
+            description=" ".join(rnd.choices(WORDS, k=12)),
+        )
+        for number in range(scaled(300))
+    )
+    AstronomyShow.show_themes.through.objects.bulk_create(
+        AstronomyShow.show_themes.through(
+            astronomyshow_id=astronomy_show.id, showtheme_id=show_theme.id
+        )
+        for astronomy_show in astronomy_shows
+        for show_theme in rnd.sample(show_themes, 3)
+    )
+
+    users = get_user_model().objects.bulk_create(
+        get_user_model()(email=f"customer{number}@example.com")
+        for number in range(scaled(1000))
+    )
+
+    show_sessions = []
+    sold_seats = []
+    for number in range(scaled(5000)):
+        planetarium_dome = rnd.choice(planetarium_domes)
+        # Most sessions sell a few dozen seats, a few are sold out.
+        sold = min(
+            planetarium_dome.capacity,
+            int(rnd.expovariate(1 / 40)) // TICKETS_PER_RESERVATION
+            * TICKETS_PER_RESERVATION
+        )
+        show_sessions.append(ShowSession(
+            astronomy_show=rnd.choice(astronomy_shows),
+            planetarium_dome=planetarium_dome,
+            show_time=FIRST_SHOW_TIME + timedelta(hours=3 * number),
+            tickets_sold=sold,
+        ))
+        sold_seats.append(sold)
+    ShowSession.objects.bulk_create(show_sessions, batch_size=BATCH_SIZE)
+
+    reservations = Reservation.objects.bulk_create(
+        (
+            Reservation(user=rnd.choice(users))
+            for sold in sold_seats
+            for _ in range(0, sold, TICKETS_PER_RESERVATION)
+        ),
+        batch_size=BATCH_SIZE
+    )
+
+    def tickets():
+        reservation_iter = iter(reservations)
+        for show_session, sold in zip(show_sessions, sold_seats):
+            seats_in_row = show_session.planetarium_dome.seats_in_row
+            for index in range(sold):
+                if index % TICKETS_PER_RESERVATION == 0:
+                    reservation = next(reservation_iter)
+                yield Ticket(
+                    show_session=show_session,
+                    reservation=reservation,
+                    row=index // seats_in_row + 1,
+                    seat=index % seats_in_row + 1,
+                )
+
+    tickets_count = 0
+    batch = []
+    for ticket in tickets():
+        batch.append(ticket)
+        if len(batch) == BATCH_SIZE:
+            tickets_count += len(Ticket.objects.bulk_create(batch))
+            batch = []
+    tickets_count += len(Ticket.objects.bulk_create(batch))
+    ShowSessionDailyRollup.rebuild()
+
+    return {
+        "show themes": len(show_themes),
+        "planetarium domes": len(planetarium_domes),
+        "astronomy shows": len(astronomy_shows),
+        "users": len(users),
+        "show sessions": len(show_sessions),
+        "reservations": len(reservations),
+        "tickets": tickets_count,
+    }
@@ -0,0 +1,150 @@
+import hashlib
+import time
+from typing import Iterable, Type
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.db import models
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe
+from rest_framework import status
+from rest_framework.response import Response
+
+from planetarium.conditional import VALIDATOR_HEADERS
+from planetarium.replicas import use_primary
+
+
+RESPONSE_CACHE_TIMEOUT = 60 * 60
+
+
+def get_versions(keys: list[str], timeout=None) -> list[int]:
+    """
+    Return the versions stored under cache keys, starting unknown
+    versions from the current time so that a version key evicted from
+    the cache never comes back with an old value.
+    """
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, time.time_ns(), timeout)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def get_version(key: str, timeout=None) -> int:
+    return get_versions([key], timeout)[0]
+
+
+def bump_version(key: str, timeout=None) -> int:
+    """Increment the version of a cache key, return the new version."""
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # Unless a concurrent read has just started the version.
+        version = time.time_ns()
+        if cache.add(key, version, timeout):
+            return version
+        return cache.incr(key)
+
+
+def model_version_key(model: Type[models.Model]) -> str:
+    return f"planetarium:version:{model._meta.label_lower}"
+
+
+def get_model_versions(
+        model_classes: Iterable[Type[models.Model]]
+) -> list[int]:
+    return get_versions([model_version_key(model) for model in model_classes])
+
+
+def bump_model_version(model: Type[models.Model]) -> None:
+    bump_version(model_version_key(model))
+
+
+class CachedResponseMixin:
+    """
+    Serve safe viewset actions from the cache, keyed by the request
+    URL and the versions of `cache_models`. Bumping a model version
+    invalidates every cached response that depends on it. Cached
+    responses keep their validators (ETag, Last-Modified) and answer
+    conditional requests with them.
+    """
+
+    cache_models: tuple = ()
+    cached_actions = ("list", "retrieve")
+
+    def get_response_cache_key(self, request) -> str:
+        query = sorted(request.query_params.lists())
+        versions = get_model_versions(self.cache_models)
+        raw_key = (
+            f"{request.scheme}://{request.get_host()}{request.path}"
+            f"?{query}#{versions}"
+        )
+        return (
+            "planetarium:response:v2:"
+            + hashlib.md5(raw_key.encode()).hexdigest()
+        )
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+    def get_cached_response(self, request) -> tuple[str, object]:
+        key = self.get_response_cache_key(request)
+        return key, cache.get(key)
+
+    @staticmethod
+    def to_cache(response) -> tuple:
+        return response.data, {
+            header: response[header]
+            for header in VALIDATOR_HEADERS if header in response
+        }
+
+    @staticmethod
+    def from_cache(request, data, headers: dict):
+        return get_conditional_response(
+            request,
+            etag=headers.get("ETag"),
+            last_modified=parse_http_date_safe(
+                headers.get("Last-Modified", "")
+            ),
+            response=Response(
+                data, status=status.HTTP_200_OK, headers=headers
+            )
+        )
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        if self.action not in self.cached_actions:
+            return handler(request, *args, **kwargs)
+
+        key, cached = self.get_cached_response(request)
+        if cached is not None:
+            return self.from_cache(request, *cached)
+
+        # Versions are bumped on commit: a lagging replica could cache
+        # the data from before the write under the new version.
+        with use_primary():
+            response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(key, self.to_cache(response), RESPONSE_CACHE_TIMEOUT)
+        return response
+
+    async def acached_response(self, handler, request, *args, **kwargs):
+        if self.action not in self.cached_actions:
+            return await handler(request, *args, **kwargs)
+
+        key, cached = await sync_to_async(self.get_cached_response)(request)
+        if cached is not None:
+            return self.from_cache(request, *cached)
+
+        with use_primary():
+            response = await handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            await cache.aset(
+                key, self.to_cache(response), RESPONSE_CACHE_TIMEOUT
+            )
+        return response
@@ -0,0 +1,235 @@
+import hashlib
+from typing import Optional
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ValidationError
+from django.db.models import Count, F, Max, QuerySet
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework import status
+
+
+# The headers of the validators, kept with cached responses.
+VALIDATOR_HEADERS = ("ETag", "Last-Modified")
+
+
+def set_validators(response, validators: Optional[dict]):
+    if validators is not None and response.status_code in (
+            status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED
+    ):
+        response["ETag"] = validators["etag"]
+        if validators["last_modified"] is not None:
+            response["Last-Modified"] = http_date(
+                validators["last_modified"]
+            )
+    return response
+
+
+class ConditionalGetMixin:
+    """
+    Answer conditional requests (If-None-Match, If-Modified-Since) of
+    the `conditional_actions` with 304 Not Modified, without running
+    the action. The validators come from a single query: the latest of
+    the `last_modified_lookups` over the rows the action serves and
+    their count, which changes on deletions, or the keys and links of
+    the page for paginated lists. Unconditional requests of paginated
+    lists take them from the page the action fetched instead. Lists
+    have no Last-Modified, as the latest modification of their rows
+    misses deleted ones; it has second precision anyway, so clients
+    should prefer the ETag.
+    """
+
+    conditional_actions = ("list", "retrieve")
+    last_modified_lookups: tuple = ("updated_at",)
+
+    def get_validator_queryset(self) -> QuerySet:
+        queryset = self.filter_queryset(self.get_queryset())
+        if self.action == "retrieve":
+            lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+            queryset = queryset.filter(
+                **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+            )
+        return queryset
+
+    def get_rows_version(self, queryset: QuerySet) -> tuple:
+        """The count and the last modification of the rows."""
+        aggregates = queryset.aggregate(
+            rows=Count("pk"),
+            **{
+                f"last_modified_{index}": Max(lookup)
+                for index, lookup in enumerate(self.last_modified_lookups)
+            }
+        )
+        rows = aggregates.pop("rows")
+        return rows, max(filter(None, aggregates.values()), default=None)
+
+    def get_last_modified_expressions(self) -> dict:
+        return {
+            f"last_modified_{index}": F(lookup)
+            for index, lookup in enumerate(self.last_modified_lookups)
+        }
+
+    def get_page_version(self, queryset: QuerySet) -> tuple:
+        """
+        The keys and links of the page and the last modification of
+        its rows: counting every row is what paginating avoids.
+        """
+        # Cursor pagination reads the position from the ordering fields.
+        ordering = (
+            lookup.lstrip("-")
+            for lookup in getattr(self.paginator, "ordering", ())
+        )
+        page = self.paginate_queryset(
+            queryset.values(
+                queryset.model._meta.pk.attname,
+                *ordering,
+                **self.get_last_modified_expressions()
+            )
+        )
+        return self.get_rows_page_version(page, queryset.model)
+
+    def get_rows_page_version(self, page, model) -> Optional[tuple]:
+        """
+        The page version of the rows of the current page, None unless
+        they are values() rows with the last modification lookups.
+        """
+        pk_key = model._meta.pk.attname
+        keys = {pk_key, *self.get_last_modified_expressions()}
+        rows = list(page)
+        if not all(
+                isinstance(row, dict) and keys <= row.keys() for row in rows
+        ):
+            return None
+        links = self.get_paginated_response([]).data
+        links.pop("results", None)
+        last_modified = max(
+            (
+                row[f"last_modified_{index}"] for row in rows
+                for index in range(len(self.last_modified_lookups))
+            ),
+            default=None
+        )
+        return ([row[pk_key] for row in rows], links), last_modified
+
+    def get_values_queryset(self, values_serializer) -> QuerySet:
+        # Paginated lists of ValuesListMixin fetch what their page
+        # version needs with their rows.
+        queryset = super().get_values_queryset(values_serializer)
+        if self.action == "list" and self.paginator is not None:
+            queryset = queryset.annotate(
+                **self.get_last_modified_expressions()
+            )
+        return queryset
+
+    def get_validators(self, request) -> Optional[dict]:
+        """
+        The weak ETag and the Last-Modified timestamp (None for lists)
+        of the response, None when the object to retrieve does not
+        exist.
+        """
+        try:
+            queryset = self.get_validator_queryset()
+        except (TypeError, ValueError, ValidationError):
+            # An invalid lookup value, the action answers 404.
+            return None
+        if self.action == "list" and self.paginator is not None:
+            version, last_modified = self.get_page_version(queryset)
+        else:
+            version, last_modified = self.get_rows_version(queryset)
+            if self.action == "retrieve" and not version:
+                return None
+        return self.make_validators(request, version, last_modified)
+
+    def get_response_validators(self, request) -> Optional[dict]:
+        """
+        The validators of a paginated list from the page its handler
+        fetched, from a query if the rows lack the lookups.
+        """
+        page = getattr(self.paginator, "page", None)
+        page_version = None
+        if page is not None:
+            page_version = self.get_rows_page_version(
+                page, self.get_queryset().model
+            )
+        if page_version is None:
+            return self.get_validators(request)
+        return self.make_validators(request, *page_version)
+
+    def make_validators(self, request, version, last_modified) -> dict:
+        query = sorted(request.query_params.lists())
+        raw_etag = (
+            f"{request.scheme}://{request.get_host()}{request.path}"
+            f"?{query}#{request.accepted_media_type}#{version}"
+            f"#{last_modified and last_modified.isoformat()}"
+        )
+        if self.action == "list":
+            last_modified = None
+        return {
+            "etag": f'W/"{hashlib.md5(raw_etag.encode()).hexdigest()}"',
+            "last_modified": (
+                last_modified and int(last_modified.timestamp())
+            ),
+        }
+
+    def validates_first(self, request) -> bool:
+        """
+        Whether to take the validators before the action: always but
+        for paginated lists requested unconditionally, whose page query
+        the validators would repeat.
+        """
+        return (
+            self.action != "list"
+            or self.paginator is None
+            or any(header in request.headers for header in (
+                "If-None-Match", "If-Modified-Since"
+            ))
+        )
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().list, request, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        if self.action not in self.conditional_actions:
+            return handler(request, *args, **kwargs)
+
+        if not self.validates_first(request):
+            response = handler(request, *args, **kwargs)
+            return set_validators(
+                response, self.get_response_validators(request)
+            )
+
+        # Taken before the action: a write in between changes the
+        # validators of the next request, never hides from them.
+        validators = self.get_validators(request)
+        response = None
+        if validators is not None:
+            response = get_conditional_response(request, **validators)
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        return set_validators(response, validators)
+
+    async def aconditional_response(self, handler, request, *args, **kwargs):
+        if self.action not in self.conditional_actions:
+            return await handler(request, *args, **kwargs)
+
+        if not self.validates_first(request):
+            response = await handler(request, *args, **kwargs)
+            validators = await sync_to_async(self.get_response_validators)(
+                request
+            )
+            return set_validators(response, validators)
+
+        validators = await sync_to_async(self.get_validators)(request)
+        response = None
+        if validators is not None:
+            response = get_conditional_response(request, **validators)
+        if response is None:
+            response = await handler(request, *args, **kwargs)
+        return set_validators(response, validators)
@@ -0,0 +1,29 @@
+from datetime import date, datetime, time, timedelta
+from typing import Optional
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+
+def day_start(day: date) -> datetime:
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def parse_time_bound(value: str, end: bool = False) -> Optional[datetime]:
+    """
+    Turn a date or datetime query param into a time range bound.
+    A date used as an end bound includes the whole day.
+    """
+    try:
+        parsed_date = parse_date(value)
+        parsed_datetime = None if parsed_date else parse_datetime(value)
+    except ValueError:
+        return None
+
+    if parsed_date:
+        if end:
+            parsed_date += timedelta(days=1)
+        return day_start(parsed_date)
+    if parsed_datetime and timezone.is_naive(parsed_datetime):
+        parsed_datetime = timezone.make_aware(parsed_datetime)
+    return parsed_datetime
@@ -0,0 +1,81 @@
+import csv
+from datetime import datetime
+from typing import Iterator, Optional
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import QuerySet
+
+from planetarium.models import Ticket
+
+
+EXPORT_CHUNK_SIZE = 2000
+EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+# Column name and ticket lookup of every exported field.
+TICKET_EXPORT_FIELDS = (
+    ("ticket_id", "id"),
+    ("row", "row"),
+    ("seat", "seat"),
+    ("reservation_id", "reservation_id"),
+    ("reserved_at", "reservation__created_at"),
+    ("user_id", "reservation__user_id"),
+    ("user_email", "reservation__user__email"),
+    ("show_session_id", "show_session_id"),
+    ("show_time", "show_session__show_time"),
+    ("astronomy_show_id", "show_session__astronomy_show_id"),
+    ("astronomy_show_title", "show_session__astronomy_show__title"),
+    ("planetarium_dome_id", "show_session__planetarium_dome_id"),
+    ("planetarium_dome_name", "show_session__planetarium_dome__name"),
+)
+
+
+def ticket_export_queryset(
+        reserved_from: Optional[datetime] = None,
+        reserved_to: Optional[datetime] = None,
+        show_session: Optional[int] = None
+) -> QuerySet:
+    """
+    Tickets joined to their reservation, user, show session, show and
+    dome as value tuples, optionally limited to reservations made in
+    [reserved_from, reserved_to) and to a show session.
+    """
+    queryset = Ticket.objects.all()
+    if reserved_from:
+        queryset = queryset.filter(reservation__created_at__gte=reserved_from)
+    if reserved_to:
+        queryset = queryset.filter(reservation__created_at__lt=reserved_to)
+    if show_session:
+        queryset = queryset.filter(show_session_id=show_session)
+    return queryset.order_by("id").values_list(
+        *(lookup for _, lookup in TICKET_EXPORT_FIELDS)
+    )
+
+
+class _Echo:
+    """File-like object handing back what the csv writer writes."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def export_lines(queryset: QuerySet, export_format: str) -> Iterator[str]:
+    """
+    Render value tuples line by line, fetching them from a server-side
+    cursor in chunks so that memory stays flat whatever the row count.
+    """
+    columns = [column for column, _ in TICKET_EXPORT_FIELDS]
+    rows = queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+    if export_format == "csv":
+        writer = csv.writer(_Echo())
+        yield writer.writerow(columns)
+        for row in rows:
+            yield writer.writerow(row)
+        return
+
+    encoder = DjangoJSONEncoder()
+    for row in rows:
+        yield encoder.encode(dict(zip(columns, row))) + "\n"
@@ -0,0 +1,113 @@
+from typing import Optional
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch, QuerySet
+from drf_spectacular.utils import OpenApiParameter
+from rest_framework.exceptions import ValidationError
+
+
+SPARSE_FIELDS_PARAMETER = OpenApiParameter(
+    "fields",
+    type={"type": "string"},
+    description="Only return the given comma separated fields "
+                "(ex. ?fields=id,show_time)",
+)
+
+
+class SparseFieldsetMixin:
+    """
+    Trim the serializer output of `sparse_actions` to the comma
+    separated `?fields=` query param, and load only what those fields
+    need: their columns, the joins they traverse and the prefetches
+    they use. Fields whose source is not a model field (properties)
+    declare their lookups in `sparse_field_lookups`.
+    """
+
+    sparse_actions = ("list",)
+    sparse_field_lookups: dict = {}
+
+    def get_sparse_fields(self) -> Optional[list]:
+        if self.action not in self.sparse_actions:
+            return None
+        if not hasattr(self, "_sparse_fields"):
+            param = self.request.query_params.get("fields", "")
+            names = [name.strip() for name in param.split(",")]
+            self._sparse_fields = list(dict.fromkeys(filter(None, names)))
+        return self._sparse_fields or None
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        sparse_fields = self.get_sparse_fields()
+        if sparse_fields:
+            fields = getattr(serializer, "child", serializer).fields
+            unknown = [name for name in sparse_fields if name not in fields]
+            if unknown:
+                raise ValidationError({
+                    "fields": f"Unknown fields: {', '.join(unknown)}. "
+                              f"Choose from: {', '.join(fields)}."
+                })
+            for name in list(fields):
+                if name not in sparse_fields:
+                    fields.pop(name)
+        return serializer
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        sparse_fields = self.get_sparse_fields()
+        if not sparse_fields:
+            return queryset
+        # Also rejects unknown fields before any query runs.
+        fields = self.get_serializer().fields
+
+        lookups = []
+        for name in sparse_fields:
+            field_lookups = self.sparse_field_lookups.get(name)
+            if field_lookups is None:
+                source = fields[name].source
+                if source == "*":
+                    return queryset
+                field_lookups = (source.replace(".", "__"),)
+            lookups.extend(field_lookups)
+        lookups.extend(
+            ordering.lstrip("-")
+            for ordering in getattr(self.paginator, "ordering", ())
+        )
+        return self.load_only(queryset, lookups)
+
+    @staticmethod
+    def load_only(queryset: QuerySet, lookups: list) -> QuerySet:
+        """
+        Restrict the queryset to the columns of the lookups, join only
+        the relations they traverse and keep only the prefetches of
+        the to-many relations they name.
+        """
+        columns, joins, prefetched = [], set(), set()
+        for lookup in lookups:
+            model = queryset.model
+            path = lookup.split("__")
+            try:
+                for depth, name in enumerate(path, start=1):
+                    field = model._meta.get_field(name)
+                    if field.many_to_many or field.one_to_many:
+                        prefetched.add("__".join(path[:depth]))
+                        break
+                    if depth < len(path):
+                        model = field.related_model
+                        joins.add("__".join(path[:depth]))
+                else:
+                    columns.append(lookup)
+            except FieldDoesNotExist:
+                # A property or method: no safe way to trim the columns.
+                return queryset
+
+        prefetches = [
+            prefetch for prefetch in queryset._prefetch_related_lookups
+            if (
+                prefetch.prefetch_to if isinstance(prefetch, Prefetch)
+                else prefetch
+            ).split("__")[0] in prefetched
+        ]
+        queryset = queryset.select_related(None).prefetch_related(None)
+        if joins:
+            queryset = queryset.select_related(*joins)
+        return queryset.prefetch_related(*prefetches).only(*columns)
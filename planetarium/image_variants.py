@@ -0,0 +1,127 @@
+import io
+import logging
+import multiprocessing
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Optional
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connections
+from django.utils import timezone
+from PIL import Image
+
+# This module is imported by the worker processes, so it must not
+# import models at module level.
+
+logger = logging.getLogger(__name__)
+
+IMAGE_VARIANT_WIDTHS = (160, 320, 640)
+IMAGE_VARIANT_FORMATS = {"webp": "WEBP", "jpeg": "JPEG"}
+IMAGE_VARIANT_QUALITY = 80
+IMAGE_VARIANT_WORKERS = 2
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+def image_variant_name(image_name: str, width: int, extension: str) -> str:
+    root, _ = os.path.splitext(image_name)
+    return f"{root}-{width}w.{extension}"
+
+
+def render_image_variants(image_bytes: bytes) -> dict:
+    """
+    Resize an image to every variant width and format, never
+    upscaling. Runs in a worker process.
+    """
+    variants = {}
+    with Image.open(io.BytesIO(image_bytes)) as image:
+        image = image.convert("RGB")
+        for width in IMAGE_VARIANT_WIDTHS:
+            resized = image.copy()
+            resized.thumbnail((width, width * 10), Image.Resampling.LANCZOS)
+            for extension, image_format in IMAGE_VARIANT_FORMATS.items():
+                output = io.BytesIO()
+                resized.save(
+                    output,
+                    format=image_format,
+                    quality=IMAGE_VARIANT_QUALITY,
+                    optimize=True
+                )
+                variants[(width, extension)] = output.getvalue()
+    return variants
+
+
+def get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        # Forking a threaded server process could copy locks held by
+        # its other threads into the workers: start them from a clean
+        # server process instead.
+        _executor = ProcessPoolExecutor(
+            max_workers=IMAGE_VARIANT_WORKERS,
+            mp_context=multiprocessing.get_context("forkserver"),
+        )
+    return _executor
+
+
+def generate_image_variants(astronomy_show_id: int, image_name: str) -> Future:
+    """
+    Render the variants of an astronomy show image in the process pool,
+    then store them and record their names on the show, unless the
+    image has been replaced meanwhile. The returned future resolves to
+    the recorded variants once they are saved.
+    """
+    with default_storage.open(image_name, "rb") as image_file:
+        image_bytes = image_file.read()
+    saved = Future()
+
+    def save(rendered: Future) -> None:
+        # Runs on the executor's thread, outside any request.
+        try:
+            saved.set_result(save_image_variants(
+                astronomy_show_id, image_name, rendered.result()
+            ))
+        except Exception as exc:
+            logger.exception(
+                "Could not generate variants of image %s", image_name
+            )
+            saved.set_exception(exc)
+        finally:
+            connections.close_all()
+
+    get_executor().submit(
+        render_image_variants, image_bytes
+    ).add_done_callback(save)
+    return saved
+
+
+def save_image_variants(
+        astronomy_show_id: int,
+        image_name: str,
+        rendered: dict
+) -> Optional[dict]:
+    from planetarium.caching import bump_model_version
+    from planetarium.models import AstronomyShow
+
+    image_variants = {extension: {} for extension in IMAGE_VARIANT_FORMATS}
+    for (width, extension), content in rendered.items():
+        image_variants[extension][str(width)] = default_storage.save(
+            image_variant_name(image_name, width, extension),
+            ContentFile(content)
+        )
+    updated = AstronomyShow.objects.filter(
+        id=astronomy_show_id, image=image_name
+    ).update(image_variants=image_variants, updated_at=timezone.now())
+    if not updated:
+        delete_image_variants(image_variants)
+        return None
+    bump_model_version(AstronomyShow)
+    return image_variants
+
+
+def delete_image_variants(image_variants: dict) -> None:
+    """Delete the stored files of recorded image variants."""
+    for names in image_variants.values():
+        for name in names.values():
+            default_storage.delete(name)
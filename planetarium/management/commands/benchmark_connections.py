@@ -0,0 +1,115 @@
+import asyncio
+import subprocess
+import sys
+import tempfile
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+from rest_framework_simplejwt.tokens import AccessToken
+
+from planetarium.management.commands.benchmark_servers import (
+    ENDPOINTS,
+    HOST,
+    LoadResult,
+    benchmark_database,
+    free_port,
+    generate_load,
+    server_environment,
+    wait_for_port
+)
+
+
+def database_sessions() -> int:
+    """Sessions ever opened on the database, from the statistics."""
+    with connection.cursor() as cursor:
+        # Backends report their session when they exit.
+        time.sleep(1)
+        cursor.execute("SELECT pg_stat_clear_snapshot()")
+        cursor.execute(
+            "SELECT sessions FROM pg_stat_database "
+            "WHERE datname = current_database()"
+        )
+        return cursor.fetchone()[0]
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare throughput of the production server (manage.py serve) "
+        "connecting to the database on every request (DB_CONN_MAX_AGE=0) "
+        "with persistent connections, against a test database seeded "
+        "with the benchmark dataset."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--endpoint", choices=ENDPOINTS, default="show_sessions"
+        )
+        parser.add_argument("--concurrency", type=int, default=32)
+        parser.add_argument(
+            "--duration", type=float, default=10,
+            help="Seconds of load per server."
+        )
+        parser.add_argument("--workers", type=int, default=2)
+        parser.add_argument("--threads", type=int, default=8)
+        parser.add_argument(
+            "--conn-max-age", type=int, default=600,
+            help="DB_CONN_MAX_AGE of the persistent connections server."
+        )
+        parser.add_argument(
+            "--scale", type=float, default=1.0,
+            help="Scale of the benchmark dataset seeded in a test database."
+        )
+
+    def handle(self, *args, **options):
+        path = ENDPOINTS[options["endpoint"]][0]
+
+        with (
+                benchmark_database(options["scale"]) as user,
+                tempfile.TemporaryDirectory() as settings_dir,
+        ):
+            token = str(AccessToken.for_user(user))
+            env = server_environment(settings_dir)
+            self.stdout.write(
+                f"{'conn_max_age':<13} {'requests':>9} {'req/s':>8} "
+                f"{'p50 ms':>8} {'p99 ms':>8} {'db connects':>12} "
+                f"{'errors':>7}"
+            )
+            for conn_max_age in (0, options["conn_max_age"]):
+                sessions = database_sessions()
+                result = self.benchmark(
+                    path, token, {**env, "DB_CONN_MAX_AGE": str(conn_max_age)},
+                    options
+                )
+                connects = database_sessions() - sessions
+                self.stdout.write(
+                    f"{conn_max_age:<13} {len(result.latencies):>9} "
+                    f"{len(result.latencies) / options['duration']:>8.1f} "
+                    f"{result.percentile(50) * 1000:>8.1f} "
+                    f"{result.percentile(99) * 1000:>8.1f} "
+                    f"{connects:>12} {result.errors:>7}"
+                )
+
+    def benchmark(self, path, token, env, options) -> LoadResult:
+        port = free_port()
+        process = subprocess.Popen(
+            [
+                sys.executable, "manage.py", "serve",
+                "--bind", f"{HOST}:{port}",
+                "--workers", str(options["workers"]),
+                "--threads", str(options["threads"]),
+            ],
+            cwd=settings.BASE_DIR,
+            env=env,
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            wait_for_port(port, process)
+            return asyncio.run(generate_load(
+                port, path, token,
+                options["concurrency"], options["duration"]
+            ))
+        finally:
+            process.terminate()
+            process.wait()
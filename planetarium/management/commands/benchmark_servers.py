@@ -0,0 +1,268 @@
+import asyncio
+import importlib.util
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from statistics import quantiles
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from rest_framework_simplejwt.tokens import AccessToken
+
+from planetarium.benchmark_data import seed
+
+
+HOST = "127.0.0.1"
+
+ENDPOINTS = {
+    "show_sessions": "/api/planetarium/show_sessions/",
+    "astronomy_shows": "/api/planetarium/astronomy_shows/",
+}
+
+# Servers run with the deployed settings (DEBUG off) minus throttling,
+# which would reject most of the load.
+BENCHMARK_SETTINGS = """\
+from {settings_module} import *
+
+REST_FRAMEWORK = {{**REST_FRAMEWORK, "DEFAULT_THROTTLE_CLASSES": []}}
+"""
+
+
+@dataclass
+class LoadResult:
+    latencies: list = field(default_factory=list)
+    errors: int = 0
+
+    def percentile(self, percent: int) -> float:
+        if len(self.latencies) < 2:
+            return self.latencies[0] if self.latencies else 0.0
+        return quantiles(self.latencies, n=100)[percent - 1]
+
+
+async def read_response(reader) -> tuple[int, bool]:
+    head = await reader.readuntil(b"\r\n\r\n")
+    status_line, *header_lines = head.decode("latin-1").split("\r\n")
+    headers = {}
+    for line in header_lines:
+        if ":" in line:
+            name, value = line.split(":", 1)
+            headers[name.strip().lower()] = value.strip()
+
+    keep_alive = headers.get("connection", "").lower() != "close"
+    if "content-length" in headers:
+        await reader.readexactly(int(headers["content-length"]))
+    else:
+        await reader.read()
+        keep_alive = False
+    return int(status_line.split()[1]), keep_alive
+
+
+async def run_client(port, request, deadline, result):
+    writer = None
+    while time.perf_counter() < deadline:
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection(HOST, port)
+            started = time.perf_counter()
+            writer.write(request)
+            status, keep_alive = await read_response(reader)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            result.errors += 1
+            writer = None
+            continue
+
+        result.latencies.append(time.perf_counter() - started)
+        if status != 200:
+            result.errors += 1
+        if not keep_alive:
+            writer.close()
+            writer = None
+    if writer is not None:
+        writer.close()
+
+
+async def generate_load(port, path, token, concurrency, duration):
+    request = (
+        f"GET {path} HTTP/1.1\r\n"
+        f"Host: {HOST}\r\n"
+        f"Authorization: Bearer {token}\r\n"
+        f"Accept: application/json\r\n\r\n"
+    ).encode()
+    result = LoadResult()
+    deadline = time.perf_counter() + duration
+    await asyncio.gather(*(
+        run_client(port, request, deadline, result)
+        for _ in range(concurrency)
+    ))
+    return result
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind((HOST, 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_port(port, process, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise CommandError("The server exited before accepting requests.")
+        try:
+            socket.create_connection((HOST, port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise CommandError(f"The server did not listen on port {port}.")
+
+
+@contextmanager
+def benchmark_database(scale: float):
+    """
+    Create a throwaway test database seeded with the benchmark dataset
+    and yield the user to authenticate as. The configured database is
+    left untouched; the servers connect to the test database through
+    server_environment().
+    """
+    database_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(
+        verbosity=0, autoclobber=True, serialize=False
+    )
+    try:
+        seed(scale=scale)
+        yield get_user_model().objects.create_user(
+            email="benchmark@example.com", password="benchmarkpassword"
+        )
+    finally:
+        connection.creation.destroy_test_db(database_name, verbosity=0)
+
+
+def server_environment(settings_dir) -> dict:
+    """
+    Environment of benchmarked servers, running BENCHMARK_SETTINGS
+    written to `settings_dir` against the current database.
+    """
+    with open(
+        os.path.join(settings_dir, "benchmark_settings.py"), "w"
+    ) as settings_file:
+        settings_file.write(BENCHMARK_SETTINGS.format(
+            settings_module=os.environ["DJANGO_SETTINGS_MODULE"],
+        ))
+    return {
+        **os.environ,
+        "DEBUG": "",
+        "POSTGRES_DB": connection.settings_dict["NAME"],
+        "POSTGRES_REPLICAS": "",
+        "DJANGO_SETTINGS_MODULE": "benchmark_settings",
+        "PYTHONPATH": os.pathsep.join(
+            filter(None, [
+                settings_dir,
+                str(settings.BASE_DIR),
+                os.environ.get("PYTHONPATH"),
+            ])
+        ),
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare throughput of an endpoint under WSGI (gunicorn) "
+        "and under ASGI (uvicorn), where it is served natively async, "
+        "at high concurrency, against a test database seeded with the "
+        "benchmark dataset."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--endpoint", choices=ENDPOINTS, default="show_sessions"
+        )
+        parser.add_argument("--concurrency", type=int, default=200)
+        parser.add_argument(
+            "--duration", type=float, default=10,
+            help="Seconds of load per server."
+        )
+        parser.add_argument("--workers", type=int, default=1)
+        parser.add_argument(
+            "--threads", type=int, default=8,
+            help="Threads per gunicorn worker."
+        )
+        parser.add_argument(
+            "--scale", type=float, default=1.0,
+            help="Scale of the benchmark dataset seeded in a test database."
+        )
+
+    def handle(self, *args, **options):
+        for module in ("gunicorn", "uvicorn"):
+            if importlib.util.find_spec(module) is None:
+                raise CommandError(
+                    f"{module} is required: pip install {module}"
+                )
+
+        path = ENDPOINTS[options["endpoint"]]
+
+        with (
+                benchmark_database(options["scale"]) as user,
+                tempfile.TemporaryDirectory() as settings_dir,
+        ):
+            token = str(AccessToken.for_user(user))
+            env = server_environment(settings_dir)
+            self.stdout.write(
+                f"{'server':<6} {'path':<42} {'requests':>9} "
+                f"{'req/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7}"
+            )
+            for server in ("wsgi", "asgi"):
+                result = self.benchmark(server, path, token, env, options)
+                self.stdout.write(
+                    f"{server:<6} {path:<42} {len(result.latencies):>9} "
+                    f"{len(result.latencies) / options['duration']:>8.1f} "
+                    f"{result.percentile(50) * 1000:>8.1f} "
+                    f"{result.percentile(99) * 1000:>8.1f} "
+                    f"{result.errors:>7}"
+                )
+
+    def server_command(self, server, port, options) -> list[str]:
+        if server == "wsgi":
+            return [
+                sys.executable, "-m", "gunicorn",
+                "planetarium_api_service.wsgi:application",
+                "--bind", f"{HOST}:{port}",
+                "--worker-class", "gthread",
+                "--workers", str(options["workers"]),
+                "--threads", str(options["threads"]),
+                "--log-level", "warning",
+            ]
+        return [
+            sys.executable, "-m", "uvicorn",
+            "planetarium_api_service.asgi:application",
+            "--host", HOST,
+            "--port", str(port),
+            "--workers", str(options["workers"]),
+            "--no-access-log",
+            "--log-level", "warning",
+        ]
+
+    def benchmark(self, server, path, token, env, options) -> LoadResult:
+        port = free_port()
+        process = subprocess.Popen(
+            self.server_command(server, port, options),
+            cwd=settings.BASE_DIR,
+            env=env,
+        )
+        try:
+            wait_for_port(port, process)
+            # Warm up connections and caches before measuring.
+            asyncio.run(generate_load(port, path, token, 4, 1))
+            return asyncio.run(generate_load(
+                port, path, token,
+                options["concurrency"], options["duration"]
+            ))
+        finally:
+            process.terminate()
+            process.wait()
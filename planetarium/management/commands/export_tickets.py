@@ -0,0 +1,66 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from planetarium.dates import parse_time_bound
+from planetarium.exports import (
+    EXPORT_FORMATS,
+    export_lines,
+    ticket_export_queryset
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream sold tickets with their reservation, user, show session, "
+        "show and dome as CSV or NDJSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output",
+            choices=list(EXPORT_FORMATS),
+            default="csv",
+            help="Export format.",
+        )
+        parser.add_argument(
+            "--from",
+            dest="reserved_from",
+            help="Only tickets reserved from a date or datetime.",
+        )
+        parser.add_argument(
+            "--to",
+            dest="reserved_to",
+            help="Only tickets reserved up to a date (inclusive) "
+                 "or before a datetime.",
+        )
+        parser.add_argument(
+            "--show-session",
+            type=int,
+            help="Only tickets of the given show session id.",
+        )
+        parser.add_argument(
+            "--file",
+            help="Write to a file instead of the standard output.",
+        )
+
+    def handle(self, *args, **options):
+        bounds = {}
+        for option, end in (("reserved_from", False), ("reserved_to", True)):
+            if options[option]:
+                bounds[option] = parse_time_bound(options[option], end=end)
+                if bounds[option] is None:
+                    raise CommandError(
+                        f"Invalid date or datetime: {options[option]}"
+                    )
+
+        lines = export_lines(
+            ticket_export_queryset(
+                show_session=options["show_session"], **bounds
+            ),
+            options["output"]
+        )
+        if options["file"]:
+            with open(options["file"], "w", newline="") as export_file:
+                export_file.writelines(lines)
+        else:
+            for line in lines:
+                self.stdout.write(line, ending="")
@@ -0,0 +1,39 @@
+from concurrent.futures import wait
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from planetarium.image_variants import generate_image_variants
+from planetarium.models import AstronomyShow
+
+
+class Command(BaseCommand):
+    help = "Generate resized variants of astronomy show images."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Regenerate variants that already exist.",
+        )
+
+    def handle(self, *args, **options):
+        astronomy_shows = AstronomyShow.objects.exclude(
+            Q(image="") | Q(image__isnull=True)
+        )
+        if not options["all"]:
+            astronomy_shows = astronomy_shows.filter(image_variants={})
+
+        futures = [
+            generate_image_variants(astronomy_show_id, image_name)
+            for astronomy_show_id, image_name
+            in astronomy_shows.values_list("id", "image")
+        ]
+        wait(futures)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Generated image variants for {len(futures)} "
+                f"astronomy show(s)."
+            )
+        )
@@ -0,0 +1,56 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from planetarium.models import ShowSession, ShowSessionDailyRollup, Ticket
+from planetarium.seat_map import forget_seat_maps
+
+
+class Command(BaseCommand):
+    help = "Recompute ShowSession.tickets_sold from the tickets table."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--show-session",
+            type=int,
+            nargs="+",
+            dest="show_sessions",
+            help="Only repair the given show session ids.",
+        )
+
+    def handle(self, *args, **options):
+        show_sessions = ShowSession.objects.all()
+        if options["show_sessions"]:
+            show_sessions = show_sessions.filter(
+                id__in=options["show_sessions"]
+            )
+
+        tickets_count = Coalesce(
+            Subquery(
+                Ticket.objects.filter(show_session=OuterRef("pk"))
+                .order_by()
+                .values("show_session")
+                .annotate(count=Count("id"))
+                .values("count")
+            ),
+            0
+        )
+        drifted = list(
+            show_sessions.alias(tickets_count=tickets_count)
+            .exclude(tickets_sold=F("tickets_count"))
+            .values_list("id", flat=True)
+        )
+        ShowSession.objects.filter(id__in=drifted).update(
+            tickets_sold=tickets_count, updated_at=timezone.now()
+        )
+        forget_seat_maps(drifted)
+        ShowSessionDailyRollup.refresh(
+            ShowSessionDailyRollup.show_session_keys(drifted).values()
+        )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Repaired tickets_sold for {len(drifted)} show session(s)."
+            )
+        )
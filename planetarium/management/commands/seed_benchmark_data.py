@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from planetarium.benchmark_data import seed
+
+
+class Command(BaseCommand):
+    help = (
+        "Fill an empty database with the benchmark dataset: "
+        "domes, astronomy shows, show sessions and their tickets."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scale",
+            type=float,
+            default=1.0,
+            help="Multiply the number of shows, users and sessions.",
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            created = seed(scale=options["scale"])
+        for name, count in created.items():
+            self.stdout.write(f"{count} {name}")
+        self.stdout.write(self.style.SUCCESS("Benchmark data created."))
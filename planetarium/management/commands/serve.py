@@ -0,0 +1,107 @@
+import multiprocessing
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from gunicorn.app.base import BaseApplication
+
+
+# Cache backends keeping their entries in each process: invalidations
+# and throttling counters would not reach the other workers.
+PROCESS_LOCAL_CACHES = ("django.core.cache.backends.locmem.LocMemCache",)
+
+
+def env_int(name: str, default: int) -> int:
+    return int(os.environ.get(name, default))
+
+
+class GunicornServer(BaseApplication):
+    def __init__(self, application, config: dict):
+        self.application = application
+        self.config = config
+        super().__init__()
+
+    def load_config(self):
+        for name, value in self.config.items():
+            self.cfg.set(name, value)
+
+    def load(self):
+        return self.application
+
+
+class Command(BaseCommand):
+    help = (
+        "Serve the API in production with gunicorn: the application is "
+        "loaded once and forked into several workers, which keep their "
+        "database connections across requests (DB_CONN_MAX_AGE) or pool "
+        "them (DB_POOL_MAX_SIZE, always under ASGI)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--bind", default=os.environ.get("BIND", "0.0.0.0:8000")
+        )
+        parser.add_argument(
+            "--workers", type=int,
+            default=env_int(
+                "WEB_CONCURRENCY", 2 * multiprocessing.cpu_count() + 1
+            ),
+        )
+        parser.add_argument(
+            "--threads", type=int, default=env_int("WEB_THREADS", 4),
+            help="Threads per worker (WSGI only).",
+        )
+        parser.add_argument(
+            "--timeout", type=int, default=env_int("WEB_TIMEOUT", 30),
+            help="Seconds before a silent worker is restarted.",
+        )
+        parser.add_argument(
+            "--max-requests", type=int,
+            default=env_int("WEB_MAX_REQUESTS", 0),
+            help="Restart workers after this many requests (0: never).",
+        )
+        parser.add_argument(
+            "--asgi", action="store_true",
+            help="Serve the ASGI application with uvicorn workers.",
+        )
+
+    def handle(self, *args, **options):
+        if (
+                options["workers"] > 1
+                and settings.CACHES["default"]["BACKEND"]
+                in PROCESS_LOCAL_CACHES
+        ):
+            raise CommandError(
+                "Several workers need a shared default cache (e.g. "
+                "CACHE_LOCATION=redis://...), run a single worker with "
+                "--workers 1 otherwise."
+            )
+
+        if options["asgi"]:
+            from planetarium_api_service.asgi import application
+            # Async requests run their queries on changing threads, so
+            # persistent connections would pile up: pool them instead.
+            for alias in connections:
+                connections.settings[alias]["CONN_MAX_AGE"] = 0
+                connections.settings[alias]["OPTIONS"] = {
+                    "pool": settings.DATABASE_POOL,
+                    **connections.settings[alias]["OPTIONS"],
+                }
+            worker_class = "uvicorn.workers.UvicornWorker"
+        else:
+            from planetarium_api_service.wsgi import application
+            worker_class = "gthread"
+        # Workers must not inherit the connections of the master.
+        connections.close_all()
+
+        GunicornServer(application, {
+            "bind": options["bind"],
+            "workers": options["workers"],
+            "threads": options["threads"],
+            "worker_class": worker_class,
+            "preload_app": True,
+            "timeout": options["timeout"],
+            "max_requests": options["max_requests"],
+            "max_requests_jitter": options["max_requests"] // 10,
+        }).run()
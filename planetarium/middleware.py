@@ -0,0 +1,200 @@
+import functools
+import logging
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Optional
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+
+logger = logging.getLogger("planetarium.server_timing")
+
+
+@dataclass
+class RequestTiming:
+    queries: int = 0
+    db_time: float = 0.0
+    serializer_time: float = 0.0
+    render_time: float = 0.0
+    view_time: float = 0.0
+
+    def header(self) -> str:
+        return ", ".join([
+            f'db;dur={self.db_time * 1000:.2f};desc="{self.queries} queries"',
+            f"serializer;dur={self.serializer_time * 1000:.2f}",
+            f"render;dur={self.render_time * 1000:.2f}",
+            f"view;dur={self.view_time * 1000:.2f}",
+        ])
+
+
+# The timing of the request being handled: concurrent ASGI requests
+# share the connections of the thread running their sync code.
+_request_timing: ContextVar[Optional[RequestTiming]] = ContextVar(
+    "request_timing", default=None
+)
+
+
+def record_query(execute, sql, params, many, context):
+    """
+    Execute wrapper adding each query to the timing of the request
+    that runs it, installed once on every connection.
+    """
+    timing = _request_timing.get()
+    if timing is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timing.queries += 1
+        timing.db_time += time.perf_counter() - started
+
+
+def install_query_recorder(connection) -> None:
+    # First, so that execute_wrapper() blocks still pop their own.
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, record_query)
+
+
+class TimedRepresentationMixin:
+    """Add the time to_representation() takes to the request timing."""
+
+    def to_representation(self, *args, **kwargs):
+        timing = _request_timing.get()
+        if timing is None:
+            return super().to_representation(*args, **kwargs)
+        started = time.perf_counter()
+        try:
+            return super().to_representation(*args, **kwargs)
+        finally:
+            timing.serializer_time += time.perf_counter() - started
+
+
+@functools.cache
+def timed_serializer_class(serializer_class: type) -> type:
+    return type(serializer_class)(
+        serializer_class.__name__,
+        (TimedRepresentationMixin, serializer_class),
+        {
+            "__module__": serializer_class.__module__,
+            "__qualname__": serializer_class.__qualname__,
+        }
+    )
+
+
+class SerializerTimingMixin:
+    """
+    Report the time the serializers of the viewset, values serializers
+    of ValuesListMixin included, take to represent the response data
+    as the serializer time of timed requests. Serializers of a many
+    serializer are timed per item, nested ones with their parent.
+    """
+
+    def is_timed(self) -> bool:
+        # Schema generation gets serializers of untimed mock requests.
+        return getattr(self.request, "server_timing", None) is not None
+
+    def get_serializer(self, *args, **kwargs):
+        if not self.is_timed():
+            return super().get_serializer(*args, **kwargs)
+        serializer_class = timed_serializer_class(self.get_serializer_class())
+        kwargs.setdefault("context", self.get_serializer_context())
+        return serializer_class(*args, **kwargs)
+
+    def get_values_serializer_class(self) -> type:
+        values_serializer_class = super().get_values_serializer_class()
+        if not self.is_timed():
+            return values_serializer_class
+        return timed_serializer_class(values_serializer_class)
+
+
+def view_tag(request, response) -> str:
+    view = getattr(response, "renderer_context", {}).get("view")
+    if view is not None:
+        action = getattr(view, "action", None) or request.method.lower()
+        return f"{type(view).__name__}.{action}"
+    if request.resolver_match is not None:
+        return request.resolver_match.view_name
+    return request.path
+
+
+class ServerTimingMiddleware:
+    """
+    Report SQL query count, database, serializer, render and view time
+    of each request in a Server-Timing header and a log line tagged
+    with the view and action, e.g. ShowSessionViewSet.list. Serializer
+    time is reported by views with SerializerTimingMixin, render time
+    is the time renderers take to turn the response data into its
+    content; view time covers the whole request.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        request.server_timing = timing = RequestTiming()
+        token = _request_timing.set(timing)
+        try:
+            started = time.perf_counter()
+            response = self.get_response(request)
+            timing.view_time = time.perf_counter() - started
+        finally:
+            _request_timing.reset(token)
+        return self.report(request, response, timing)
+
+    async def __acall__(self, request):
+        request.server_timing = timing = RequestTiming()
+        token = _request_timing.set(timing)
+        try:
+            started = time.perf_counter()
+            response = await self.get_response(request)
+            timing.view_time = time.perf_counter() - started
+        finally:
+            _request_timing.reset(token)
+        return self.report(request, response, timing)
+
+    def process_template_response(self, request, response):
+        # Called right before DRF responses are rendered.
+        timing = getattr(request, "server_timing", None)
+        if timing is not None:
+            started = time.perf_counter()
+
+            def rendered(response):
+                timing.render_time += time.perf_counter() - started
+
+            response.add_post_render_callback(rendered)
+        return response
+
+    def report(self, request, response, timing):
+        response["Server-Timing"] = timing.header()
+        tag = view_tag(request, response)
+        logger.info(
+            "%s status=%s queries=%d db_ms=%.2f serializer_ms=%.2f "
+            "render_ms=%.2f view_ms=%.2f",
+            tag,
+            response.status_code,
+            timing.queries,
+            timing.db_time * 1000,
+            timing.serializer_time * 1000,
+            timing.render_time * 1000,
+            timing.view_time * 1000,
+            extra={
+                "view": tag,
+                "status_code": response.status_code,
+                "queries": timing.queries,
+                "db_ms": round(timing.db_time * 1000, 2),
+                "serializer_ms": round(timing.serializer_time * 1000, 2),
+                "render_ms": round(timing.render_time * 1000, 2),
+                "view_ms": round(timing.view_time * 1000, 2),
+            }
+        )
+        return response
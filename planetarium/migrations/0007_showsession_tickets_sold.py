@@ -0,0 +1,38 @@
+# Generated by Django 5.1.3 on 2026-10-16 22:32
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_tickets_sold(apps, schema_editor):
+    ShowSession = apps.get_model("planetarium", "ShowSession")
+    Ticket = apps.get_model("planetarium", "Ticket")
+    tickets_count = (
+        Ticket.objects.filter(show_session=OuterRef("pk"))
+        .order_by()
+        .values("show_session")
+        .annotate(count=Count("id"))
+        .values("count")
+    )
+    ShowSession.objects.update(
+        tickets_sold=Coalesce(Subquery(tickets_count), 0)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("planetarium", "0006_alter_astronomyshow_image"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="showsession",
+            name="tickets_sold",
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(
+            count_tickets_sold, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.1.3 on 2026-10-16 22:35
+
+from django.conf import settings
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ("planetarium", "0007_showsession_tickets_sold"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="reservation",
+            index=models.Index(
+                fields=["user", "created_at"], name="reservation_user_created_idx"
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="showsession",
+            index=models.Index(
+                fields=["astronomy_show", "show_time"],
+                name="session_show_show_time_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="showsession",
+            index=models.Index(fields=["show_time"], name="session_show_time_idx"),
+        ),
+    ]
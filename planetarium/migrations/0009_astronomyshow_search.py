@@ -0,0 +1,49 @@
+# Generated by Django 5.1.3 on 2026-10-16 22:37
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("planetarium", "0008_session_and_reservation_indexes"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name="astronomyshow",
+            name="search_vector",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=django.contrib.postgres.search.CombinedSearchVector(
+                    django.contrib.postgres.search.SearchVector(
+                        "title", config="english", weight="A"
+                    ),
+                    "||",
+                    django.contrib.postgres.search.SearchVector(
+                        "description", config="english", weight="B"
+                    ),
+                    django.contrib.postgres.search.SearchConfig("english"),
+                ),
+                output_field=django.contrib.postgres.search.SearchVectorField(),
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="astronomyshow",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="astronomy_show_search_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="astronomyshow",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["title"],
+                name="astronomy_show_title_trgm_idx",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+    ]
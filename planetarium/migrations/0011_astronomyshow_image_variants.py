@@ -0,0 +1,18 @@
+# Generated by Django 5.1.3 on 2026-10-16 23:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("planetarium", "0010_seathold"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="astronomyshow",
+            name="image_variants",
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
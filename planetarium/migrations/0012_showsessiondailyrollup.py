@@ -0,0 +1,77 @@
+# Generated by Django 5.1.3 on 2026-10-16 23:24
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate
+
+
+def fill_daily_rollups(apps, schema_editor):
+    ShowSession = apps.get_model("planetarium", "ShowSession")
+    ShowSessionDailyRollup = apps.get_model(
+        "planetarium", "ShowSessionDailyRollup"
+    )
+    rows = (
+        ShowSession.objects.annotate(day=TruncDate("show_time"))
+        .values("day", "astronomy_show_id", "planetarium_dome_id")
+        .annotate(
+            show_sessions=Count("id"),
+            seats=Sum(
+                F("planetarium_dome__rows")
+                * F("planetarium_dome__seats_in_row")
+            ),
+            tickets_sold=Sum("tickets_sold"),
+        )
+        .order_by()
+    )
+    ShowSessionDailyRollup.objects.bulk_create(
+        (ShowSessionDailyRollup(**row) for row in rows), batch_size=5000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("planetarium", "0011_astronomyshow_image_variants"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ShowSessionDailyRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("day", models.DateField()),
+                ("show_sessions", models.IntegerField(default=0)),
+                ("seats", models.IntegerField(default=0)),
+                ("tickets_sold", models.IntegerField(default=0)),
+                (
+                    "astronomy_show",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="planetarium.astronomyshow",
+                    ),
+                ),
+                (
+                    "planetarium_dome",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="planetarium.planetariumdome",
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("day", "astronomy_show", "planetarium_dome")},
+            },
+        ),
+        migrations.RunPython(fill_daily_rollups, migrations.RunPython.noop),
+    ]
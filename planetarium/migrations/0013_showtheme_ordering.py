@@ -0,0 +1,17 @@
+# Generated by Django 5.1.3 on 2026-10-17 00:10
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("planetarium", "0012_showsessiondailyrollup"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="showtheme",
+            options={"ordering": ["id"]},
+        ),
+    ]
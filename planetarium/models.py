@@ -1,16 +1,32 @@
+import hashlib
 import os
 import uuid
 
-from typing import Type
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Iterable, Type, Mapping
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import connection, models, transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
 from django.utils.text import slugify
 
+from planetarium.dates import day_start
 from planetarium_api_service import settings
 
 
+SEAT_HOLD_TTL = timedelta(minutes=5)
+
+
 class ShowTheme(models.Model):
     name = models.CharField(max_length=255)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["id"]
 
     def __str__(self):
         return self.name
@@ -20,6 +36,7 @@ class PlanetariumDome(models.Model):
     name = models.CharField(max_length=255)
     rows = models.IntegerField()
     seats_in_row = models.IntegerField()
+    updated_at = models.DateTimeField(auto_now=True)
 
     @property
     def capacity(self) -> int:
@@ -46,9 +63,34 @@ class AstronomyShow(models.Model):
         blank=True,
         upload_to=astronomy_show_image_path
     )
+    image_variants = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+    search_vector = models.GeneratedField(
+        expression=(
+            SearchVector("title", weight="A", config="english")
+            + SearchVector("description", weight="B", config="english")
+        ),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
 
     class Meta:
         ordering = ["title"]
+        indexes = [
+            GinIndex(
+                fields=["search_vector"],
+                name="astronomy_show_search_idx"
+            ),
+            GinIndex(
+                fields=["title"],
+                opclasses=["gin_trgm_ops"],
+                name="astronomy_show_title_trgm_idx"
+            ),
+        ]
 
     def __str__(self):
         return self.title
@@ -62,14 +104,284 @@ class ShowSession(models.Model):
         PlanetariumDome, on_delete=models.CASCADE
     )
     show_time = models.DateTimeField()
+    tickets_sold = models.IntegerField(default=0, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ["-show_time"]
+        indexes = [
+            models.Index(
+                fields=["astronomy_show", "show_time"],
+                name="session_show_show_time_idx"
+            ),
+            models.Index(fields=["show_time"], name="session_show_time_idx"),
+        ]
+
+    @property
+    def tickets_available(self) -> int:
+        return self.planetarium_dome.capacity - self.tickets_sold
+
+    @property
+    def rollup_key(self) -> tuple:
+        """The (day, astronomy show id, dome id) of the daily rollup."""
+        show_time = self._meta.get_field("show_time").to_python(
+            self.show_time
+        )
+        if timezone.is_naive(show_time):
+            show_time = timezone.make_aware(show_time)
+        return (
+            timezone.localdate(show_time),
+            self.astronomy_show_id,
+            self.planetarium_dome_id
+        )
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if {
+            "show_time", "astronomy_show_id", "planetarium_dome_id"
+        } <= set(field_names):
+            instance.loaded_rollup_key = instance.rollup_key
+        return instance
+
+    @classmethod
+    def update_tickets_sold(cls, changes: Mapping[int, int]) -> None:
+        """
+        Atomically add ticket count changes keyed by show session id.
+        Every session is marked modified, even with no change: its
+        tickets may have moved to other seats.
+        """
+        # The sessions and their rollups change in one transaction,
+        # so a concurrent rollup refresh counts the tickets either
+        # in both or in neither.
+        with transaction.atomic(savepoint=False):
+            for show_session_id, change in sorted(changes.items()):
+                cls.objects.filter(id=show_session_id).update(
+                    tickets_sold=F("tickets_sold") + change,
+                    updated_at=timezone.now()
+                )
+            ShowSessionDailyRollup.add_tickets_sold(changes)
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            # tickets_sold is maintained with atomic F() updates only,
+            # so a stale in-memory value must never be written back.
+            kwargs["update_fields"] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != "tickets_sold"
+            ]
+        super().save(*args, **kwargs)
+
+    def hold_seats(
+            self,
+            user,
+            places: Iterable[tuple[int, int]],
+            ttl: timedelta = SEAT_HOLD_TTL
+    ) -> datetime:
+        """
+        Replace the user's seat hold on this session with (row, seat)
+        places, dropping expired holds first. Raise IntegrityError
+        when another user holds one of the places.
+        """
+        now = timezone.now()
+        expires_at = now + ttl
+        with transaction.atomic():
+            SeatHold.objects.filter(show_session=self).filter(
+                Q(expires_at__lte=now) | Q(user=user)
+            ).delete()
+            SeatHold.objects.bulk_create(
+                SeatHold(
+                    show_session=self,
+                    user=user,
+                    row=row,
+                    seat=seat,
+                    expires_at=expires_at
+                )
+                for row, seat in places
+            )
+        return expires_at
+
+    def release_seats(self, user) -> None:
+        SeatHold.objects.filter(show_session=self, user=user).delete()
 
     def __str__(self):
         return self.astronomy_show.title + " " + str(self.show_time)
 
 
+class ShowSessionDailyRollup(models.Model):
+    """
+    Show sessions, seats and tickets sold per day, astronomy show and
+    dome, for the calendar. Ticket sales add to tickets_sold atomically,
+    any other change recomputes the affected rows from the sessions.
+    """
+
+    day = models.DateField()
+    astronomy_show = models.ForeignKey(
+        AstronomyShow, on_delete=models.CASCADE, related_name="+"
+    )
+    planetarium_dome = models.ForeignKey(
+        PlanetariumDome, on_delete=models.CASCADE, related_name="+"
+    )
+    show_sessions = models.IntegerField(default=0)
+    seats = models.IntegerField(default=0)
+    tickets_sold = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ("day", "astronomy_show", "planetarium_dome")
+
+    @staticmethod
+    def key_lookup(key: tuple) -> Q:
+        day, astronomy_show_id, planetarium_dome_id = key
+        return Q(
+            day=day,
+            astronomy_show_id=astronomy_show_id,
+            planetarium_dome_id=planetarium_dome_id
+        )
+
+    @staticmethod
+    def show_session_keys(show_session_ids: Iterable[int]) -> dict:
+        return {
+            show_session_id: (
+                timezone.localdate(show_time),
+                astronomy_show_id,
+                planetarium_dome_id
+            )
+            for (
+                show_session_id,
+                show_time,
+                astronomy_show_id,
+                planetarium_dome_id
+            ) in ShowSession.objects.filter(
+                id__in=show_session_ids
+            ).values_list(
+                "id", "show_time", "astronomy_show_id", "planetarium_dome_id"
+            )
+        }
+
+    @classmethod
+    def aggregate(cls, show_sessions: models.QuerySet) -> list:
+        return [
+            cls(**row)
+            for row in show_sessions.annotate(day=TruncDate("show_time"))
+            .values("day", "astronomy_show_id", "planetarium_dome_id")
+            .annotate(
+                show_sessions=Count("id"),
+                seats=Sum(
+                    F("planetarium_dome__rows")
+                    * F("planetarium_dome__seats_in_row")
+                ),
+                tickets_sold=Sum("tickets_sold"),
+            )
+            .order_by()
+        ]
+
+    @classmethod
+    def add_tickets_sold(cls, changes: Mapping[int, int]) -> None:
+        """Add ticket count changes keyed by show session id."""
+        changes = {
+            show_session_id: change
+            for show_session_id, change in changes.items() if change
+        }
+        if not changes:
+            return
+        deltas = Counter()
+        for show_session_id, key in cls.show_session_keys(changes).items():
+            deltas[key] += changes[show_session_id]
+
+        cls.lock_keys(deltas)
+        missing = [
+            key for key, delta in sorted(deltas.items())
+            if delta and not cls.objects.filter(cls.key_lookup(key)).update(
+                tickets_sold=F("tickets_sold") + delta
+            )
+        ]
+        if missing:
+            cls.refresh(missing)
+
+    @staticmethod
+    def lock_keys(keys: Iterable[tuple]) -> None:
+        """
+        Lock (day, show id, dome id) keys until the end of the transaction.
+        Keys are locked in a fixed order, so that lockers never deadlock.
+        """
+        lock_ids = sorted(
+            int.from_bytes(
+                hashlib.blake2b(
+                    f"rollup:{day}:{astronomy_show_id}:{planetarium_dome_id}"
+                    .encode(),
+                    digest_size=8
+                ).digest(),
+                "big",
+                signed=True
+            )
+            for day, astronomy_show_id, planetarium_dome_id in keys
+        )
+        if not lock_ids:
+            return
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT pg_advisory_xact_lock(lock_id) "
+                "FROM unnest(%s::bigint[]) AS lock_id ORDER BY lock_id",
+                [lock_ids]
+            )
+
+    @classmethod
+    def refresh(cls, keys: Iterable[tuple]) -> None:
+        """Recompute the rows of (day, show id, dome id) keys."""
+        keys = set(keys)
+        if not keys:
+            return
+        # A concurrent refresh of the same keys would not see the
+        # sessions of this transaction and overwrite its rows with
+        # stale counts, so it waits for this one to commit.
+        with transaction.atomic(savepoint=False):
+            cls.lock_keys(keys)
+            lookup = Q()
+            for day, astronomy_show_id, planetarium_dome_id in keys:
+                lookup |= Q(
+                    show_time__gte=day_start(day),
+                    show_time__lt=day_start(day + timedelta(days=1)),
+                    astronomy_show_id=astronomy_show_id,
+                    planetarium_dome_id=planetarium_dome_id,
+                )
+            rollups = cls.aggregate(ShowSession.objects.filter(lookup))
+            cls.objects.bulk_create(
+                rollups,
+                update_conflicts=True,
+                unique_fields=["day", "astronomy_show", "planetarium_dome"],
+                update_fields=["show_sessions", "seats", "tickets_sold"],
+            )
+            empty = keys - {
+                (
+                    rollup.day,
+                    rollup.astronomy_show_id,
+                    rollup.planetarium_dome_id
+                )
+                for rollup in rollups
+            }
+            if empty:
+                lookup = Q()
+                for key in empty:
+                    lookup |= cls.key_lookup(key)
+                cls.objects.filter(lookup).delete()
+
+    @classmethod
+    def rebuild(cls) -> int:
+        """Recompute every row, return the number of rows."""
+        with transaction.atomic():
+            cls.objects.all().delete()
+            rollups = cls.objects.bulk_create(
+                cls.aggregate(ShowSession.objects.all()), batch_size=5000
+            )
+        return len(rollups)
+
+    def __str__(self):
+        return (
+            f"{self.day} (show: {self.astronomy_show_id}, "
+            f"dome: {self.planetarium_dome_id})"
+        )
+
+
 class Reservation(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     user = models.ForeignKey(
@@ -81,6 +393,12 @@ class Reservation(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(
+                fields=["user", "created_at"],
+                name="reservation_user_created_idx"
+            ),
+        ]
 
 
 class Ticket(models.Model):
@@ -95,6 +413,20 @@ class Ticket(models.Model):
         related_name="tickets"
     )
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        loaded = dict(zip(field_names, values))
+        if {"show_session_id", "row", "seat"} <= loaded.keys():
+            instance.loaded_place = (
+                loaded["show_session_id"], loaded["row"], loaded["seat"]
+            )
+        return instance
+
+    @property
+    def place(self) -> tuple:
+        return self.show_session_id, self.row, self.seat
+
     @staticmethod
     def validate_seat_and_row(
             seat: int,
@@ -148,3 +480,37 @@ class Ticket(models.Model):
 
     class Meta:
         unique_together = ("show_session", "row", "seat")
+
+
+class SeatHoldQuerySet(models.QuerySet):
+    def active(self):
+        return self.filter(expires_at__gt=timezone.now())
+
+
+class SeatHold(models.Model):
+    """
+    A seat kept for a user for a short time before reservation.
+    Expired holds are ignored and removed lazily by the next hold.
+    """
+
+    show_session = models.ForeignKey(
+        ShowSession, on_delete=models.CASCADE,
+        related_name="seat_holds"
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE
+    )
+    row = models.IntegerField()
+    seat = models.IntegerField()
+    expires_at = models.DateTimeField()
+
+    objects = SeatHoldQuerySet.as_manager()
+
+    def __str__(self):
+        return (
+            f"{str(self.show_session)} (row: {self.row}, seat: {self.seat}) "
+            f"held until {self.expires_at}"
+        )
+
+    class Meta:
+        unique_together = ("show_session", "row", "seat")
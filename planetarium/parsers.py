@@ -0,0 +1,36 @@
+import orjson
+from rest_framework import parsers
+from rest_framework.exceptions import ParseError
+
+from planetarium.renderers import MessagePackRenderer, ORJSONRenderer, msgpack
+
+
+class ORJSONParser(parsers.JSONParser):
+    """Parse UTF-8 JSON request bodies with orjson."""
+
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = (parser_context or {}).get("encoding", "utf-8")
+        if encoding.lower().replace("-", "") != "utf8":
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f"JSON parse error - {exc}")
+
+
+class MessagePackParser(parsers.BaseParser):
+    """
+    Parse MessagePack request bodies. Needs the optional msgpack
+    package.
+    """
+
+    media_type = "application/msgpack"
+    renderer_class = MessagePackRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return msgpack.unpackb(stream.read())
+        except (ValueError, msgpack.UnpackException) as exc:
+            raise ParseError(f"MessagePack parse error - {exc}")
@@ -0,0 +1,67 @@
+import orjson
+from rest_framework import renderers
+from rest_framework.utils import encoders
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+# Dates and times go through the encoder of DRF for the same format.
+ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+# Escaped like JSONRenderer does, to keep the output a JavaScript subset.
+LINE_SEPARATORS = (
+    ("\u2028".encode(), b"\\u2028"), ("\u2029".encode(), b"\\u2029")
+)
+
+
+class ORJSONRenderer(renderers.JSONRenderer):
+    """
+    Render the same compact JSON as JSONRenderer with orjson. Indented
+    output (the browsable API, `; indent=` media types) and values
+    orjson cannot encode, e.g. integers beyond 64 bits, fall back to
+    JSONRenderer.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if indent is not None or self.ensure_ascii or not self.compact:
+            return super().render(
+                data, accepted_media_type, renderer_context
+            )
+
+        try:
+            content = orjson.dumps(
+                data,
+                default=self.encoder_class().default,
+                option=ORJSON_OPTIONS
+            )
+        except orjson.JSONEncodeError:
+            return super().render(
+                data, accepted_media_type, renderer_context
+            )
+        for separator, escaped in LINE_SEPARATORS:
+            if separator in content:
+                content = content.replace(separator, escaped)
+        return content
+
+
+class MessagePackRenderer(renderers.BaseRenderer):
+    """
+    Render MessagePack, with the values JSON has no type for encoded
+    like in JSON responses. Needs the optional msgpack package.
+    """
+
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return msgpack.packb(data, default=encoders.JSONEncoder().default)
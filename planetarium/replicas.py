@@ -0,0 +1,91 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework.permissions import SAFE_METHODS
+
+
+# Seconds a user reads from the primary after writing, longer than
+# the replication lag, so that they always see their own writes.
+PRIMARY_PIN_TIMEOUT = 10
+
+_read_replica: ContextVar[Optional[str]] = ContextVar(
+    "read_replica", default=None
+)
+
+
+class ReplicaRouter:
+    """
+    Route reads to the replica chosen for the current request, if
+    any, and everything else to the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        return _read_replica.get() or DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, **hints):
+        return db not in settings.DATABASE_REPLICAS
+
+
+@contextmanager
+def use_primary():
+    """
+    Read from the primary within the block, e.g. to fill caches that
+    are invalidated on commit and must not be filled with lagging data.
+    """
+    token = _read_replica.set(None)
+    try:
+        yield
+    finally:
+        _read_replica.reset(token)
+
+
+def primary_pin_key(user) -> str:
+    return f"planetarium:primary:{user.pk}"
+
+
+class ReplicaReadMixin:
+    """
+    Run the queries of safe requests on a random replica of
+    DATABASE_REPLICAS when `replica_reads` is set. A successful unsafe
+    request pins its user to the primary for PRIMARY_PIN_TIMEOUT
+    seconds.
+    """
+
+    replica_reads = True
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if (
+                self.replica_reads
+                and settings.DATABASE_REPLICAS
+                and request.method in SAFE_METHODS
+                and not (
+                    request.user.is_authenticated
+                    and cache.get(primary_pin_key(request.user))
+                )
+        ):
+            _read_replica.set(random.choice(settings.DATABASE_REPLICAS))
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        # initial() may run in another thread (async views): set rather
+        # than reset the context variable.
+        _read_replica.set(None)
+        if (
+                settings.DATABASE_REPLICAS
+                and request.method not in SAFE_METHODS
+                and response.status_code < 400
+                and request.user.is_authenticated
+        ):
+            cache.set(primary_pin_key(request.user), 1, PRIMARY_PIN_TIMEOUT)
+        return super().finalize_response(request, response, *args, **kwargs)
@@ -0,0 +1,190 @@
+import base64
+from collections import defaultdict
+from itertools import chain
+from typing import Iterable, Optional
+
+from django.core.cache import cache
+
+from planetarium.caching import bump_version, get_version
+from planetarium.models import ShowSession, Ticket
+from planetarium.replicas import use_primary
+
+
+SEAT_MAP_CACHE_TIMEOUT = 60 * 60
+SEAT_MAP_ENCODING = "bitmap-base64"
+
+
+def seat_map_version_key(show_session_id: int) -> str:
+    return f"planetarium:seat-map-version:{show_session_id}"
+
+
+def seat_map_cache_key(show_session_id: int, version: int) -> str:
+    return f"planetarium:seat-map:{show_session_id}:{version}"
+
+
+def get_seat_map_version(show_session_id: int) -> int:
+    return get_version(
+        seat_map_version_key(show_session_id), SEAT_MAP_CACHE_TIMEOUT
+    )
+
+
+class SeatMap:
+    """
+    Bit-packed occupancy of a show session: one bit per seat,
+    row-major, most significant bit first, set bit means taken.
+    """
+
+    def __init__(
+            self,
+            show_session_id: int,
+            rows: int,
+            seats_in_row: int,
+            bits: Optional[bytes] = None
+    ):
+        self.show_session_id = show_session_id
+        self.rows = rows
+        self.seats_in_row = seats_in_row
+        size = (rows * seats_in_row + 7) // 8
+        self.bits = bytearray(bits) if bits is not None else bytearray(size)
+
+    @property
+    def capacity(self) -> int:
+        return self.rows * self.seats_in_row
+
+    @property
+    def tickets_available(self) -> int:
+        return self.capacity - int.from_bytes(self.bits, "big").bit_count()
+
+    @property
+    def encoded(self) -> str:
+        return base64.b64encode(self.bits).decode("ascii")
+
+    def _locate(self, row: int, seat: int) -> Optional[tuple[int, int]]:
+        if not (1 <= row <= self.rows and 1 <= seat <= self.seats_in_row):
+            return None
+        index = (row - 1) * self.seats_in_row + seat - 1
+        return index >> 3, 0x80 >> (index & 7)
+
+    def is_taken(self, row: int, seat: int) -> bool:
+        position = self._locate(row, seat)
+        if position is None:
+            return False
+        byte, mask = position
+        return bool(self.bits[byte] & mask)
+
+    def mark(self, row: int, seat: int, taken: bool = True) -> None:
+        position = self._locate(row, seat)
+        if position is None:
+            return
+        byte, mask = position
+        if taken:
+            self.bits[byte] |= mask
+        else:
+            self.bits[byte] &= ~mask
+
+    def to_cache(self) -> tuple:
+        return self.rows, self.seats_in_row, bytes(self.bits)
+
+    @classmethod
+    def from_cache(cls, show_session_id: int, value: tuple) -> "SeatMap":
+        rows, seats_in_row, bits = value
+        return cls(show_session_id, rows, seats_in_row, bits)
+
+    @classmethod
+    def build(cls, show_session: ShowSession) -> "SeatMap":
+        seat_map = cls(
+            show_session.id,
+            show_session.planetarium_dome.rows,
+            show_session.planetarium_dome.seats_in_row,
+        )
+        places = Ticket.objects.filter(
+            show_session=show_session
+        ).values_list("row", "seat")
+        for row, seat in places:
+            seat_map.mark(row, seat)
+        return seat_map
+
+
+def get_seat_map(
+        show_session_id: int,
+        show_session: Optional[ShowSession] = None
+) -> Optional[SeatMap]:
+    """
+    Return the cached seat map of a show session, building it
+    from tickets on a cache miss. Return None for unknown sessions.
+    An already loaded show session saves fetching it on a miss.
+    """
+    # Read before building: a ticket committed after the build read
+    # the tickets bumps the version, and the built map is only served
+    # patched with that ticket.
+    version = get_seat_map_version(show_session_id)
+    cached = cache.get(seat_map_cache_key(show_session_id, version))
+    if cached is not None:
+        return SeatMap.from_cache(show_session_id, cached)
+
+    # Seat maps are updated on commit: build them from the primary,
+    # which already has every committed ticket.
+    with use_primary():
+        if show_session is None:
+            show_session = (
+                ShowSession.objects.select_related("planetarium_dome")
+                .filter(id=show_session_id)
+                .first()
+            )
+        if show_session is None:
+            return None
+
+        seat_map = SeatMap.build(show_session)
+    cache.set(
+        seat_map_cache_key(show_session_id, version),
+        seat_map.to_cache(),
+        SEAT_MAP_CACHE_TIMEOUT
+    )
+    return seat_map
+
+
+def update_seat_maps(
+        taken: Iterable[tuple] = (),
+        freed: Iterable[tuple] = ()
+) -> None:
+    """
+    Mark taken and freed (show session id, row, seat) places of
+    committed tickets in the cached seat maps. Each map is patched
+    under the version its change bumps to, unless another change
+    bumped the version in between: the next read rebuilds it then.
+    """
+    changes = defaultdict(list)
+    # Freed first: a seat freed and taken again in one change is taken.
+    for (show_session_id, row, seat), is_taken in chain(
+            ((place, False) for place in freed),
+            ((place, True) for place in taken)
+    ):
+        changes[show_session_id].append((row, seat, is_taken))
+
+    for show_session_id, marks in changes.items():
+        version = get_seat_map_version(show_session_id)
+        cached = cache.get(seat_map_cache_key(show_session_id, version))
+        new_version = bump_version(
+            seat_map_version_key(show_session_id), SEAT_MAP_CACHE_TIMEOUT
+        )
+        if cached is None or new_version != version + 1:
+            continue
+        seat_map = SeatMap.from_cache(show_session_id, cached)
+        for row, seat, is_taken in marks:
+            seat_map.mark(row, seat, is_taken)
+        cache.add(
+            seat_map_cache_key(show_session_id, new_version),
+            seat_map.to_cache(),
+            SEAT_MAP_CACHE_TIMEOUT
+        )
+
+
+def forget_seat_maps(show_session_ids: Iterable[int]) -> None:
+    """
+    Bump the seat map versions of show sessions whose dome changed or
+    that were deleted: the next read rebuilds the maps from tickets.
+    """
+    for show_session_id in set(show_session_ids):
+        bump_version(
+            seat_map_version_key(show_session_id), SEAT_MAP_CACHE_TIMEOUT
+        )
@@ -1,5 +1,13 @@
-from django.db import transaction
+from collections import Counter
+from datetime import datetime, timedelta
+
+from django.core.files.storage import default_storage
+from django.db import IntegrityError, transaction
+from django.db.models import Q, Value
+from django.utils import timezone
 from rest_framework import serializers
+from rest_framework.exceptions import ErrorDetail
+from rest_framework.settings import api_settings
 from rest_framework.validators import UniqueTogetherValidator
 
 from planetarium.models import (
@@ -7,10 +15,20 @@ from planetarium.models import (
     PlanetariumDome,
     AstronomyShow,
     ShowSession,
+    ShowSessionDailyRollup,
     Ticket,
-    Reservation
+    Reservation,
+    SeatHold
+)
+from planetarium.seat_map import (
+    SEAT_MAP_ENCODING,
+    get_seat_map,
+    update_seat_maps
 )
 
+SEAT_HELD_MESSAGE = "This seat is held by another user."
+MAX_SCHEDULED_SHOW_SESSIONS = 5000
+
 
 class ShowThemeSerializer(serializers.ModelSerializer):
     class Meta:
@@ -24,6 +42,25 @@ class PlanetariumDomeSerializer(serializers.ModelSerializer):
         fields = ("id", "name", "rows", "seats_in_row", "capacity")
 
 
+class ImageVariantsField(serializers.ReadOnlyField):
+    """
+    Absolute URLs of the resized variants of an image by format and
+    width, e.g. {"webp": {"160": url}}, empty until they are generated.
+    """
+
+    def to_representation(self, value):
+        request = self.context.get("request")
+        image_variants = {}
+        for extension, names in value.items():
+            image_variants[extension] = {}
+            for width, name in names.items():
+                url = default_storage.url(name)
+                if request is not None:
+                    url = request.build_absolute_uri(url)
+                image_variants[extension][width] = url
+        return image_variants
+
+
 class AstronomyShowSerializer(serializers.ModelSerializer):
     class Meta:
         model = AstronomyShow
@@ -41,6 +78,15 @@ class AstronomyShowListSerializer(AstronomyShowSerializer):
             read_only=True,
             slug_field="name"
     )
+    image_variants = ImageVariantsField()
+
+    class Meta:
+        model = AstronomyShow
+        fields = ("id",
+                  "title",
+                  "description",
+                  "show_themes",
+                  "image_variants")
 
 
 class AstronomyShowDetailSerializer(AstronomyShowSerializer):
@@ -78,8 +124,8 @@ class ShowSessionListSerializer(ShowSessionSerializer):
         source="planetarium_dome.capacity"
     )
     tickets_available = serializers.IntegerField(read_only=True)
-    astronomy_show_image = serializers.ImageField(
-        source="astronomy_show.image", read_only=True
+    astronomy_show_image_variants = ImageVariantsField(
+        source="astronomy_show.image_variants"
     )
 
     class Meta:
@@ -91,10 +137,18 @@ class ShowSessionListSerializer(ShowSessionSerializer):
             "planetarium_dome_name",
             "planetarium_dome_capacity",
             "tickets_available",
-            "astronomy_show_image"
+            "astronomy_show_image_variants"
         )
 
 
+class TakenPlacesSerializer(serializers.Serializer):
+    encoding = serializers.SerializerMethodField()
+    taken = serializers.CharField(source="encoded")
+
+    def get_encoding(self, seat_map) -> str:
+        return SEAT_MAP_ENCODING
+
+
 class ShowSessionRetrieveSerializer(ShowSessionSerializer):
     astronomy_show = AstronomyShowListSerializer(
         many=False, read_only=True
@@ -102,9 +156,240 @@ class ShowSessionRetrieveSerializer(ShowSessionSerializer):
     planetarium_dome = PlanetariumDomeSerializer(
         many=False, read_only=True
     )
+    taken_places = TakenPlacesSerializer(source="seat_map", read_only=True)
+
+
+class ShowSessionCalendarSerializer(serializers.Serializer):
+    date = serializers.DateField(source="day")
+    show_sessions = serializers.IntegerField(source="total_show_sessions")
+    seats = serializers.IntegerField(source="total_seats")
+    tickets_available = serializers.IntegerField(
+        source="total_tickets_available"
+    )
+
+
+class RecurrenceSerializer(serializers.Serializer):
+    weekdays = serializers.ListField(
+        child=serializers.IntegerField(min_value=0, max_value=6),
+        allow_empty=False,
+        help_text="Days of the week, 0 is Monday."
+    )
+    times = serializers.ListField(
+        child=serializers.TimeField(), allow_empty=False
+    )
+    start_date = serializers.DateField()
+    end_date = serializers.DateField()
+
+    def validate(self, attrs):
+        if attrs["end_date"] < attrs["start_date"]:
+            raise serializers.ValidationError(
+                {"end_date": "End date must not be before start date."}
+            )
+        return attrs
+
+
+class ShowSessionScheduleSerializer(serializers.Serializer):
+    astronomy_show = serializers.PrimaryKeyRelatedField(
+        queryset=AstronomyShow.objects.defer("search_vector")
+    )
+    planetarium_dome = serializers.PrimaryKeyRelatedField(
+        queryset=PlanetariumDome.objects.all()
+    )
+    recurrence = RecurrenceSerializer(required=False, write_only=True)
+    show_times = serializers.ListField(
+        child=serializers.DateTimeField(),
+        required=False,
+        allow_empty=False,
+        write_only=True
+    )
+    ids = serializers.ListField(
+        child=serializers.IntegerField(), read_only=True
+    )
+
+    @staticmethod
+    def expand_recurrence(recurrence) -> list:
+        """Show times of every weekday and time in the date range."""
+        weekdays = set(recurrence["weekdays"])
+        show_times = []
+        day = recurrence["start_date"]
+        while day <= recurrence["end_date"]:
+            if day.weekday() in weekdays:
+                show_times.extend(
+                    timezone.make_aware(datetime.combine(day, show_time))
+                    for show_time in recurrence["times"]
+                )
+            day += timedelta(days=1)
+        return show_times
+
+    def validate(self, attrs):
+        """
+        Expand the recurrence or explicit show times and check the whole
+        batch at once: no duplicates and, in one query, no session
+        already scheduled in the dome at the same time.
+        """
+        if ("recurrence" in attrs) == ("show_times" in attrs):
+            raise serializers.ValidationError(
+                "Provide either recurrence or show_times."
+            )
+        show_times = attrs.pop("show_times", None)
+        if show_times is None:
+            show_times = self.expand_recurrence(attrs.pop("recurrence"))
+        if not show_times:
+            raise serializers.ValidationError(
+                {"recurrence": "The recurrence matches no show time."}
+            )
+        if len(show_times) > MAX_SCHEDULED_SHOW_SESSIONS:
+            raise serializers.ValidationError(
+                f"At most {MAX_SCHEDULED_SHOW_SESSIONS} show sessions "
+                f"can be scheduled at once."
+            )
+        if len(set(show_times)) != len(show_times):
+            raise serializers.ValidationError(
+                {"show_times": "Show times must be unique."}
+            )
+
+        taken = sorted(
+            ShowSession.objects.filter(
+                planetarium_dome=attrs["planetarium_dome"],
+                show_time__in=show_times
+            ).values_list("show_time", flat=True)
+        )
+        if taken:
+            raise serializers.ValidationError({
+                "show_times": [
+                    f"The dome already has a show session at "
+                    f"{show_time.isoformat()}."
+                    for show_time in taken
+                ]
+            })
+        attrs["show_times"] = sorted(show_times)
+        return attrs
+
+    def create(self, validated_data):
+        with transaction.atomic():
+            show_sessions = ShowSession.objects.bulk_create(
+                ShowSession(
+                    astronomy_show=validated_data["astronomy_show"],
+                    planetarium_dome=validated_data["planetarium_dome"],
+                    show_time=show_time,
+                )
+                for show_time in validated_data["show_times"]
+            )
+            ShowSessionDailyRollup.refresh(
+                show_session.rollup_key for show_session in show_sessions
+            )
+        return {
+            "astronomy_show": validated_data["astronomy_show"],
+            "planetarium_dome": validated_data["planetarium_dome"],
+            "ids": [show_session.id for show_session in show_sessions],
+        }
+
+
+class ShowSessionField(serializers.PrimaryKeyRelatedField):
+    """
+    Resolve show sessions together with their dome,
+    fetching each distinct session only once per serializer.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault(
+            "queryset",
+            ShowSession.objects.select_related("planetarium_dome")
+        )
+        super().__init__(**kwargs)
+        self._resolved = {}
+
+    def to_internal_value(self, data):
+        key = str(data)
+        if key not in self._resolved:
+            self._resolved[key] = super().to_internal_value(data)
+        return self._resolved[key]
+
+
+class TicketBatchSerializer(serializers.ListSerializer):
+    """
+    Validate a list of tickets checking seat conflicts
+    for the whole batch in a single query.
+    """
+
+    unique_fields = ("show_session", "row", "seat")
+
+    def run_child_validation(self, data):
+        ticket = super().run_child_validation(data)
+        self._valid_tickets.append(ticket)
+        return ticket
+
+    def to_internal_value(self, data):
+        self._valid_tickets = []
+        try:
+            tickets = super().to_internal_value(data)
+        except serializers.ValidationError as exc:
+            if not isinstance(exc.detail, list):
+                raise
+            tickets, errors = None, exc.detail
+        else:
+            errors = [{} for _ in tickets]
+
+        conflict_errors = iter(
+            self.get_seat_conflict_errors(self._valid_tickets)
+        )
+        for index, error in enumerate(errors):
+            if not error:
+                errors[index] = next(conflict_errors)
+        if any(errors):
+            raise serializers.ValidationError(errors)
+        return tickets
+
+    def get_seat_conflict_errors(self, tickets):
+        places = [
+            (ticket["show_session"].id, ticket["row"], ticket["seat"])
+            for ticket in tickets
+        ]
+        if not places:
+            return []
+
+        lookup = Q()
+        for show_session_id, row, seat in set(places):
+            lookup |= Q(show_session_id=show_session_id, row=row, seat=seat)
+        fields = ("show_session_id", "row", "seat", "held")
+        held_places = SeatHold.objects.active().filter(lookup)
+        request = self.context.get("request")
+        if request is not None:
+            held_places = held_places.exclude(user=request.user)
+        taken_places = {}
+        for show_session_id, row, seat, held in (
+                Ticket.objects.filter(lookup)
+                .annotate(held=Value(False))
+                .values_list(*fields)
+                .union(
+                    held_places.annotate(held=Value(True))
+                    .values_list(*fields)
+                )
+        ):
+            place = (show_session_id, row, seat)
+            # A sold seat is reported as sold even if also held.
+            taken_places[place] = taken_places.get(place, True) and held
+
+        message = UniqueTogetherValidator.message.format(
+            field_names=", ".join(self.unique_fields)
+        )
+        errors = []
+        for place in places:
+            if place not in taken_places:
+                errors.append({})
+                taken_places[place] = False
+                continue
+            if taken_places[place]:
+                error = ErrorDetail(SEAT_HELD_MESSAGE, code="held")
+            else:
+                error = ErrorDetail(message, code="unique")
+            errors.append({api_settings.NON_FIELD_ERRORS_KEY: [error]})
+        return errors
 
 
 class TicketSerializer(serializers.ModelSerializer):
+    show_session = ShowSessionField()
+
     class Meta:
         model = Ticket
         fields = ("id", "row", "seat", "show_session")
@@ -114,6 +399,13 @@ class TicketSerializer(serializers.ModelSerializer):
                 fields=["show_session", "row", "seat"]
             )
         ]
+        list_serializer_class = TicketBatchSerializer
+
+    def get_validators(self):
+        if isinstance(self.parent, TicketBatchSerializer):
+            # Seat conflicts are checked once for the whole batch.
+            return []
+        return super().get_validators()
 
     def validate(self, attrs):
         data = super(TicketSerializer, self).validate(attrs=attrs)
@@ -126,34 +418,83 @@ class TicketSerializer(serializers.ModelSerializer):
         return data
 
 
-class TicketSeatSerializer(TicketSerializer):
-    class Meta:
-        model = Ticket
-        fields = ("row", "seat")
+class SeatMapSerializer(serializers.Serializer):
+    show_session = serializers.IntegerField(source="show_session_id")
+    rows = serializers.IntegerField()
+    seats_in_row = serializers.IntegerField()
+    tickets_available = serializers.IntegerField()
+    encoding = serializers.SerializerMethodField()
+    taken = serializers.CharField(source="encoded")
 
+    def get_encoding(self, seat_map) -> str:
+        return SEAT_MAP_ENCODING
 
-class ShowSessionDetailSerializer(ShowSessionSerializer):
-    astronomy_show = AstronomyShowListSerializer(
-        many=False, read_only=True
-    )
-    planetarium_dome = PlanetariumDomeSerializer(
-        many=False, read_only=True
-    )
-    taken_places = TicketSeatSerializer(
-        many=True,
-        read_only=True,
-        source="tickets"
+
+class SeatPlaceSerializer(serializers.Serializer):
+    row = serializers.IntegerField()
+    seat = serializers.IntegerField()
+
+
+class SeatHoldSerializer(serializers.Serializer):
+    show_session = serializers.IntegerField(
+        source="show_session_id", read_only=True
     )
+    places = SeatPlaceSerializer(many=True, allow_empty=False)
+    expires_at = serializers.DateTimeField(read_only=True)
+
+    def validate_places(self, places):
+        """
+        Reject unavailable seats from the cached seat map and one
+        lookup of other users' holds, before any transaction.
+        """
+        show_session = self.context["show_session"]
+        seats = [(place["row"], place["seat"]) for place in places]
+        if len(set(seats)) != len(seats):
+            raise serializers.ValidationError("Places must be unique.")
+        for row, seat in seats:
+            Ticket.validate_seat_and_row(
+                seat,
+                row,
+                show_session.planetarium_dome,
+                serializers.ValidationError
+            )
 
-    class Meta:
-        model = ShowSession
-        fields = (
-            "id",
-            "show_time",
-            "astronomy_show",
-            "planetarium_dome",
-            "taken_places"
+        lookup = Q()
+        for row, seat in seats:
+            lookup |= Q(row=row, seat=seat)
+        held_seats = set(
+            SeatHold.objects.active()
+            .filter(lookup, show_session=show_session)
+            .exclude(user=self.context["request"].user)
+            .values_list("row", "seat")
         )
+        seat_map = get_seat_map(show_session.id)
+        unavailable = [
+            f"Seat (row: {row}, seat: {seat}) is not available."
+            for row, seat in seats
+            if (row, seat) in held_seats or seat_map.is_taken(row, seat)
+        ]
+        if unavailable:
+            raise serializers.ValidationError(unavailable)
+        return places
+
+    def create(self, validated_data):
+        show_session = self.context["show_session"]
+        places = validated_data["places"]
+        try:
+            expires_at = show_session.hold_seats(
+                self.context["request"].user,
+                [(place["row"], place["seat"]) for place in places]
+            )
+        except IntegrityError:
+            raise serializers.ValidationError(
+                {"places": ["Some of the seats have just been held."]}
+            )
+        return {
+            "show_session_id": show_session.id,
+            "places": places,
+            "expires_at": expires_at,
+        }
 
 
 class ReservationSerializer(serializers.ModelSerializer):
@@ -169,8 +510,21 @@ class ReservationSerializer(serializers.ModelSerializer):
         with transaction.atomic():
             tickets_data = validated_data.pop("tickets")
             reservation = Reservation.objects.create(**validated_data)
-            for ticket_data in tickets_data:
-                Ticket.objects.create(reservation=reservation, **ticket_data)
+            tickets = Ticket.objects.bulk_create(
+                Ticket(reservation=reservation, **ticket_data)
+                for ticket_data in tickets_data
+            )
+            tickets_sold = Counter(
+                ticket.show_session_id for ticket in tickets
+            )
+            ShowSession.update_tickets_sold(tickets_sold)
+            # The reservation converts the user's holds on its sessions.
+            SeatHold.objects.filter(
+                user=reservation.user, show_session_id__in=tickets_sold
+            ).delete()
+            transaction.on_commit(lambda: update_seat_maps(
+                taken=[ticket.place for ticket in tickets]
+            ))
             return reservation
 
 
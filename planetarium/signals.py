@@ -0,0 +1,206 @@
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Optional
+
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models import F
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete
+)
+from django.dispatch import receiver
+from django.utils import timezone
+
+from planetarium.caching import bump_model_version
+from planetarium.middleware import install_query_recorder
+from planetarium.models import (
+    AstronomyShow,
+    PlanetariumDome,
+    ShowSession,
+    ShowSessionDailyRollup,
+    ShowTheme,
+    Ticket
+)
+from planetarium.seat_map import forget_seat_maps, update_seat_maps
+
+
+@dataclass
+class Deletions:
+    """The tickets and show sessions deleted by one delete() call."""
+
+    origin: object
+    places: list = field(default_factory=list)
+    rollup_keys: dict = field(default_factory=dict)
+
+    def apply(self) -> None:
+        """
+        Update the counters, daily rollups and seat maps of the show
+        sessions once per session, skipping the deleted sessions.
+        """
+        freed = [
+            place for place in self.places
+            if place[0] not in self.rollup_keys
+        ]
+        tickets_sold = Counter()
+        for show_session_id, _, _ in freed:
+            tickets_sold[show_session_id] -= 1
+        if tickets_sold:
+            ShowSession.update_tickets_sold(tickets_sold)
+        ShowSessionDailyRollup.refresh(self.rollup_keys.values())
+
+        show_sessions = list(self.rollup_keys)
+        transaction.on_commit(lambda: update_seat_maps(freed=freed))
+        transaction.on_commit(lambda: forget_seat_maps(show_sessions))
+
+
+# Django sends pre_delete for every collected row before deleting any,
+# then post_delete: the pre_delete receivers collect the deletions of
+# the call and the first post_delete one applies them, so that
+# cascades cost queries per show session, not per ticket.
+_deletions: ContextVar[Optional[Deletions]] = ContextVar(
+    "deletions", default=None
+)
+
+
+def collect_deletions(origin) -> Deletions:
+    deletions = _deletions.get()
+    # Left over by another call that failed before deleting anything.
+    if deletions is None or deletions.origin is not origin:
+        deletions = Deletions(origin)
+        _deletions.set(deletions)
+    return deletions
+
+
+def apply_deletions(origin) -> None:
+    deletions = _deletions.get()
+    if deletions is not None and deletions.origin is origin:
+        _deletions.set(None)
+        deletions.apply()
+
+
+@receiver(connection_created)
+def database_connected(sender, connection, **kwargs):
+    install_query_recorder(connection)
+
+
+@receiver(post_save, sender=Ticket)
+def ticket_saved(sender, instance, created, **kwargs):
+    previous_place = getattr(instance, "loaded_place", None)
+    place = instance.place
+    if not created and previous_place == place:
+        return
+
+    tickets_sold = Counter({place[0]: 1})
+    freed = []
+    if not created and previous_place:
+        tickets_sold[previous_place[0]] -= 1
+        freed.append(previous_place)
+    ShowSession.update_tickets_sold(tickets_sold)
+
+    instance.loaded_place = place
+    transaction.on_commit(
+        lambda: update_seat_maps(taken=[place], freed=freed)
+    )
+
+
+@receiver(pre_delete, sender=Ticket)
+def ticket_deleting(sender, instance, origin, **kwargs):
+    collect_deletions(origin).places.append(
+        getattr(instance, "loaded_place", instance.place)
+    )
+
+
+@receiver(post_delete, sender=Ticket)
+def ticket_deleted(sender, instance, origin, **kwargs):
+    # Tickets are deleted before their show sessions, which apply the
+    # deletions once deleted themselves.
+    deletions = _deletions.get()
+    if deletions is not None and not deletions.rollup_keys:
+        apply_deletions(origin)
+
+
+@receiver(post_save, sender=ShowSession)
+def show_session_saved(sender, instance, **kwargs):
+    rollup_key = instance.rollup_key
+    ShowSessionDailyRollup.refresh(
+        {rollup_key, getattr(instance, "loaded_rollup_key", rollup_key)}
+    )
+    instance.loaded_rollup_key = rollup_key
+
+
+@receiver(pre_delete, sender=ShowSession)
+def show_session_deleting(sender, instance, origin, **kwargs):
+    collect_deletions(origin).rollup_keys[instance.id] = getattr(
+        instance, "loaded_rollup_key", instance.rollup_key
+    )
+
+
+@receiver(post_delete, sender=ShowSession)
+def show_session_deleted(sender, instance, origin, **kwargs):
+    apply_deletions(origin)
+
+
+@receiver(post_save, sender=PlanetariumDome)
+def planetarium_dome_saved(sender, instance, created, **kwargs):
+    if not created:
+        forget_seat_maps(
+            instance.showsession_set.values_list("id", flat=True)
+        )
+        # Every session of a rollup row is in this dome.
+        ShowSessionDailyRollup.objects.filter(
+            planetarium_dome=instance
+        ).update(seats=F("show_sessions") * instance.capacity)
+
+
+@receiver(post_save, sender=ShowTheme)
+@receiver(post_delete, sender=ShowTheme)
+@receiver(post_save, sender=PlanetariumDome)
+@receiver(post_delete, sender=PlanetariumDome)
+@receiver(post_save, sender=AstronomyShow)
+@receiver(post_delete, sender=AstronomyShow)
+def catalog_changed(sender, **kwargs):
+    bump_catalog_version(sender)
+
+
+@receiver(m2m_changed, sender=AstronomyShow.show_themes.through)
+def astronomy_show_themes_changed(
+        sender, instance, action, reverse, pk_set, **kwargs
+):
+    if action in ("post_add", "post_remove", "pre_clear"):
+        if not reverse:
+            astronomy_shows = AstronomyShow.objects.filter(pk=instance.pk)
+        elif pk_set is None:
+            astronomy_shows = instance.astronomyshow_set.all()
+        else:
+            astronomy_shows = AstronomyShow.objects.filter(pk__in=pk_set)
+        touch_astronomy_shows(astronomy_shows)
+    if action.startswith("post_"):
+        bump_catalog_version(AstronomyShow)
+
+
+@receiver(post_save, sender=ShowTheme)
+def show_theme_saved(sender, instance, created, **kwargs):
+    if not created:
+        touch_astronomy_shows(instance.astronomyshow_set.all())
+
+
+@receiver(pre_delete, sender=ShowTheme)
+def show_theme_deleted(sender, instance, **kwargs):
+    touch_astronomy_shows(instance.astronomyshow_set.all())
+
+
+def touch_astronomy_shows(astronomy_shows) -> None:
+    # Show themes are part of the representation of their shows, whose
+    # updated_at is the Last-Modified of astronomy show responses.
+    astronomy_shows.update(updated_at=timezone.now())
+
+
+def bump_catalog_version(model):
+    # Bump again on commit: a response cached between the first bump
+    # and the commit was built from the data before this write.
+    bump_model_version(model)
+    transaction.on_commit(lambda: bump_model_version(model))
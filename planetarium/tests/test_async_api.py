@@ -0,0 +1,156 @@
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from planetarium.models import (
+    AstronomyShow,
+    PlanetariumDome,
+    Reservation,
+    ShowSession,
+    ShowTheme
+)
+
+
+ASTRONOMY_SHOW_URL = reverse("planetarium:astronomyshow-list")
+SHOW_SESSION_URL = reverse("planetarium:showsession-list")
+RESERVATION_URL = reverse("planetarium:reservation-list")
+
+
+def show_session_detail_url(show_session_id):
+    return reverse("planetarium:showsession-detail", args=[show_session_id])
+
+
+def auth_headers(user) -> dict:
+    return {"Authorization": f"Bearer {AccessToken.for_user(user)}"}
+
+
+class AsyncCatalogApiTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test_user@example.com", password="testpassword"
+        )
+        self.client.force_authenticate(self.user)
+        self.headers = auth_headers(self.user)
+
+        show_theme = ShowTheme.objects.create(name="Galaxies")
+        planetarium_dome = PlanetariumDome.objects.create(
+            name="Glass", rows=10, seats_in_row=12
+        )
+        for number in range(25):
+            astronomy_show = AstronomyShow.objects.create(
+                title=f"Show {number}", description="Deep space."
+            )
+            astronomy_show.show_themes.add(show_theme)
+            ShowSession.objects.create(
+                astronomy_show=astronomy_show,
+                planetarium_dome=planetarium_dome,
+                show_time=f"2024-11-{number + 1:02d} 14:00:00+00:00",
+            )
+
+    async def get(self, url, params=None):
+        """Get the url with the async client and with the sync client."""
+        async_res = await self.async_client.get(
+            url, params or {}, headers=self.headers
+        )
+        sync_res = await sync_to_async(self.client.get)(url, params)
+        return async_res, sync_res
+
+    async def test_astronomy_show_list(self):
+        for params in ({}, {"title": "Show 1"}):
+            async_res, sync_res = await self.get(ASTRONOMY_SHOW_URL, params)
+
+            self.assertEqual(async_res.status_code, status.HTTP_200_OK)
+            self.assertEqual(async_res.json(), sync_res.json())
+
+    async def test_show_session_list(self):
+        async_res, sync_res = await self.get(
+            SHOW_SESSION_URL, {"from": "2024-11-05", "page_size": 10}
+        )
+
+        self.assertEqual(async_res.status_code, status.HTTP_200_OK)
+        data = async_res.json()
+        self.assertEqual(len(data["results"]), 10)
+        self.assertEqual(data["results"], sync_res.json()["results"])
+        self.assertIn(SHOW_SESSION_URL, data["next"])
+
+    async def test_show_session_retrieve(self):
+        show_session = await ShowSession.objects.afirst()
+
+        async_res, sync_res = await self.get(
+            show_session_detail_url(show_session.id)
+        )
+
+        self.assertEqual(async_res.status_code, status.HTTP_200_OK)
+        self.assertEqual(async_res.json(), sync_res.json())
+
+    async def test_show_session_retrieve_unknown(self):
+        res = await self.async_client.get(
+            show_session_detail_url(0), headers=self.headers
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    async def test_auth_required(self):
+        res = await self.async_client.get(SHOW_SESSION_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class AsyncReservationApiTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email="test_user@example.com", password="testpassword"
+        )
+        self.headers = auth_headers(self.user)
+        self.show_session = ShowSession.objects.create(
+            astronomy_show=AstronomyShow.objects.create(
+                title="The Big Bang", description="The beginning of space."
+            ),
+            planetarium_dome=PlanetariumDome.objects.create(
+                name="Glass", rows=3, seats_in_row=5
+            ),
+            show_time="2024-11-20 14:00:00+00:00",
+        )
+
+    async def reserve(self, *seats):
+        return await self.async_client.post(
+            RESERVATION_URL,
+            {
+                "tickets": [
+                    {
+                        "row": 1,
+                        "seat": seat,
+                        "show_session": self.show_session.id,
+                    }
+                    for seat in seats
+                ]
+            },
+            content_type="application/json",
+            headers=self.headers
+        )
+
+    async def test_create_reservation(self):
+        res = await self.reserve(1, 2)
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        data = res.json()
+        reservation = await Reservation.objects.aget(id=data["id"])
+        self.assertEqual(reservation.user_id, self.user.id)
+        self.assertEqual(len(data["tickets"]), 2)
+        await self.show_session.arefresh_from_db()
+        self.assertEqual(self.show_session.tickets_sold, 2)
+
+    async def test_taken_seat_rejected(self):
+        await self.reserve(1)
+
+        res = await self.reserve(1)
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(await Reservation.objects.acount(), 1)
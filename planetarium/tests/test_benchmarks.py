@@ -0,0 +1,793 @@
+"""
+Endpoint benchmarks: latency percentiles and SQL query counts of every
+endpoint of the planetarium and user APIs against a seeded dataset,
+checked against the budgets committed in benchmark_budgets.json.
+
+They are skipped unless BENCHMARK=1 and run in the throwaway test
+database:
+
+    BENCHMARK=1 python manage.py test planetarium.tests.test_benchmarks \
+        --settings=planetarium_api_service.test_settings
+
+BENCHMARK_SCALE scales the dataset, BENCHMARK_ITERATIONS sets the
+requests per endpoint, BENCHMARK_REPORT=<path> writes the measurements
+as JSON and BENCHMARK_RECORD=1 rewrites the budgets from them.
+
+The serialization benchmarks print the microseconds per row of the
+list serializers against the values() rows serving the same lists, and
+the time each renderer takes to render large show session and
+reservation pages.
+"""
+import gc
+import io
+import json
+import math
+import os
+import shutil
+import tempfile
+import time
+from dataclasses import dataclass
+from datetime import date, timedelta
+from pathlib import Path
+from statistics import median, quantiles
+from typing import Callable, Optional
+from unittest import skipUnless
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.db.models import Prefetch
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLResolver, reverse
+from PIL import Image
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework.throttling import SimpleRateThrottle
+from rest_framework_simplejwt.tokens import RefreshToken
+
+import planetarium.urls
+import user.urls
+from planetarium.benchmark_data import FIRST_SHOW_TIME, seed
+from planetarium.models import (
+    AstronomyShow,
+    PlanetariumDome,
+    Reservation,
+    ShowSession,
+    ShowTheme,
+    Ticket
+)
+from planetarium.renderers import (
+    MessagePackRenderer,
+    ORJSONRenderer,
+    msgpack
+)
+from planetarium.serializers import (
+    AstronomyShowListSerializer,
+    ReservationListSerializer,
+    ShowSessionListSerializer
+)
+from planetarium.values_serializers import ValuesListSerializer
+from planetarium.views import AstronomyShowViewSet, ShowSessionViewSet
+
+
+BUDGETS_PATH = Path(__file__).with_name("benchmark_budgets.json")
+ITERATIONS = int(os.environ.get("BENCHMARK_ITERATIONS", 20))
+SCALE = float(os.environ.get("BENCHMARK_SCALE", 1))
+PASSWORD = "benchmarkpassword"
+# Rows of the pages rendered by the serialization benchmarks.
+RENDERED_PAGE_ROWS = {"show sessions": 1000, "reservations": 200}
+# Scheduled sessions start well after the seeded ones.
+SCHEDULE_START = date(2030, 1, 7)
+
+# Endpoints exposed by the router but not usable by clients.
+UNSUPPORTED = {
+    # Reservations are immutable: updating nested tickets is not supported.
+    ("planetarium:reservation-detail", "put"),
+}
+
+
+@dataclass
+class Endpoint:
+    url_name: str
+    method: str
+    role: Optional[str] = "user"
+    expected_status: int = status.HTTP_200_OK
+    args: Callable[[int], list] = lambda iteration: []
+    data: Callable[[int], Optional[dict]] = lambda iteration: None
+    format: str = "json"
+    # Revalidated with the ETag of a first, unmeasured response.
+    conditional: bool = False
+    # Tells apart benchmarks of the same endpoint with other data.
+    variant: Optional[str] = None
+
+    @property
+    def name(self) -> str:
+        name = f"{self.method.upper()} {self.url_name}"
+        if self.conditional:
+            return f"{name} (If-None-Match)"
+        return f"{name} ({self.variant})" if self.variant else name
+
+
+@dataclass
+class Measurement:
+    latencies: list
+    queries: list
+
+    @property
+    def p95(self) -> float:
+        if len(self.latencies) < 2:
+            return max(self.latencies)
+        return quantiles(self.latencies, n=20)[-1]
+
+    def as_dict(self) -> dict:
+        return {
+            "p50_ms": round(median(self.latencies), 2),
+            "p95_ms": round(self.p95, 2),
+            "max_ms": round(max(self.latencies), 2),
+            "queries": max(self.queries),
+        }
+
+
+def url_methods(patterns, namespace):
+    """Yield (url name, method) of every view in the URL patterns."""
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from url_methods(pattern.url_patterns, namespace)
+            continue
+        callback = pattern.callback
+        if getattr(callback, "actions", None):
+            methods = callback.actions
+        elif hasattr(callback, "cls"):
+            methods = [
+                method for method in callback.cls.http_method_names
+                if method not in ("head", "options")
+                and hasattr(callback.cls, method)
+            ]
+        else:
+            methods = ["get"]
+        for method in methods:
+            if method != "head":
+                yield f"{namespace}:{pattern.name}", method
+
+
+def jpeg_bytes() -> bytes:
+    image_file = io.BytesIO()
+    Image.new("RGB", (64, 64)).save(image_file, format="JPEG")
+    return image_file.getvalue()
+
+
+@skipUnless(
+    os.environ.get("BENCHMARK"),
+    "Set BENCHMARK=1 to run the endpoint benchmarks."
+)
+class EndpointBenchmarkTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.media_root = tempfile.mkdtemp()
+        cls.enterClassContext(override_settings(MEDIA_ROOT=cls.media_root))
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(cls.media_root, ignore_errors=True)
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.dataset = seed(scale=SCALE)
+
+        cls.admin = get_user_model().objects.create_user(
+            email="benchmark_admin@example.com",
+            password=PASSWORD,
+            is_staff=True
+        )
+        cls.user = get_user_model().objects.create_user(
+            email="benchmark_user@example.com", password=PASSWORD
+        )
+        Reservation.objects.filter(
+            id__in=Reservation.objects.order_by("?").values("id")[:50]
+        ).update(user=cls.user)
+
+        cls.show_theme = ShowTheme.objects.first()
+        cls.planetarium_dome = PlanetariumDome.objects.first()
+        cls.astronomy_show = AstronomyShow.objects.first()
+        cls.busy_show_session = (
+            ShowSession.objects.select_related("planetarium_dome")
+            .order_by("-tickets_sold").first()
+        )
+        cls.free_show_session = (
+            ShowSession.objects.select_related("planetarium_dome")
+            .filter(tickets_sold=0).first()
+        )
+        cls.reservation = Reservation.objects.filter(user=cls.user).first()
+        # Every reservation request books a row of its own.
+        cls.booking_show_session = ShowSession.objects.create(
+            astronomy_show=cls.astronomy_show,
+            planetarium_dome=PlanetariumDome.objects.create(
+                name="Benchmark", rows=2 * ITERATIONS, seats_in_row=10
+            ),
+            show_time=FIRST_SHOW_TIME,
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.throttle_rates = SimpleRateThrottle.THROTTLE_RATES
+        # Keep the throttles in the measurements without limiting them.
+        SimpleRateThrottle.THROTTLE_RATES = {
+            scope: "1000000/second" for scope in self.throttle_rates
+        }
+        self.clients = {None: APIClient()}
+        for role, account in (("user", self.user), ("admin", self.admin)):
+            client = APIClient()
+            client.credentials(
+                HTTP_AUTHORIZATION=(
+                    f"Bearer {RefreshToken.for_user(account).access_token}"
+                )
+            )
+            self.clients[role] = client
+
+    def tearDown(self):
+        SimpleRateThrottle.THROTTLE_RATES = self.throttle_rates
+
+    def endpoints(self) -> list[Endpoint]:
+        image = jpeg_bytes()
+        refresh_token = RefreshToken.for_user(self.user)
+        show_session_data = {
+            "show_time": "2025-01-01T18:00:00Z",
+            "astronomy_show": self.astronomy_show.id,
+            "planetarium_dome": self.planetarium_dome.id,
+        }
+
+        def show_theme(iteration):
+            return [ShowTheme.objects.create(name=f"Theme {iteration}").id]
+
+        def planetarium_dome(iteration):
+            return [
+                PlanetariumDome.objects.create(
+                    name=f"Dome {iteration}", rows=5, seats_in_row=5
+                ).id
+            ]
+
+        def astronomy_show(iteration):
+            return [
+                AstronomyShow.objects.create(
+                    title=f"Show {iteration}", description="Benchmark."
+                ).id
+            ]
+
+        def show_session(iteration):
+            return [
+                ShowSession.objects.create(
+                    astronomy_show=self.astronomy_show,
+                    planetarium_dome=self.planetarium_dome,
+                    show_time=FIRST_SHOW_TIME - timedelta(days=iteration + 1),
+                ).id
+            ]
+
+        def sold_show_session(iteration):
+            show_session = ShowSession.objects.create(
+                astronomy_show=self.astronomy_show,
+                planetarium_dome=self.planetarium_dome,
+                show_time=FIRST_SHOW_TIME - timedelta(
+                    days=iteration + 1, hours=2
+                ),
+            )
+            # Two reservations of a full row each, owned by the admin
+            # to leave the user's reservations alone.
+            reservations = Reservation.objects.bulk_create(
+                Reservation(user=self.admin) for _ in range(2)
+            )
+            tickets_sold = len(Ticket.objects.bulk_create(
+                Ticket(
+                    reservation=reservation,
+                    show_session=show_session,
+                    row=row,
+                    seat=seat
+                )
+                for row, reservation in enumerate(reservations, start=1)
+                for seat in range(1, self.planetarium_dome.seats_in_row + 1)
+            ))
+            ShowSession.update_tickets_sold({show_session.id: tickets_sold})
+            return [show_session.id]
+
+        def reservation(iteration):
+            reservation = Reservation.objects.create(user=self.user)
+            Ticket.objects.create(
+                reservation=reservation,
+                show_session=self.busy_show_session,
+                row=self.busy_show_session.planetarium_dome.rows,
+                seat=self.busy_show_session.planetarium_dome.seats_in_row,
+            )
+            return [reservation.id]
+
+        def tickets(row):
+            return {
+                "tickets": [
+                    {
+                        "row": row,
+                        "seat": seat,
+                        "show_session": self.booking_show_session.id
+                    }
+                    for seat in range(1, 5)
+                ]
+            }
+
+        def busy_session(iteration):
+            return [self.busy_show_session.id]
+
+        def free_session(iteration):
+            return [self.free_show_session.id]
+
+        dome = self.free_show_session.planetarium_dome
+        hold = {
+            "places": [
+                {"row": dome.rows, "seat": seat} for seat in range(1, 5)
+            ]
+        }
+
+        return [
+            Endpoint("planetarium:api-root", "get"),
+            Endpoint("planetarium:showtheme-list", "get"),
+            Endpoint(
+                "planetarium:showtheme-list", "post", role="admin",
+                expected_status=status.HTTP_201_CREATED,
+                data=lambda iteration: {"name": f"New theme {iteration}"},
+            ),
+            Endpoint(
+                "planetarium:showtheme-detail", "get",
+                args=lambda iteration: [self.show_theme.id],
+            ),
+            Endpoint(
+                "planetarium:showtheme-detail", "put", role="admin",
+                args=lambda iteration: [self.show_theme.id],
+                data=lambda iteration: {"name": "Galaxies"},
+            ),
+            Endpoint(
+                "planetarium:showtheme-detail", "patch", role="admin",
+                args=lambda iteration: [self.show_theme.id],
+                data=lambda iteration: {"name": "Galaxies"},
+            ),
+            Endpoint(
+                "planetarium:showtheme-detail", "delete", role="admin",
+                expected_status=status.HTTP_204_NO_CONTENT,
+                args=show_theme,
+            ),
+            Endpoint("planetarium:planetariumdome-list", "get"),
+            Endpoint(
+                "planetarium:planetariumdome-list", "post", role="admin",
+                expected_status=status.HTTP_201_CREATED,
+                data=lambda iteration: {
+                    "name": f"New dome {iteration}",
+                    "rows": 10,
+                    "seats_in_row": 10,
+                },
+            ),
+            Endpoint(
+                "planetarium:planetariumdome-detail", "get",
+                args=lambda iteration: [self.planetarium_dome.id],
+            ),
+            Endpoint(
+                "planetarium:planetariumdome-detail", "put", role="admin",
+                args=lambda iteration: [self.planetarium_dome.id],
+                data=lambda iteration: {
+                    "name": self.planetarium_dome.name,
+                    "rows": self.planetarium_dome.rows,
+                    "seats_in_row": self.planetarium_dome.seats_in_row,
+                },
+            ),
+            Endpoint(
+                "planetarium:planetariumdome-detail", "patch", role="admin",
+                args=lambda iteration: [self.planetarium_dome.id],
+                data=lambda iteration: {"name": self.planetarium_dome.name},
+            ),
+            Endpoint(
+                "planetarium:planetariumdome-detail", "delete", role="admin",
+                expected_status=status.HTTP_204_NO_CONTENT,
+                args=planetarium_dome,
+            ),
+            Endpoint("planetarium:astronomyshow-list", "get"),
+            Endpoint(
+                "planetarium:astronomyshow-list", "get",
+                expected_status=status.HTTP_304_NOT_MODIFIED,
+                conditional=True,
+            ),
+            Endpoint(
+                "planetarium:astronomyshow-list", "post", role="admin",
+                expected_status=status.HTTP_201_CREATED,
+                data=lambda iteration: {
+                    "title": f"New show {iteration}",
+                    "description": "A new astronomy show.",
+                    "show_themes": [self.show_theme.id],
+                },
+            ),
+            Endpoint(
+                "planetarium:astronomyshow-search", "get",
+                data=lambda iteration: {"q": "black hole"},
+            ),
+            Endpoint(
+                "planetarium:astronomyshow-detail", "get",
+                args=lambda iteration: [self.astronomy_show.id],
+            ),
+            Endpoint(
+                "planetarium:astronomyshow-detail", "put", role="admin",
+                args=lambda iteration: [self.astronomy_show.id],
+                data=lambda iteration: {
+                    "title": self.astronomy_show.title,
+                    "description": self.astronomy_show.description,
+                    "show_themes": [self.show_theme.id],
+                },
+            ),
+            Endpoint(
+                "planetarium:astronomyshow-detail", "patch", role="admin",
+                args=lambda iteration: [self.astronomy_show.id],
+                data=lambda iteration: {"title": self.astronomy_show.title},
+            ),
+            Endpoint(
+                "planetarium:astronomyshow-detail", "delete", role="admin",
+                expected_status=status.HTTP_204_NO_CONTENT,
+                args=astronomy_show,
+            ),
+            Endpoint(
+                "planetarium:astronomyshow-upload-image", "post",
+                role="admin",
+                args=lambda iteration: [self.astronomy_show.id],
+                data=lambda iteration: {
+                    "image": SimpleUploadedFile(
+                        "show.jpg", image, content_type="image/jpeg"
+                    )
+                },
+                format="multipart",
+            ),
+            Endpoint("planetarium:showsession-list", "get"),
+            Endpoint(
+                "planetarium:showsession-list", "get",
+                expected_status=status.HTTP_304_NOT_MODIFIED,
+                conditional=True,
+            ),
+            Endpoint(
+                "planetarium:showsession-list", "post", role="admin",
+                expected_status=status.HTTP_201_CREATED,
+                data=lambda iteration: show_session_data,
+            ),
+            Endpoint(
+                "planetarium:showsession-detail", "get", args=busy_session
+            ),
+            Endpoint(
+                "planetarium:showsession-detail", "get", args=busy_session,
+                expected_status=status.HTTP_304_NOT_MODIFIED,
+                conditional=True,
+            ),
+            Endpoint(
+                "planetarium:showsession-detail", "put", role="admin",
+                args=show_session, data=lambda iteration: show_session_data,
+            ),
+            Endpoint(
+                "planetarium:showsession-detail", "patch", role="admin",
+                args=show_session,
+                data=lambda iteration: {"show_time": "2025-01-01T20:00:00Z"},
+            ),
+            Endpoint(
+                "planetarium:showsession-detail", "delete", role="admin",
+                expected_status=status.HTTP_204_NO_CONTENT,
+                args=show_session,
+            ),
+            Endpoint(
+                "planetarium:showsession-detail", "delete", role="admin",
+                expected_status=status.HTTP_204_NO_CONTENT,
+                args=sold_show_session,
+                variant="with tickets",
+            ),
+            Endpoint(
+                "planetarium:showsession-calendar", "get",
+                data=lambda iteration: {
+                    "from": FIRST_SHOW_TIME.date().isoformat(),
+                    "to": (
+                        FIRST_SHOW_TIME.date() + timedelta(days=30)
+                    ).isoformat(),
+                },
+            ),
+            Endpoint(
+                "planetarium:showsession-schedule", "post", role="admin",
+                expected_status=status.HTTP_201_CREATED,
+                data=lambda iteration: {
+                    "astronomy_show": self.astronomy_show.id,
+                    "planetarium_dome": self.planetarium_dome.id,
+                    # Four weeks of two daily sessions per request.
+                    "recurrence": {
+                        "weekdays": list(range(7)),
+                        "times": ["11:00", "19:00"],
+                        "start_date": (
+                            SCHEDULE_START + timedelta(weeks=4 * iteration)
+                        ).isoformat(),
+                        "end_date": (
+                            SCHEDULE_START
+                            + timedelta(weeks=4 * iteration + 4, days=-1)
+                        ).isoformat(),
+                    },
+                },
+            ),
+            Endpoint(
+                "planetarium:showsession-seat-map", "get", args=busy_session
+            ),
+            Endpoint(
+                "planetarium:showsession-hold", "post",
+                expected_status=status.HTTP_201_CREATED,
+                args=free_session, data=lambda iteration: hold,
+            ),
+            Endpoint(
+                "planetarium:showsession-hold", "get", args=free_session
+            ),
+            Endpoint(
+                "planetarium:showsession-hold", "delete",
+                expected_status=status.HTTP_204_NO_CONTENT,
+                args=free_session,
+            ),
+            Endpoint("planetarium:reservation-list", "get"),
+            Endpoint(
+                "planetarium:reservation-list", "post",
+                expected_status=status.HTTP_201_CREATED,
+                data=lambda iteration: tickets(iteration + 1),
+            ),
+            Endpoint(
+                "planetarium:reservation-detail", "get",
+                args=lambda iteration: [self.reservation.id],
+            ),
+            Endpoint(
+                "planetarium:reservation-detail", "patch",
+                args=lambda iteration: [self.reservation.id],
+                data=lambda iteration: {},
+            ),
+            Endpoint(
+                "planetarium:reservation-detail", "delete",
+                expected_status=status.HTTP_204_NO_CONTENT,
+                args=reservation,
+            ),
+            Endpoint(
+                "planetarium:reservation-export", "get", role="admin",
+                data=lambda iteration: {
+                    "output": "ndjson",
+                    "show_session": self.busy_show_session.id,
+                },
+            ),
+            Endpoint(
+                "user:create", "post", role=None,
+                expected_status=status.HTTP_201_CREATED,
+                data=lambda iteration: {
+                    "email": f"new_user{iteration}@example.com",
+                    "password": PASSWORD,
+                },
+            ),
+            Endpoint(
+                "user:token_obtain_pair", "post", role=None,
+                data=lambda iteration: {
+                    "email": self.user.email, "password": PASSWORD
+                },
+            ),
+            Endpoint(
+                "user:token_refresh", "post", role=None,
+                data=lambda iteration: {"refresh": str(refresh_token)},
+            ),
+            Endpoint(
+                "user:token_verify", "post", role=None,
+                data=lambda iteration: {
+                    "token": str(refresh_token.access_token)
+                },
+            ),
+            Endpoint("user:manage", "get"),
+            Endpoint(
+                "user:manage", "put",
+                data=lambda iteration: {
+                    "email": self.user.email, "password": PASSWORD
+                },
+            ),
+            Endpoint(
+                "user:manage", "patch",
+                data=lambda iteration: {"email": self.user.email},
+            ),
+        ]
+
+    def measure(self, endpoint: Endpoint) -> Measurement:
+        client = self.clients[endpoint.role]
+        request = getattr(client, endpoint.method)
+        latencies, queries = [], []
+        # Like timeit, keep collections from landing on random requests.
+        gc.collect()
+        gc.disable()
+        try:
+            self.run_iterations(endpoint, request, latencies, queries)
+        finally:
+            gc.enable()
+        return Measurement(latencies, queries)
+
+    def run_iterations(self, endpoint, request, latencies, queries):
+        for iteration in range(ITERATIONS):
+            url = reverse(endpoint.url_name, args=endpoint.args(iteration))
+            data = endpoint.data(iteration)
+            headers = {}
+            if endpoint.conditional:
+                headers["HTTP_IF_NONE_MATCH"] = request(url, data)["ETag"]
+            with CaptureQueriesContext(connection) as captured:
+                started = time.perf_counter()
+                response = request(
+                    url, data, format=endpoint.format, **headers
+                )
+                if response.streaming:
+                    b"".join(response.streaming_content)
+                latencies.append((time.perf_counter() - started) * 1000)
+            queries.append(len(captured))
+            self.assertEqual(
+                response.status_code,
+                endpoint.expected_status,
+                f"{endpoint.name}: {getattr(response, 'data', response)}"
+            )
+
+    def test_every_endpoint_is_benchmarked(self):
+        routes = set(
+            url_methods(planetarium.urls.urlpatterns, "planetarium")
+        ) | set(url_methods(user.urls.urlpatterns, "user"))
+        benchmarked = {
+            (endpoint.url_name, endpoint.method)
+            for endpoint in self.endpoints()
+        }
+
+        self.assertEqual(routes - UNSUPPORTED - benchmarked, set())
+
+    def test_endpoint_budgets(self):
+        budgets = json.loads(BUDGETS_PATH.read_text())
+        # Warm up URL resolution and serializer construction.
+        self.clients["user"].get(reverse("planetarium:api-root"))
+
+        report = {}
+        for endpoint in self.endpoints():
+            report[endpoint.name] = self.measure(endpoint).as_dict()
+
+        print(f"\n{'endpoint':<58} {'p50 ms':>8} {'p95 ms':>8} {'queries':>8}")
+        for name, result in report.items():
+            print(
+                f"{name:<58} {result['p50_ms']:>8.1f} "
+                f"{result['p95_ms']:>8.1f} {result['queries']:>8}"
+            )
+        if os.environ.get("BENCHMARK_REPORT"):
+            Path(os.environ["BENCHMARK_REPORT"]).write_text(
+                json.dumps({"dataset": self.dataset, "endpoints": report},
+                           indent=2)
+            )
+        if os.environ.get("BENCHMARK_RECORD"):
+            # Latency budgets leave room for slower machines,
+            # query budgets are exact.
+            BUDGETS_PATH.write_text(json.dumps({
+                name: {
+                    "queries": result["queries"],
+                    "p95_ms": math.ceil(max(3 * result["p95_ms"], 25)),
+                }
+                for name, result in report.items()
+            }, indent=2) + "\n")
+            return
+
+        exceeded = []
+        for name, result in report.items():
+            budget = budgets.get(name)
+            if budget is None:
+                exceeded.append(f"{name}: no committed budget")
+                continue
+            if result["queries"] > budget["queries"]:
+                exceeded.append(
+                    f"{name}: {result['queries']} queries, "
+                    f"budget {budget['queries']}"
+                )
+            if result["p95_ms"] > budget["p95_ms"]:
+                exceeded.append(
+                    f"{name}: p95 {result['p95_ms']} ms, "
+                    f"budget {budget['p95_ms']} ms"
+                )
+        self.assertEqual(exceeded, [], "\n".join(exceeded))
+
+
+@skipUnless(
+    os.environ.get("BENCHMARK"),
+    "Set BENCHMARK=1 to run the serialization benchmarks."
+)
+class SerializationBenchmarkTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed(scale=SCALE)
+
+    def best_us_per_row(self, serialize: Callable[[], list]) -> float:
+        """Best of ITERATIONS runs, in microseconds per row."""
+        timings = []
+        for iteration in range(ITERATIONS):
+            started = time.perf_counter()
+            rows = len(serialize())
+            timings.append((time.perf_counter() - started) / rows * 1e6)
+        return min(timings)
+
+    @staticmethod
+    def timed(function: Callable, *args) -> float:
+        started = time.perf_counter()
+        function(*args)
+        return time.perf_counter() - started
+
+    def test_values_rows_serialize_faster(self):
+        context = {"request": APIRequestFactory().get("/")}
+        print(f"\n{'serializer':<30} {'drf us/row':>11} {'values us/row':>14}")
+        for serializer_class, viewset_class in (
+                (ShowSessionListSerializer, ShowSessionViewSet),
+                (AstronomyShowListSerializer, AstronomyShowViewSet),
+        ):
+            queryset = viewset_class.queryset.order_by("id")
+            values_serializer = ValuesListSerializer(
+                serializer_class(context=context),
+                viewset_class.values_expressions
+            )
+
+            # Fetching included: instances (and prefetches) against rows.
+            drf = self.best_us_per_row(
+                lambda: serializer_class(
+                    queryset.all(), many=True, context=context
+                ).data
+            )
+            values = self.best_us_per_row(
+                lambda: values_serializer.to_representation(
+                    values_serializer.values(queryset)
+                )
+            )
+
+            print(
+                f"{serializer_class.__name__:<30} {drf:>11.1f} "
+                f"{values:>14.1f}"
+            )
+            self.assertLess(values, drf, serializer_class.__name__)
+
+    def test_renderers(self):
+        context = {"request": APIRequestFactory().get("/")}
+        reservations = Reservation.objects.prefetch_related(
+            Prefetch(
+                "tickets",
+                queryset=Ticket.objects.select_related(
+                    "show_session__astronomy_show",
+                    "show_session__planetarium_dome"
+                )
+            )
+        ).order_by("id")
+        pages = {
+            "show sessions": ShowSessionListSerializer(
+                ShowSessionViewSet.queryset.order_by("id")[
+                    :RENDERED_PAGE_ROWS["show sessions"]
+                ],
+                many=True,
+                context=context
+            ).data,
+            "reservations": ReservationListSerializer(
+                reservations[:RENDERED_PAGE_ROWS["reservations"]],
+                many=True,
+                context=context
+            ).data,
+        }
+        renderer_classes = [JSONRenderer, ORJSONRenderer]
+        if msgpack is not None:
+            renderer_classes.append(MessagePackRenderer)
+
+        print(f"\n{'page':<30} {'renderer':<20} {'ms':>8} {'KiB':>8}")
+        for name, results in pages.items():
+            page = {"next": None, "previous": None, "results": results}
+            timings = {}
+            for renderer_class in renderer_classes:
+                renderer = renderer_class()
+                content = renderer.render(page)
+                timings[renderer_class] = min(
+                    self.timed(renderer.render, page)
+                    for iteration in range(ITERATIONS)
+                )
+                print(
+                    f"{f'{len(results)} {name}':<30} "
+                    f"{renderer_class.__name__:<20} "
+                    f"{timings[renderer_class] * 1000:>8.2f} "
+                    f"{len(content) / 1024:>8.1f}"
+                )
+
+            self.assertLess(
+                timings[ORJSONRenderer], timings[JSONRenderer], name
+            )
@@ -0,0 +1,104 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from planetarium.models import AstronomyShow, PlanetariumDome, ShowTheme
+
+
+ASTRONOMY_SHOW_URL = reverse("planetarium:astronomyshow-list")
+PLANETARIUM_DOME_URL = reverse("planetarium:planetariumdome-list")
+SHOW_THEME_URL = reverse("planetarium:showtheme-list")
+
+
+def detail_url(astronomy_show_id):
+    return reverse(
+        "planetarium:astronomyshow-detail", args=[astronomy_show_id]
+    )
+
+
+class CatalogResponseCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test_admin@example.com",
+            password="testpassword",
+            is_staff=True,
+        )
+        self.client.force_authenticate(self.user)
+        self.show_theme = ShowTheme.objects.create(name="Galaxies")
+        self.astronomy_show = AstronomyShow.objects.create(
+            title="Andromeda", description="Our nearest big neighbour."
+        )
+        self.astronomy_show.show_themes.add(self.show_theme)
+        PlanetariumDome.objects.create(name="Glass", rows=10, seats_in_row=12)
+
+    def test_cached_reads_skip_database(self):
+        for url in (
+            ASTRONOMY_SHOW_URL,
+            detail_url(self.astronomy_show.id),
+            PLANETARIUM_DOME_URL,
+            SHOW_THEME_URL,
+        ):
+            first = self.client.get(url)
+            with self.assertNumQueries(0):
+                second = self.client.get(url)
+
+            self.assertEqual(second.status_code, status.HTTP_200_OK)
+            self.assertEqual(second.data, first.data)
+
+    def test_query_params_are_part_of_key(self):
+        other_theme = ShowTheme.objects.create(name="Planets")
+        self.client.get(
+            ASTRONOMY_SHOW_URL, {"show_themes": self.show_theme.id}
+        )
+
+        res = self.client.get(
+            ASTRONOMY_SHOW_URL, {"show_themes": other_theme.id}
+        )
+
+        self.assertEqual(res.data, [])
+
+    def test_write_through_api_invalidates_list(self):
+        self.client.get(ASTRONOMY_SHOW_URL)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(
+                detail_url(self.astronomy_show.id), {"title": "Andromeda 2"}
+            )
+        res = self.client.get(ASTRONOMY_SHOW_URL)
+
+        self.assertEqual(res.data[0]["title"], "Andromeda 2")
+
+    def test_related_theme_change_invalidates_astronomy_shows(self):
+        self.client.get(detail_url(self.astronomy_show.id))
+
+        self.show_theme.name = "Nebulae"
+        self.show_theme.save()
+        res = self.client.get(detail_url(self.astronomy_show.id))
+
+        self.assertEqual(res.data["show_themes"][0]["name"], "Nebulae")
+
+    def test_show_themes_change_invalidates_astronomy_shows(self):
+        self.client.get(ASTRONOMY_SHOW_URL)
+
+        self.astronomy_show.show_themes.clear()
+        res = self.client.get(ASTRONOMY_SHOW_URL)
+
+        self.assertEqual(res.data[0]["show_themes"], [])
+
+    def test_not_found_is_not_cached(self):
+        url = detail_url(self.astronomy_show.id + 1)
+        self.client.get(url)
+        AstronomyShow.objects.create(
+            id=self.astronomy_show.id + 1,
+            title="Comets",
+            description="Dirty snowballs.",
+        )
+
+        res = self.client.get(url)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
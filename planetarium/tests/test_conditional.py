@@ -0,0 +1,254 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils.http import http_date
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from planetarium.models import (
+    AstronomyShow,
+    PlanetariumDome,
+    Reservation,
+    ShowSession,
+    ShowTheme,
+    Ticket
+)
+from planetarium.seat_map import SeatMap
+
+
+SHOW_SESSION_URL = reverse("planetarium:showsession-list")
+ASTRONOMY_SHOW_URL = reverse("planetarium:astronomyshow-list")
+RESERVATION_URL = reverse("planetarium:reservation-list")
+
+
+def show_session_url(show_session_id):
+    return reverse("planetarium:showsession-detail", args=(show_session_id,))
+
+
+def astronomy_show_url(astronomy_show_id):
+    return reverse(
+        "planetarium:astronomyshow-detail", args=(astronomy_show_id,)
+    )
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(
+            get_user_model().objects.create_user(
+                email="test_user@example.com", password="testpassword"
+            )
+        )
+        self.show_theme = ShowTheme.objects.create(name="Galaxies")
+        self.astronomy_show = AstronomyShow.objects.create(
+            title="Andromeda", description="Our nearest big neighbour."
+        )
+        self.astronomy_show.show_themes.add(self.show_theme)
+        self.planetarium_dome = PlanetariumDome.objects.create(
+            name="Glass", rows=10, seats_in_row=12
+        )
+        self.show_sessions = [
+            ShowSession.objects.create(
+                astronomy_show=self.astronomy_show,
+                planetarium_dome=self.planetarium_dome,
+                show_time=show_time,
+            )
+            for show_time in (
+                "2024-11-21 14:00:00+00:00", "2024-11-20 14:00:00+00:00"
+            )
+        ]
+
+    def revalidate(self, url, res, **params):
+        return self.client.get(url, params, HTTP_IF_NONE_MATCH=res["ETag"])
+
+    def assert_not_modified(self, url, **params):
+        res = self.client.get(url, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(res["ETag"].startswith('W/"'))
+
+        with self.assertNumQueries(1):
+            not_modified = self.revalidate(url, res, **params)
+
+        self.assertEqual(
+            not_modified.status_code, status.HTTP_304_NOT_MODIFIED
+        )
+        self.assertEqual(not_modified.content, b"")
+        self.assertEqual(not_modified["ETag"], res["ETag"])
+        return res
+
+    def assert_modified(self, url, res, **params):
+        modified = self.revalidate(url, res, **params)
+        self.assertEqual(modified.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(modified["ETag"], res["ETag"])
+        return modified
+
+    def test_show_session_list(self):
+        res = self.assert_not_modified(SHOW_SESSION_URL)
+
+        reservation = self.client.post(
+            RESERVATION_URL,
+            {"tickets": [
+                {"row": 1, "seat": 1, "show_session": self.show_sessions[0].id}
+            ]},
+            format="json"
+        )
+        self.assertEqual(reservation.status_code, status.HTTP_201_CREATED)
+        res = self.assert_modified(SHOW_SESSION_URL, res)
+        self.assertEqual(res.data["results"][0]["tickets_available"], 119)
+
+        self.planetarium_dome.name = "Crystal"
+        self.planetarium_dome.save()
+        res = self.assert_modified(SHOW_SESSION_URL, res)
+        self.assertEqual(
+            res.data["results"][0]["planetarium_dome_name"], "Crystal"
+        )
+
+        self.show_sessions[1].delete()
+        res = self.assert_modified(SHOW_SESSION_URL, res)
+        self.assertEqual(len(res.data["results"]), 1)
+
+    def test_show_session_list_page(self):
+        res = self.assert_not_modified(SHOW_SESSION_URL, page_size=1)
+        self.assertIsNotNone(res.data["next"])
+
+        # Not in the page, but the page has no next one anymore.
+        self.show_sessions[1].delete()
+
+        res = self.assert_modified(SHOW_SESSION_URL, res, page_size=1)
+        self.assertIsNone(res.data["next"])
+
+    def test_show_session_list_fetches_its_page_once(self):
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(SHOW_SESSION_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(
+            self.revalidate(SHOW_SESSION_URL, res).status_code,
+            status.HTTP_304_NOT_MODIFIED
+        )
+
+    def test_query_params_are_part_of_etag(self):
+        res = self.client.get(SHOW_SESSION_URL)
+
+        other = self.client.get(SHOW_SESSION_URL, {"fields": "id"})
+
+        self.assertNotEqual(other["ETag"], res["ETag"])
+        self.assertEqual(
+            self.revalidate(SHOW_SESSION_URL, res, fields="id").status_code,
+            status.HTTP_200_OK
+        )
+
+    def test_show_session_detail(self):
+        url = show_session_url(self.show_sessions[0].id)
+        res = self.assert_not_modified(url)
+
+        self.astronomy_show.title = "Triangulum"
+        self.astronomy_show.save()
+
+        res = self.assert_modified(url, res)
+        self.assertEqual(res.data["astronomy_show"]["title"], "Triangulum")
+
+    def test_ticket_moved_within_show_session(self):
+        url = show_session_url(self.show_sessions[0].id)
+        ticket = Ticket.objects.create(
+            row=1, seat=1, show_session=self.show_sessions[0],
+            reservation=Reservation.objects.create(
+                user=get_user_model().objects.get()
+            )
+        )
+        res = self.client.get(url)
+
+        ticket.seat = 2
+        with self.captureOnCommitCallbacks(execute=True):
+            ticket.save()
+
+        res = self.assert_modified(url, res)
+        seat_map = SeatMap(self.show_sessions[0].id, rows=10, seats_in_row=12)
+        seat_map.mark(1, 2)
+        self.assertEqual(res.data["taken_places"]["taken"], seat_map.encoded)
+
+    def test_if_modified_since(self):
+        url = show_session_url(self.show_sessions[0].id)
+        res = self.client.get(url)
+
+        not_modified = self.client.get(
+            url, HTTP_IF_MODIFIED_SINCE=res["Last-Modified"]
+        )
+        modified = self.client.get(
+            url, HTTP_IF_MODIFIED_SINCE=http_date(
+                self.show_sessions[0].updated_at.timestamp() - 1
+            )
+        )
+
+        self.assertEqual(
+            not_modified.status_code, status.HTTP_304_NOT_MODIFIED
+        )
+        self.assertEqual(modified.status_code, status.HTTP_200_OK)
+
+    def test_lists_have_no_last_modified(self):
+        show_theme_url = reverse("planetarium:showtheme-list")
+        res = self.client.get(show_theme_url)
+        self.assertNotIn("Last-Modified", res)
+
+        # Deleted rows do not change the latest modification.
+        ShowTheme.objects.create(name="Planets").delete()
+        res = self.client.get(
+            show_theme_url, HTTP_IF_MODIFIED_SINCE=http_date()
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotIn("Last-Modified", res)
+
+    def test_cached_astronomy_show_list_revalidates_without_queries(self):
+        res = self.client.get(ASTRONOMY_SHOW_URL)
+
+        with self.assertNumQueries(0):
+            not_modified = self.revalidate(ASTRONOMY_SHOW_URL, res)
+
+        self.assertEqual(
+            not_modified.status_code, status.HTTP_304_NOT_MODIFIED
+        )
+        self.assertEqual(not_modified["ETag"], res["ETag"])
+
+    def test_show_theme_changes_modify_astronomy_shows(self):
+        url = astronomy_show_url(self.astronomy_show.id)
+        res = self.client.get(url)
+
+        self.show_theme.name = "Nebulae"
+        self.show_theme.save()
+        res = self.assert_modified(url, res)
+        self.assertEqual(res.data["show_themes"][0]["name"], "Nebulae")
+
+        self.show_theme.delete()
+        res = self.assert_modified(url, res)
+        self.assertEqual(res.data["show_themes"], [])
+
+    def test_show_themes_changes_touch_astronomy_shows(self):
+        other_theme = ShowTheme.objects.create(name="Planets")
+        for change in (
+                lambda: self.astronomy_show.show_themes.add(other_theme),
+                lambda: other_theme.astronomyshow_set.remove(
+                    self.astronomy_show
+                ),
+                lambda: self.show_theme.astronomyshow_set.clear(),
+        ):
+            updated_at = AstronomyShow.objects.get().updated_at
+
+            change()
+
+            self.assertGreater(
+                AstronomyShow.objects.get().updated_at, updated_at
+            )
+
+    def test_missing_object(self):
+        res = self.client.get(
+            show_session_url(0), HTTP_IF_NONE_MATCH='W/"anything"'
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertNotIn("ETag", res)
@@ -0,0 +1,131 @@
+import csv
+import io
+import json
+from datetime import datetime, timezone
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from planetarium.models import (
+    AstronomyShow,
+    PlanetariumDome,
+    Reservation,
+    ShowSession,
+    Ticket
+)
+
+
+EXPORT_URL = reverse("planetarium:reservation-export")
+
+
+def streamed_content(response) -> str:
+    return b"".join(response.streaming_content).decode()
+
+
+class TicketExportTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = get_user_model().objects.create_superuser(
+            "admin@myproject.com", "password"
+        )
+        self.client.force_authenticate(self.admin)
+        self.customer = get_user_model().objects.create_user(
+            email="customer@example.com", password="testpassword"
+        )
+
+        planetarium_dome = PlanetariumDome.objects.create(
+            name="Glass", rows=10, seats_in_row=12
+        )
+        self.show_sessions = [
+            ShowSession.objects.create(
+                astronomy_show=AstronomyShow.objects.create(
+                    title=f"Show {number}", description="Deep space."
+                ),
+                planetarium_dome=planetarium_dome,
+                show_time=f"2024-11-2{number} 14:00:00+00:00",
+            )
+            for number in range(2)
+        ]
+        for day, show_session in zip((1, 15), self.show_sessions):
+            reservation = Reservation.objects.create(user=self.customer)
+            Reservation.objects.filter(id=reservation.id).update(
+                created_at=datetime(2024, 11, day, 9, tzinfo=timezone.utc)
+            )
+            for seat in (1, 2):
+                Ticket.objects.create(
+                    show_session=show_session,
+                    reservation=reservation,
+                    row=1,
+                    seat=seat,
+                )
+
+    def test_export_csv_streams_joined_tickets(self):
+        res = self.client.get(EXPORT_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(res.streaming)
+        self.assertEqual(res["Content-Type"], "text/csv")
+        rows = list(csv.DictReader(io.StringIO(streamed_content(res))))
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(rows[0]["user_email"], "customer@example.com")
+        self.assertEqual(rows[0]["astronomy_show_title"], "Show 0")
+        self.assertEqual(rows[0]["planetarium_dome_name"], "Glass")
+        self.assertEqual(rows[0]["reserved_at"], "2024-11-01 09:00:00+00:00")
+
+    def test_export_ndjson(self):
+        res = self.client.get(EXPORT_URL, {"output": "ndjson"})
+
+        self.assertEqual(res["Content-Type"], "application/x-ndjson")
+        lines = streamed_content(res).splitlines()
+        self.assertEqual(len(lines), 4)
+        ticket = json.loads(lines[-1])
+        self.assertEqual(ticket["show_session_id"], self.show_sessions[1].id)
+        self.assertEqual(ticket["seat"], 2)
+        self.assertEqual(ticket["show_time"], "2024-11-21T14:00:00Z")
+
+    def test_export_filtered_by_date_range_and_show_session(self):
+        res = self.client.get(
+            EXPORT_URL,
+            {"output": "ndjson", "from": "2024-11-10", "to": "2024-11-15"}
+        )
+        show_session_ids = {
+            json.loads(line)["show_session_id"]
+            for line in streamed_content(res).splitlines()
+        }
+        self.assertEqual(show_session_ids, {self.show_sessions[1].id})
+
+        res = self.client.get(
+            EXPORT_URL,
+            {"output": "ndjson", "show_session": self.show_sessions[0].id}
+        )
+        self.assertEqual(len(streamed_content(res).splitlines()), 2)
+
+    def test_export_invalid_params(self):
+        for params in (
+                {"output": "xml"},
+                {"from": "yesterday"},
+                {"show_session": "first"},
+        ):
+            res = self.client.get(EXPORT_URL, params)
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_export_forbidden_for_non_admin(self):
+        self.client.force_authenticate(self.customer)
+
+        res = self.client.get(EXPORT_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_export_tickets_command(self):
+        out = io.StringIO()
+        call_command(
+            "export_tickets", "--output", "ndjson", "--to", "2024-11-01",
+            stdout=out
+        )
+
+        tickets = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual([ticket["seat"] for ticket in tickets], [1, 2])
@@ -0,0 +1,148 @@
+import io
+import shutil
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.test import TestCase, TransactionTestCase, override_settings
+from PIL import Image
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from planetarium.image_variants import (
+    IMAGE_VARIANT_WIDTHS,
+    delete_image_variants,
+    generate_image_variants,
+    render_image_variants
+)
+from planetarium.models import AstronomyShow
+
+
+ASTRONOMY_SHOW_URL = reverse("planetarium:astronomyshow-list")
+
+
+def jpeg_bytes(width=800, height=400):
+    image_file = io.BytesIO()
+    Image.new("RGB", (width, height), "navy").save(image_file, format="JPEG")
+    return image_file.getvalue()
+
+
+class RenderImageVariantsTests(TestCase):
+    def test_renders_every_width_and_format(self):
+        variants = render_image_variants(jpeg_bytes())
+
+        self.assertEqual(len(variants), len(IMAGE_VARIANT_WIDTHS) * 2)
+        for (width, extension), content in variants.items():
+            with Image.open(io.BytesIO(content)) as image:
+                self.assertEqual(image.format, extension.upper())
+                self.assertEqual(image.size, (width, width // 2))
+
+    def test_small_images_are_not_upscaled(self):
+        variants = render_image_variants(jpeg_bytes(200, 100))
+
+        with Image.open(io.BytesIO(variants[(640, "webp")])) as image:
+            self.assertEqual(image.size, (200, 100))
+
+
+class GenerateImageVariantsTests(TransactionTestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        media = override_settings(MEDIA_ROOT=self.media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+        self.addCleanup(shutil.rmtree, self.media_root)
+        cache.clear()
+
+        self.astronomy_show = AstronomyShow.objects.create(
+            title="Black Hole", description="Deep space."
+        )
+        self.astronomy_show.image.save(
+            "black-hole.jpg", ContentFile(jpeg_bytes())
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(
+            get_user_model().objects.create_user(
+                email="test_user@example.com", password="testpassword"
+            )
+        )
+
+    def test_variants_are_saved_and_listed(self):
+        self.client.get(ASTRONOMY_SHOW_URL)
+        image_variants = generate_image_variants(
+            self.astronomy_show.id, self.astronomy_show.image.name
+        ).result(timeout=30)
+
+        self.astronomy_show.refresh_from_db()
+        self.assertEqual(self.astronomy_show.image_variants, image_variants)
+        self.assertTrue(
+            default_storage.exists(image_variants["webp"]["160"])
+        )
+        res = self.client.get(ASTRONOMY_SHOW_URL)
+        self.assertTrue(
+            res.data[0]["image_variants"]["webp"]["160"].endswith(
+                image_variants["webp"]["160"]
+            )
+        )
+
+    def test_variants_of_replaced_image_are_discarded(self):
+        image_name = self.astronomy_show.image.name
+        self.astronomy_show.image.save(
+            "nebula.jpg", ContentFile(jpeg_bytes())
+        )
+
+        image_variants = generate_image_variants(
+            self.astronomy_show.id, image_name
+        ).result(timeout=30)
+
+        self.astronomy_show.refresh_from_db()
+        self.assertIsNone(image_variants)
+        self.assertEqual(self.astronomy_show.image_variants, {})
+
+
+class UploadImageVariantsTests(TestCase):
+    def test_upload_schedules_variants_and_deletes_stale_ones(self):
+        client = APIClient()
+        client.force_authenticate(
+            get_user_model().objects.create_superuser(
+                "admin@myproject.com", "password"
+            )
+        )
+        astronomy_show = AstronomyShow.objects.create(
+            title="Black Hole",
+            description="Deep space.",
+            image_variants={"webp": {"160": "stale.webp"}},
+        )
+        url = reverse(
+            "planetarium:astronomyshow-upload-image", args=[astronomy_show.id]
+        )
+
+        with tempfile.TemporaryDirectory() as media_root:
+            with override_settings(MEDIA_ROOT=media_root):
+                default_storage.save("stale.webp", ContentFile(b"stale"))
+                with self.captureOnCommitCallbacks() as callbacks:
+                    res = client.post(
+                        url,
+                        {"image": ContentFile(jpeg_bytes(), "show.jpg")},
+                        format="multipart"
+                    )
+                for callback in callbacks:
+                    if getattr(callback, "func", None) is (
+                            delete_image_variants
+                    ):
+                        callback()
+                stale_deleted = not default_storage.exists("stale.webp")
+
+        astronomy_show.refresh_from_db()
+        scheduled = [
+            callback.args for callback in callbacks
+            if getattr(callback, "func", None) is generate_image_variants
+        ]
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(astronomy_show.image_variants, {})
+        self.assertEqual(
+            scheduled, [(astronomy_show.id, astronomy_show.image.name)]
+        )
+        self.assertTrue(stale_deleted)
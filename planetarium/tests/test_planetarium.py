@@ -15,6 +15,7 @@ from planetarium.serializers import (
 
 
 ASTRONOMY_SHOW_URL = reverse("planetarium:astronomyshow-list")
+ASTRONOMY_SHOW_SEARCH_URL = reverse("planetarium:astronomyshow-search")
 
 
 def detail_url(astronomy_show_id):
@@ -110,6 +111,59 @@ class AuthenticatedAstronomyShowTests(TestCase):
         self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
 
 
+class AstronomyShowSearchTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test_user@example.com", password="testpassword"
+        )
+        self.client.force_authenticate(self.user)
+        self.big_bang = sample_astronomy_show()
+        self.andromeda = sample_astronomy_show(
+            title="Andromeda collision",
+            description="Our galaxy meets its neighbour.",
+        )
+        self.black_holes = sample_astronomy_show(
+            title="Black holes",
+            description="What happened after the big bang to create them.",
+        )
+
+    def search_ids(self, text, **params):
+        res = self.client.get(ASTRONOMY_SHOW_SEARCH_URL, {"q": text, **params})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return [astronomy_show["id"] for astronomy_show in res.data["results"]]
+
+    def test_search_ranks_title_matches_first(self):
+        self.assertEqual(
+            self.search_ids("big bang"),
+            [self.big_bang.id, self.black_holes.id]
+        )
+
+    def test_search_matches_word_forms(self):
+        self.assertEqual(self.search_ids("galaxies"), [self.andromeda.id])
+
+    def test_search_tolerates_prefixes_and_typos(self):
+        self.assertEqual(self.search_ids("androm")[0], self.andromeda.id)
+        self.assertEqual(self.search_ids("black hols")[0], self.black_holes.id)
+
+    def test_search_results_are_paginated(self):
+        res = self.client.get(
+            ASTRONOMY_SHOW_SEARCH_URL, {"q": "big bang", "page_size": 1}
+        )
+
+        self.assertEqual(res.data["count"], 2)
+        self.assertIsNotNone(res.data["next"])
+        self.assertEqual(
+            res.data["results"],
+            [AstronomyShowListSerializer(self.big_bang).data]
+        )
+
+    def test_search_requires_query(self):
+        res = self.client.get(ASTRONOMY_SHOW_SEARCH_URL, {"q": " "})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+
 class AdminAstronomyShowTests(TestCase):
     def setUp(self):
         self.client = APIClient()
@@ -138,7 +138,8 @@ class AstronomyShowImageUploadTests(TestCase):
             self.client.post(url, {"image": ntf}, format="multipart")
         res = self.client.get(ASTRONOMY_SHOW_URL)
 
-        self.assertIn("image", res.data[0].keys())
+        self.assertIn("image_variants", res.data[0].keys())
+        self.assertNotIn("image", res.data[0].keys())
 
     def test_image_url_is_shown_on_show_session_detail(self):
         url = image_upload_url(self.astronomy_show.id)
@@ -149,4 +150,7 @@ class AstronomyShowImageUploadTests(TestCase):
             self.client.post(url, {"image": ntf}, format="multipart")
         res = self.client.get(SHOW_SESSION_URL)
 
-        self.assertIn("astronomy_show_image", res.data[0].keys())
+        self.assertIn(
+            "astronomy_show_image_variants", res.data["results"][0].keys()
+        )
+        self.assertNotIn("astronomy_show_image", res.data["results"][0].keys())
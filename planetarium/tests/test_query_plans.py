@@ -0,0 +1,165 @@
+from datetime import datetime, timedelta, timezone
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from planetarium.models import (
+    AstronomyShow,
+    PlanetariumDome,
+    Reservation,
+    ShowSession
+)
+
+
+SHOW_SESSION_URL = reverse("planetarium:showsession-list")
+ASTRONOMY_SHOW_SEARCH_URL = reverse("planetarium:astronomyshow-search")
+RESERVATION_URL = reverse("planetarium:reservation-list")
+
+
+class QueryPlanMixin:
+    def query_plan(self, url, params, table, enable_seqscan=True):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(url, params)
+        sql = next(
+            query["sql"] for query in queries.captured_queries
+            if query["sql"].startswith("SELECT")
+            and f'FROM "{table}"' in query["sql"]
+            and "COUNT(" not in query["sql"]
+        )
+        with connection.cursor() as cursor:
+            if not enable_seqscan:
+                cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute(f"EXPLAIN {sql}")
+            return "\n".join(row[0] for row in cursor.fetchall())
+
+
+class HotQueryPlanTests(QueryPlanMixin, TestCase):
+    """Check that the list endpoints' queries are served by indexes."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = get_user_model().objects.bulk_create(
+            get_user_model()(email=f"user_{number}@example.com")
+            for number in range(40)
+        )
+        cls.astronomy_shows = AstronomyShow.objects.bulk_create(
+            AstronomyShow(title=f"Show {number}", description="Stars")
+            for number in range(50)
+        )
+        planetarium_domes = PlanetariumDome.objects.bulk_create(
+            PlanetariumDome(name=f"Dome {number}", rows=20, seats_in_row=20)
+            for number in range(5)
+        )
+        start = datetime(2024, 1, 1, 10, tzinfo=timezone.utc)
+        ShowSession.objects.bulk_create(
+            ShowSession(
+                astronomy_show=cls.astronomy_shows[number % 50],
+                planetarium_dome=planetarium_domes[number % 5],
+                show_time=start + timedelta(hours=2 * number),
+            )
+            for number in range(5000)
+        )
+        Reservation.objects.bulk_create(
+            Reservation(user=cls.users[number % 40])
+            for number in range(4000)
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "ANALYZE planetarium_showsession, planetarium_reservation, "
+                "planetarium_astronomyshow, planetarium_planetariumdome"
+            )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.users[0])
+
+    def test_sessions_by_astronomy_show_use_composite_index(self):
+        plan = self.query_plan(
+            SHOW_SESSION_URL,
+            {"astronomy_show": self.astronomy_shows[7].id},
+            "planetarium_showsession"
+        )
+
+        self.assertIn("session_show_show_time_idx", plan)
+
+    def test_sessions_by_date_use_show_time_index(self):
+        plan = self.query_plan(
+            SHOW_SESSION_URL,
+            {"date": "2024-06-01"},
+            "planetarium_showsession"
+        )
+
+        self.assertIn("session_show_time_idx", plan)
+        self.assertNotIn("Seq Scan on planetarium_showsession", plan)
+
+    def test_sessions_by_range_use_show_time_index(self):
+        plan = self.query_plan(
+            SHOW_SESSION_URL,
+            {"from": "2024-06-01", "to": "2024-06-07"},
+            "planetarium_showsession"
+        )
+
+        self.assertIn("session_show_time_idx", plan)
+
+    def test_reservations_by_user_use_composite_index(self):
+        plan = self.query_plan(
+            RESERVATION_URL, {}, "planetarium_reservation"
+        )
+
+        self.assertIn("reservation_user_created_idx", plan)
+
+
+class AstronomyShowSearchPlanTests(QueryPlanMixin, TestCase):
+    """
+    Check that catalog search can be answered from the GIN indexes.
+    Sequential scans are disabled because they stay cheaper than index
+    scans until the catalog is far larger than a test can seed.
+    """
+
+    words = (
+        "galaxy", "nebula", "comet", "planet", "moon", "star", "orbit",
+        "eclipse", "aurora", "quasar", "pulsar", "meteor", "cluster",
+    )
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email="test_user@example.com", password="testpassword"
+        )
+        AstronomyShow.objects.bulk_create(
+            AstronomyShow(
+                title=" ".join(
+                    cls.words[(number + shift) % len(cls.words)]
+                    for shift in (0, 3, 7)
+                ) + f" {number}",
+                description=f"Show number {number} about "
+                            f"{cls.words[number % len(cls.words)]}s",
+            )
+            for number in range(500)
+        )
+        AstronomyShow.objects.create(
+            title="Andromeda collision",
+            description="Our galaxy meets its neighbour.",
+        )
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE planetarium_astronomyshow")
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_search_uses_search_and_trigram_indexes(self):
+        plan = self.query_plan(
+            ASTRONOMY_SHOW_SEARCH_URL,
+            {"q": "andromeda"},
+            "planetarium_astronomyshow",
+            enable_seqscan=False
+        )
+
+        self.assertIn("astronomy_show_search_idx", plan)
+        self.assertIn("astronomy_show_title_trgm_idx", plan)
+        self.assertNotIn("Seq Scan", plan)
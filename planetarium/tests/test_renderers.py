@@ -0,0 +1,209 @@
+import datetime
+import io
+import json
+import uuid
+from decimal import Decimal
+from unittest import skipIf
+from zoneinfo import ZoneInfo
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+from django.utils.translation import gettext_lazy
+from rest_framework import status
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from planetarium.models import (
+    AstronomyShow,
+    PlanetariumDome,
+    ShowSession,
+    ShowTheme
+)
+from planetarium.parsers import MessagePackParser, ORJSONParser
+from planetarium.renderers import ORJSONRenderer, msgpack
+
+
+SHOW_SESSION_URL = reverse("planetarium:showsession-list")
+RESERVATION_URL = reverse("planetarium:reservation-list")
+
+
+class ORJSONRendererTests(SimpleTestCase):
+    def assert_renders_like_json_renderer(self, data, media_type=None):
+        self.assertEqual(
+            ORJSONRenderer().render(data, media_type),
+            JSONRenderer().render(data, media_type)
+        )
+
+    def test_values_json_has_no_type_for(self):
+        self.assert_renders_like_json_renderer({
+            "utc": datetime.datetime(
+                2024, 11, 20, 14, 5, 7, 123456, tzinfo=datetime.timezone.utc
+            ),
+            "kyiv": datetime.datetime(
+                2024, 11, 20, 14, 5, tzinfo=ZoneInfo("Europe/Kyiv")
+            ),
+            "naive": datetime.datetime(2024, 11, 20, 14, 5),
+            "date": datetime.date(2024, 11, 20),
+            "time": datetime.time(14, 5, 30),
+            "duration": datetime.timedelta(minutes=90),
+            "decimal": Decimal("12.50"),
+            "uuid": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+            "lazy": gettext_lazy("This field is required."),
+            "bytes": b"seat",
+            "tuple": (1, 2),
+            1: "integer key",
+        })
+
+    def test_text_is_escaped_like_json_renderer(self):
+        self.assert_renders_like_json_renderer(
+            ["Зоряне небо ✨", "lines\u2028and\u2029paragraphs", '"quoted" \\']
+        )
+
+    def test_indented_media_type(self):
+        self.assert_renders_like_json_renderer(
+            {"id": 1, "show_themes": ["Stars"]}, "application/json; indent=2"
+        )
+
+    def test_unencodable_integers_fall_back_to_json_renderer(self):
+        self.assert_renders_like_json_renderer({"big": 2 ** 70})
+
+    def test_no_data(self):
+        self.assertEqual(ORJSONRenderer().render(None), b"")
+
+
+class ORJSONParserTests(SimpleTestCase):
+    def parse(self, content: bytes, encoding: str = "utf-8"):
+        return ORJSONParser().parse(
+            io.BytesIO(content), parser_context={"encoding": encoding}
+        )
+
+    def test_parse(self):
+        self.assertEqual(
+            self.parse('{"title": "Зоряне небо", "rows": [1, 2]}'.encode()),
+            {"title": "Зоряне небо", "rows": [1, 2]}
+        )
+
+    def test_other_encodings(self):
+        self.assertEqual(
+            self.parse('{"title": "Étoiles"}'.encode("latin-1"), "latin-1"),
+            {"title": "Étoiles"}
+        )
+
+    def test_invalid_json(self):
+        for content in (b'{"title": }', b'{"rows": NaN}'):
+            with self.assertRaisesMessage(ParseError, "JSON parse error"):
+                self.parse(content)
+
+    def test_deeply_nested_json(self):
+        with self.assertRaisesMessage(ParseError, "JSON parse error"):
+            self.parse(b"[" * 200000)
+
+
+def sample_show_session() -> ShowSession:
+    astronomy_show = AstronomyShow.objects.create(
+        title="Зоряне небо", description="Deep space."
+    )
+    astronomy_show.show_themes.add(ShowTheme.objects.create(name="Stars"))
+    return ShowSession.objects.create(
+        astronomy_show=astronomy_show,
+        planetarium_dome=PlanetariumDome.objects.create(
+            name="Glass", rows=10, seats_in_row=12
+        ),
+        show_time="2024-11-20 14:00:00.250000+00:00",
+    )
+
+
+class RenderedResponseTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(
+            get_user_model().objects.create_user(
+                email="test_user@example.com", password="testpassword"
+            )
+        )
+        self.show_session = sample_show_session()
+
+    def test_responses_render_like_json_renderer(self):
+        res = self.client.get(SHOW_SESSION_URL)
+
+        self.assertEqual(res["Content-Type"], "application/json")
+        self.assertEqual(res.content, JSONRenderer().render(res.data))
+        self.assertEqual(
+            res.data["results"][0]["show_time"], "2024-11-20T14:00:00.250000Z"
+        )
+
+    def test_json_requests(self):
+        res = self.client.post(
+            RESERVATION_URL,
+            json.dumps({
+                "tickets": [
+                    {"row": 1, "seat": 1, "show_session": self.show_session.id}
+                ]
+            }),
+            content_type="application/json"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+    def test_malformed_json_requests(self):
+        res = self.client.post(
+            RESERVATION_URL, b'{"tickets": [', content_type="application/json"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("JSON parse error", res.data["detail"])
+
+    def test_deeply_nested_json_requests(self):
+        res = APIClient().post(
+            reverse("user:create"),
+            b"[" * 200000,
+            content_type="application/json"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("JSON parse error", res.data["detail"])
+
+
+@skipIf(msgpack is None, "msgpack is not installed.")
+class MessagePackTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(
+            get_user_model().objects.create_user(
+                email="test_user@example.com", password="testpassword"
+            )
+        )
+        self.show_session = sample_show_session()
+
+    def test_negotiated_through_accept(self):
+        json_res = self.client.get(SHOW_SESSION_URL)
+
+        res = self.client.get(
+            SHOW_SESSION_URL, HTTP_ACCEPT="application/msgpack"
+        )
+
+        self.assertEqual(res["Content-Type"], "application/msgpack")
+        self.assertEqual(msgpack.unpackb(res.content), json_res.json())
+
+    def test_msgpack_requests(self):
+        res = self.client.post(
+            RESERVATION_URL,
+            msgpack.packb({
+                "tickets": [
+                    {"row": 1, "seat": 1, "show_session": self.show_session.id}
+                ]
+            }),
+            content_type="application/msgpack",
+            HTTP_ACCEPT="application/msgpack"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            msgpack.unpackb(res.content)["tickets"][0]["seat"], 1
+        )
+
+    def test_malformed_msgpack_requests(self):
+        with self.assertRaisesMessage(ParseError, "MessagePack parse error"):
+            MessagePackParser().parse(io.BytesIO(b"\xc1"))
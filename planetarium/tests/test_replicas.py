@@ -0,0 +1,126 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connections
+from django.test import TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from planetarium.models import (
+    AstronomyShow,
+    PlanetariumDome,
+    ShowSession,
+    ShowTheme
+)
+from planetarium.replicas import ReplicaRouter, primary_pin_key
+
+
+SHOW_THEME_URL = reverse("planetarium:showtheme-list")
+SHOW_SESSION_URL = reverse("planetarium:showsession-list")
+RESERVATION_URL = reverse("planetarium:reservation-list")
+
+
+def queried_tables(queries) -> set:
+    return {
+        table for query in queries.captured_queries
+        for table in ("planetarium_showsession", "planetarium_reservation")
+        if f'FROM "{table}"' in query["sql"]
+    }
+
+
+# Committed data is read back through a second connection, like a
+# replica would serve it.
+@override_settings(DATABASE_REPLICAS=["replica_1"])
+class ReplicaRoutingTests(TransactionTestCase):
+    databases = {"default", "replica_1"}
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test_user@example.com", password="testpassword"
+        )
+        self.client.force_authenticate(self.user)
+        self.show_session = ShowSession.objects.create(
+            astronomy_show=AstronomyShow.objects.create(
+                title="Black Hole", description="Deep space."
+            ),
+            planetarium_dome=PlanetariumDome.objects.create(
+                name="Glass", rows=10, seats_in_row=12
+            ),
+            show_time="2024-11-20 14:00:00+00:00",
+        )
+
+    def get(self, url):
+        with CaptureQueriesContext(connections["default"]) as primary:
+            with CaptureQueriesContext(connections["replica_1"]) as replica:
+                res = self.client.get(url)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return res, queried_tables(primary), queried_tables(replica)
+
+    def reserve(self):
+        res = self.client.post(
+            RESERVATION_URL,
+            {
+                "tickets": [
+                    {"row": 1, "seat": 1, "show_session": self.show_session.id}
+                ]
+            },
+            format="json"
+        )
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+    def test_catalog_reads_go_to_replica(self):
+        res, primary, replica = self.get(SHOW_SESSION_URL)
+
+        self.assertEqual(len(res.data["results"]), 1)
+        self.assertEqual(primary, set())
+        self.assertEqual(replica, {"planetarium_showsession"})
+
+    def test_reservations_are_read_from_primary(self):
+        res, primary, replica = self.get(RESERVATION_URL)
+
+        self.assertEqual(primary, {"planetarium_reservation"})
+        self.assertEqual(replica, set())
+
+    def test_writes_pin_the_user_to_primary(self):
+        self.reserve()
+
+        res, primary, replica = self.get(SHOW_SESSION_URL)
+        self.assertEqual(res.data["results"][0]["tickets_available"], 119)
+        self.assertEqual(primary, {"planetarium_showsession"})
+        self.assertEqual(replica, set())
+
+        cache.delete(primary_pin_key(self.user))
+        res, primary, replica = self.get(SHOW_SESSION_URL)
+        self.assertEqual(replica, {"planetarium_showsession"})
+
+    def test_other_users_are_not_pinned(self):
+        self.reserve()
+        self.client.force_authenticate(
+            get_user_model().objects.create_user(
+                email="other_user@example.com", password="testpassword"
+            )
+        )
+
+        res, primary, replica = self.get(SHOW_SESSION_URL)
+
+        self.assertEqual(replica, {"planetarium_showsession"})
+
+    def test_cached_responses_are_filled_from_primary(self):
+        ShowTheme.objects.create(name="Galaxies")
+
+        with CaptureQueriesContext(connections["replica_1"]) as replica:
+            res = self.client.get(SHOW_THEME_URL)
+
+        self.assertEqual(res.data[0]["name"], "Galaxies")
+        self.assertEqual(len(replica), 0)
+
+    def test_router_writes_and_migrates_on_primary(self):
+        router = ReplicaRouter()
+
+        self.assertEqual(router.db_for_write(ShowSession), "default")
+        self.assertEqual(router.db_for_read(ShowSession), "default")
+        self.assertTrue(router.allow_migrate("default", "planetarium"))
+        self.assertFalse(router.allow_migrate("replica_1", "planetarium"))
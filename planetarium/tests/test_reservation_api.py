@@ -0,0 +1,275 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from planetarium.models import (
+    AstronomyShow,
+    PlanetariumDome,
+    Reservation,
+    ShowSession,
+    Ticket
+)
+
+
+RESERVATION_URL = reverse("planetarium:reservation-list")
+
+UNIQUE_SEAT_MESSAGE = (
+    "The fields show_session, row, seat must make a unique set."
+)
+
+
+def sample_show_session(**params) -> ShowSession:
+    astronomy_show = AstronomyShow.objects.create(
+        title="The Big Bang",
+        description="An astronomy show about the beginning of space.",
+    )
+    planetarium_dome = PlanetariumDome.objects.create(
+        name="Glass", rows=20, seats_in_row=18
+    )
+    defaults = {
+        "show_time": "2024-11-20 14:00:00",
+        "astronomy_show": astronomy_show,
+        "planetarium_dome": planetarium_dome,
+    }
+    defaults.update(params)
+
+    return ShowSession.objects.create(**defaults)
+
+
+def tickets_payload(show_session, count, row=1):
+    return {
+        "tickets": [
+            {"row": row, "seat": seat, "show_session": show_session.id}
+            for seat in range(1, count + 1)
+        ]
+    }
+
+
+class ReservationCreateTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test_user@example.com", password="testpassword"
+        )
+        self.client.force_authenticate(self.user)
+        self.show_session = sample_show_session()
+
+    def create_reservation(self, payload):
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.post(RESERVATION_URL, payload, format="json")
+        return res, len(queries)
+
+    def test_create_reservation(self):
+        res = self.client.post(
+            RESERVATION_URL,
+            tickets_payload(self.show_session, 3),
+            format="json"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        reservation = Reservation.objects.get(id=res.data["id"])
+        self.assertEqual(reservation.user, self.user)
+        self.assertEqual(
+            list(reservation.tickets.values_list("row", "seat")),
+            [(1, 1), (1, 2), (1, 3)]
+        )
+
+    def test_query_count_does_not_grow_with_tickets(self):
+        res_small, queries_small = self.create_reservation(
+            tickets_payload(self.show_session, 1, row=1)
+        )
+        res_large, queries_large = self.create_reservation(
+            tickets_payload(self.show_session, 15, row=2)
+        )
+
+        self.assertEqual(res_small.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(res_large.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(queries_small, queries_large)
+
+    def test_query_count_grows_only_with_distinct_sessions(self):
+        other_session = sample_show_session()
+        payload = tickets_payload(self.show_session, 10)
+        payload["tickets"] += tickets_payload(other_session, 10)["tickets"]
+
+        res_single, queries_single = self.create_reservation(
+            tickets_payload(self.show_session, 1, row=2)
+        )
+        res_mixed, queries_mixed = self.create_reservation(payload)
+
+        self.assertEqual(res_single.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(res_mixed.status_code, status.HTTP_201_CREATED)
+        # One lookup, one tickets_sold update and one daily rollup
+        # update per extra show session.
+        self.assertEqual(queries_mixed, queries_single + 3)
+
+    def test_delete_query_count_does_not_grow_with_tickets(self):
+        queries = []
+        for row, count in ((1, 1), (2, 8)):
+            res = self.client.post(
+                RESERVATION_URL,
+                tickets_payload(self.show_session, count, row=row),
+                format="json"
+            )
+            with CaptureQueriesContext(connection) as captured:
+                deleted = self.client.delete(
+                    reverse(
+                        "planetarium:reservation-detail", args=[res.data["id"]]
+                    )
+                )
+            self.assertEqual(deleted.status_code, status.HTTP_204_NO_CONTENT)
+            queries.append(len(captured))
+
+        self.assertEqual(queries[0], queries[1])
+        self.show_session.refresh_from_db()
+        self.assertEqual(self.show_session.tickets_sold, 0)
+
+    def test_taken_seat_rejected(self):
+        reservation = Reservation.objects.create(user=self.user)
+        Ticket.objects.create(
+            row=1, seat=2, show_session=self.show_session,
+            reservation=reservation
+        )
+
+        res = self.client.post(
+            RESERVATION_URL,
+            tickets_payload(self.show_session, 3),
+            format="json"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            res.data["tickets"],
+            [{}, {"non_field_errors": [UNIQUE_SEAT_MESSAGE]}, {}]
+        )
+        self.assertEqual(Reservation.objects.count(), 1)
+
+    def test_duplicate_seat_in_request_rejected(self):
+        payload = tickets_payload(self.show_session, 2)
+        payload["tickets"].append(payload["tickets"][0])
+
+        res = self.client.post(RESERVATION_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            res.data["tickets"],
+            [{}, {}, {"non_field_errors": [UNIQUE_SEAT_MESSAGE]}]
+        )
+        self.assertFalse(Ticket.objects.exists())
+
+    def test_seat_out_of_range_rejected(self):
+        payload = tickets_payload(self.show_session, 2)
+        payload["tickets"][1]["seat"] = 19
+
+        res = self.client.post(RESERVATION_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res.data["tickets"][0], {})
+        self.assertIn("seat", res.data["tickets"][1])
+        self.assertFalse(Ticket.objects.exists())
+
+
+class ReservationListTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test_user@example.com", password="testpassword"
+        )
+        self.client.force_authenticate(self.user)
+        self.show_session = sample_show_session()
+        for number in range(25):
+            reservation = Reservation.objects.create(user=self.user)
+            Ticket.objects.create(
+                row=number // 10 + 1, seat=number % 10 + 1,
+                show_session=self.show_session,
+                reservation=reservation
+            )
+
+    def test_reservations_paginated_by_cursor(self):
+        expected = list(
+            Reservation.objects.order_by("-created_at", "id")
+            .values_list("id", flat=True)
+        )
+
+        ids = []
+        res = self.client.get(RESERVATION_URL)
+        while True:
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            self.assertEqual(len(res.data["results"]), 5)
+            ids += [reservation["id"] for reservation in res.data["results"]]
+            if not res.data["next"]:
+                break
+            res = self.client.get(res.data["next"])
+
+        self.assertEqual(ids, expected)
+
+    def test_page_size_is_bounded(self):
+        res = self.client.get(RESERVATION_URL, {"page_size": 100})
+
+        self.assertEqual(len(res.data["results"]), 20)
+        self.assertIsNotNone(res.data["next"])
+
+    def test_invalid_cursor_rejected(self):
+        res = self.client.get(RESERVATION_URL, {"cursor": "not-a-cursor"})
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class ReservationQueryCountTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test_user@example.com", password="testpassword"
+        )
+        self.client.force_authenticate(self.user)
+
+    def reserve(self, show_sessions, tickets_per_session):
+        reservation = Reservation.objects.create(user=self.user)
+        for show_session in show_sessions:
+            for seat in range(1, tickets_per_session + 1):
+                Ticket.objects.create(
+                    row=1, seat=seat,
+                    show_session=show_session,
+                    reservation=reservation
+                )
+        return reservation
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.client.get(url).status_code, 200)
+        return len(queries)
+
+    def test_list_query_count_does_not_grow_with_tickets(self):
+        self.reserve([sample_show_session()], 1)
+        few = self.count_queries(RESERVATION_URL)
+
+        for _ in range(4):
+            self.reserve(
+                [sample_show_session() for _ in range(3)],
+                tickets_per_session=5
+            )
+        with self.assertNumQueries(few):
+            res = self.client.get(RESERVATION_URL)
+
+        self.assertEqual(few, 2)
+        show_session = res.data["results"][0]["tickets"][0]["show_session"]
+        self.assertEqual(show_session["astronomy_show_title"], "The Big Bang")
+        self.assertEqual(show_session["tickets_available"], 360 - 5)
+
+    def test_detail_query_count_does_not_grow_with_tickets(self):
+        reservation = self.reserve([sample_show_session()], 1)
+        url = reverse("planetarium:reservation-detail", args=[reservation.id])
+        few = self.count_queries(url)
+
+        reservation = self.reserve(
+            [sample_show_session() for _ in range(3)], tickets_per_session=5
+        )
+        url = reverse("planetarium:reservation-detail", args=[reservation.id])
+        with self.assertNumQueries(few):
+            res = self.client.get(url)
+
+        self.assertEqual(few, 2)
+        self.assertEqual(len(res.data["tickets"]), 15)
@@ -0,0 +1,164 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from planetarium.models import (
+    AstronomyShow,
+    PlanetariumDome,
+    Reservation,
+    SeatHold,
+    ShowSession,
+    Ticket
+)
+from planetarium.serializers import SEAT_HELD_MESSAGE
+
+
+RESERVATION_URL = reverse("planetarium:reservation-list")
+
+
+def hold_url(show_session_id):
+    return reverse("planetarium:showsession-hold", args=[show_session_id])
+
+
+def places_payload(*seats, row=1):
+    return {"places": [{"row": row, "seat": seat} for seat in seats]}
+
+
+class SeatHoldApiTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.other_client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test_user@example.com", password="testpassword"
+        )
+        self.other_user = get_user_model().objects.create_user(
+            email="other_user@example.com", password="testpassword"
+        )
+        self.client.force_authenticate(self.user)
+        self.other_client.force_authenticate(self.other_user)
+        self.show_session = ShowSession.objects.create(
+            astronomy_show=AstronomyShow.objects.create(
+                title="The Big Bang", description="The beginning of space."
+            ),
+            planetarium_dome=PlanetariumDome.objects.create(
+                name="Glass", rows=3, seats_in_row=5
+            ),
+            show_time="2024-11-20 14:00:00+00:00",
+        )
+        self.url = hold_url(self.show_session.id)
+
+    def held_seats(self, user):
+        return set(
+            SeatHold.objects.filter(user=user).values_list("row", "seat")
+        )
+
+    def test_hold_seats(self):
+        res = self.client.post(self.url, places_payload(1, 2), format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(res.data["show_session"], self.show_session.id)
+        self.assertEqual(self.held_seats(self.user), {(1, 1), (1, 2)})
+
+        res = self.client.get(self.url)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["places"], places_payload(1, 2)["places"])
+
+    def test_hold_again_replaces_hold(self):
+        self.client.post(self.url, places_payload(1, 2), format="json")
+
+        res = self.client.post(self.url, places_payload(2, 3), format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.held_seats(self.user), {(1, 2), (1, 3)})
+
+    def test_seat_held_by_other_user_rejected(self):
+        self.client.post(self.url, places_payload(1, 2), format="json")
+
+        res = self.other_client.post(
+            self.url, places_payload(2, 3), format="json"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.held_seats(self.other_user), set())
+
+    def test_sold_seat_rejected(self):
+        Ticket.objects.create(
+            row=1, seat=1, show_session=self.show_session,
+            reservation=Reservation.objects.create(user=self.other_user)
+        )
+
+        res = self.client.post(self.url, places_payload(1), format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_expired_hold_does_not_block(self):
+        self.client.post(self.url, places_payload(1, 2), format="json")
+        SeatHold.objects.update(
+            expires_at=timezone.now() - timedelta(seconds=1)
+        )
+
+        self.assertEqual(
+            self.client.get(self.url).status_code, status.HTTP_404_NOT_FOUND
+        )
+        res = self.other_client.post(
+            self.url, places_payload(2), format="json"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.held_seats(self.user), set())
+
+    def test_release_hold(self):
+        self.client.post(self.url, places_payload(1, 2), format="json")
+
+        res = self.client.delete(self.url)
+
+        self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(SeatHold.objects.exists())
+
+    def test_reservation_of_held_seat_rejected(self):
+        self.client.post(self.url, places_payload(2), format="json")
+
+        res = self.other_client.post(
+            RESERVATION_URL,
+            {
+                "tickets": [
+                    {
+                        "row": 1,
+                        "seat": seat,
+                        "show_session": self.show_session.id,
+                    }
+                    for seat in (1, 2)
+                ]
+            },
+            format="json"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            res.data["tickets"],
+            [{}, {"non_field_errors": [SEAT_HELD_MESSAGE]}]
+        )
+
+    def test_reservation_converts_hold(self):
+        self.client.post(self.url, places_payload(1, 2), format="json")
+
+        res = self.client.post(
+            RESERVATION_URL,
+            {
+                "tickets": [
+                    {"row": 1, "seat": 1, "show_session": self.show_session.id}
+                ]
+            },
+            format="json"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertFalse(SeatHold.objects.exists())
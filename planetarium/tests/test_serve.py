@@ -0,0 +1,100 @@
+import os
+import tempfile
+from types import ModuleType
+from unittest import mock
+
+from django.conf import settings
+from django.core.management import CommandError, call_command
+from django.db import connections
+from django.test import SimpleTestCase, override_settings
+
+from planetarium.management.commands.serve import GunicornServer
+from planetarium_api_service import asgi, wsgi
+from planetarium_api_service.urls import file_urlpatterns
+
+
+SHARED_CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": "redis://localhost:6379/0",
+    }
+}
+
+
+@override_settings(CACHES=SHARED_CACHES)
+@mock.patch.object(connections, "close_all")
+@mock.patch.object(GunicornServer, "run", autospec=True)
+class ServeCommandTests(SimpleTestCase):
+    def test_wsgi_workers_share_the_preloaded_application(
+            self, run, close_all
+    ):
+        call_command(
+            "serve", "--bind", "127.0.0.1:9000", "--workers", "3",
+            "--threads", "2"
+        )
+
+        server = run.call_args.args[0]
+        self.assertIs(server.load(), wsgi.application)
+        self.assertEqual(server.cfg.bind, ["127.0.0.1:9000"])
+        self.assertEqual(server.cfg.workers, 3)
+        self.assertEqual(server.cfg.threads, 2)
+        self.assertEqual(server.cfg.worker_class_str, "gthread")
+        self.assertTrue(server.cfg.preload_app)
+        close_all.assert_called_once_with()
+
+    @mock.patch.dict(connections.settings["default"])
+    def test_asgi_pools_connections(self, run, close_all):
+        call_command("serve", "--asgi")
+
+        server = run.call_args.args[0]
+        self.assertIs(server.load(), asgi.application)
+        self.assertEqual(
+            server.cfg.worker_class_str, "uvicorn.workers.UvicornWorker"
+        )
+        self.assertEqual(connections.settings["default"]["CONN_MAX_AGE"], 0)
+        self.assertEqual(
+            connections.settings["default"]["OPTIONS"]["pool"],
+            settings.DATABASE_POOL
+        )
+
+    @override_settings(CACHES={
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    })
+    def test_several_workers_need_a_shared_cache(self, run, close_all):
+        with self.assertRaisesMessage(CommandError, "shared default cache"):
+            call_command("serve", "--workers", "2")
+
+        call_command("serve", "--workers", "1")
+
+        self.assertEqual(run.call_args.args[0].cfg.workers, 1)
+
+
+class FileServingTests(SimpleTestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(os.rmdir, self.root)
+
+    def get_file(self, url: str, **settings):
+        with override_settings(
+                STATIC_ROOT=self.root, MEDIA_ROOT=self.root, **settings
+        ):
+            urlconf = ModuleType("file_urls")
+            urlconf.urlpatterns = file_urlpatterns()
+            with override_settings(ROOT_URLCONF=urlconf):
+                return self.client.get(url)
+
+    def test_serves_static_and_media_files_when_enabled(self):
+        path = os.path.join(self.root, "variant.webp")
+        with open(path, "wb") as file:
+            file.write(b"RIFF")
+        self.addCleanup(os.remove, path)
+
+        for url in ("/static/variant.webp", "/media/variant.webp"):
+            res = self.get_file(url, SERVE_FILES=True)
+            self.assertEqual(res.status_code, 200)
+            self.assertEqual(b"".join(res.streaming_content), b"RIFF")
+
+            res = self.get_file(url, SERVE_FILES=False)
+            self.assertEqual(res.status_code, 404)
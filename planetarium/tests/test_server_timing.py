@@ -0,0 +1,133 @@
+import asyncio
+import re
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import AsyncClient, TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from planetarium.middleware import record_query
+from planetarium.models import (
+    AstronomyShow,
+    PlanetariumDome,
+    Reservation,
+    ShowSession,
+    Ticket
+)
+
+
+SHOW_SESSION_URL = reverse("planetarium:showsession-list")
+RESERVATION_URL = reverse("planetarium:reservation-list")
+
+
+def server_timing(response) -> dict:
+    return {
+        name: (float(duration), description)
+        for name, duration, description in re.findall(
+            r'(\w+);dur=([\d.]+)(?:;desc="([^"]*)")?',
+            response["Server-Timing"]
+        )
+    }
+
+
+class ServerTimingTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test_user@example.com", password="testpassword"
+        )
+        self.client.force_authenticate(self.user)
+        for number in range(3):
+            ShowSession.objects.create(
+                astronomy_show=AstronomyShow.objects.create(
+                    title=f"Show {number}", description="Deep space."
+                ),
+                planetarium_dome=PlanetariumDome.objects.create(
+                    name="Glass", rows=3, seats_in_row=5
+                ),
+                show_time=f"2024-11-2{number} 14:00:00+00:00",
+            )
+
+    def test_header_reports_queries_and_timings(self):
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(SHOW_SESSION_URL)
+
+        timing = server_timing(res)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(timing["db"][1], f"{len(queries)} queries")
+        self.assertGreater(timing["serializer"][0], 0)
+        self.assertGreater(timing["render"][0], 0)
+        self.assertGreaterEqual(
+            timing["view"][0],
+            timing["serializer"][0] + timing["render"][0]
+        )
+
+    def test_serializer_time_of_model_serializers(self):
+        show_session = ShowSession.objects.first()
+        reservation = Reservation.objects.create(user=self.user)
+        Ticket.objects.create(
+            row=1, seat=1, show_session=show_session, reservation=reservation
+        )
+        for url in (
+                reverse(
+                    "planetarium:showsession-detail", args=[show_session.id]
+                ),
+                RESERVATION_URL,
+        ):
+            res = self.client.get(url)
+
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            self.assertGreater(server_timing(res)["serializer"][0], 0)
+
+    def test_log_line_tagged_with_view_and_action(self):
+        with self.assertLogs("planetarium.server_timing", "INFO") as logs:
+            self.client.get(SHOW_SESSION_URL)
+            self.client.post(RESERVATION_URL, {}, format="json")
+
+        tags = [record.view for record in logs.records]
+        self.assertEqual(
+            tags,
+            [
+                "AsyncShowSessionViewSet.list",
+                "AsyncReservationViewSet.create",
+            ]
+        )
+        self.assertEqual(logs.records[1].status_code, 400)
+        self.assertIn("queries=", logs.output[0])
+
+    def test_async_view_queries_are_recorded(self):
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(SHOW_SESSION_URL)
+
+        self.assertEqual(
+            server_timing(res)["db"][1], f"{len(queries)} queries"
+        )
+
+    async def test_concurrent_async_requests_count_their_own_queries(self):
+        client = AsyncClient()
+        token = AccessToken.for_user(self.user)
+        headers = {"Authorization": f"Bearer {token}"}
+        # The first request also loads the user into the user cache.
+        await client.get(SHOW_SESSION_URL, headers=headers)
+        single = await client.get(SHOW_SESSION_URL, headers=headers)
+
+        responses = await asyncio.gather(*(
+            client.get(SHOW_SESSION_URL, headers=headers)
+            for _ in range(4)
+        ))
+
+        for res in responses:
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            self.assertEqual(
+                server_timing(res)["db"][1], server_timing(single)["db"][1]
+            )
+
+    def test_one_query_recorder_per_connection(self):
+        self.client.get(SHOW_SESSION_URL)
+        self.client.get(SHOW_SESSION_URL)
+
+        self.assertEqual(connection.execute_wrappers, [record_query])
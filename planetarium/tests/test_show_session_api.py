@@ -0,0 +1,797 @@
+import base64
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from planetarium.models import (
+    AstronomyShow,
+    PlanetariumDome,
+    Reservation,
+    ShowSession,
+    ShowSessionDailyRollup,
+    Ticket
+)
+from planetarium.caching import bump_version
+from planetarium.seat_map import SeatMap
+
+
+RESERVATION_URL = reverse("planetarium:reservation-list")
+SHOW_SESSION_URL = reverse("planetarium:showsession-list")
+SCHEDULE_URL = reverse("planetarium:showsession-schedule")
+CALENDAR_URL = reverse("planetarium:showsession-calendar")
+
+
+def seat_map_url(show_session_id):
+    return reverse(
+        "planetarium:showsession-seat-map", args=[show_session_id]
+    )
+
+
+def sample_show_session(**params) -> ShowSession:
+    astronomy_show = AstronomyShow.objects.create(
+        title="The Big Bang",
+        description="An astronomy show about the beginning of space.",
+    )
+    planetarium_dome = PlanetariumDome.objects.create(
+        name="Glass", rows=3, seats_in_row=5
+    )
+    defaults = {
+        "show_time": "2024-11-20 14:00:00+00:00",
+        "astronomy_show": astronomy_show,
+        "planetarium_dome": planetarium_dome,
+    }
+    defaults.update(params)
+
+    return ShowSession.objects.create(**defaults)
+
+
+def taken_places(data):
+    seat_map = SeatMap(
+        data["show_session"],
+        data["rows"],
+        data["seats_in_row"],
+        base64.b64decode(data["taken"])
+    )
+    return {
+        (row, seat)
+        for row in range(1, seat_map.rows + 1)
+        for seat in range(1, seat_map.seats_in_row + 1)
+        if seat_map.is_taken(row, seat)
+    }
+
+
+class SeatMapTests(TestCase):
+    def test_mark_and_release_seats(self):
+        seat_map = SeatMap(1, rows=3, seats_in_row=5)
+
+        seat_map.mark(1, 1)
+        seat_map.mark(3, 5)
+        seat_map.mark(2, 3)
+        seat_map.mark(2, 3, taken=False)
+
+        self.assertEqual(len(seat_map.bits), 2)
+        self.assertTrue(seat_map.is_taken(1, 1))
+        self.assertTrue(seat_map.is_taken(3, 5))
+        self.assertFalse(seat_map.is_taken(2, 3))
+        self.assertEqual(seat_map.tickets_available, 13)
+
+    def test_out_of_range_seats_are_ignored(self):
+        seat_map = SeatMap(1, rows=3, seats_in_row=5)
+
+        seat_map.mark(4, 1)
+        seat_map.mark(1, 6)
+
+        self.assertEqual(seat_map.tickets_available, 15)
+        self.assertFalse(seat_map.is_taken(4, 1))
+
+
+class ShowSessionSeatMapApiTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test_user@example.com", password="testpassword"
+        )
+        self.client.force_authenticate(self.user)
+        self.show_session = sample_show_session()
+        self.reservation = Reservation.objects.create(user=self.user)
+        Ticket.objects.create(
+            row=2, seat=4, show_session=self.show_session,
+            reservation=self.reservation
+        )
+
+    def test_seat_map(self):
+        res = self.client.get(seat_map_url(self.show_session.id))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["rows"], 3)
+        self.assertEqual(res.data["seats_in_row"], 5)
+        self.assertEqual(res.data["tickets_available"], 14)
+        self.assertEqual(res.data["encoding"], "bitmap-base64")
+        self.assertEqual(taken_places(res.data), {(2, 4)})
+
+    def test_cached_seat_map_does_not_query_database(self):
+        self.client.get(seat_map_url(self.show_session.id))
+
+        with self.assertNumQueries(0):
+            res = self.client.get(seat_map_url(self.show_session.id))
+
+        self.assertEqual(taken_places(res.data), {(2, 4)})
+
+    def test_seat_map_updated_on_reservation_create_and_delete(self):
+        self.client.get(seat_map_url(self.show_session.id))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            res = self.client.post(
+                RESERVATION_URL,
+                {"tickets": [
+                    {"row": row, "seat": seat,
+                     "show_session": self.show_session.id}
+                    for row, seat in ((1, 1), (3, 5))
+                ]},
+                format="json"
+            )
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+        # The cached map is patched, not rebuilt from the tickets.
+        with self.assertNumQueries(0):
+            res = self.client.get(seat_map_url(self.show_session.id))
+        self.assertEqual(taken_places(res.data), {(1, 1), (2, 4), (3, 5)})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.reservation.delete()
+
+        with self.assertNumQueries(0):
+            res = self.client.get(seat_map_url(self.show_session.id))
+        self.assertEqual(taken_places(res.data), {(1, 1), (3, 5)})
+
+    def test_seat_map_rebuilt_after_concurrent_changes(self):
+        self.client.get(seat_map_url(self.show_session.id))
+
+        def bump_after_another_change(key, timeout=None):
+            bump_version(key, timeout)
+            return bump_version(key, timeout)
+
+        with mock.patch(
+                "planetarium.seat_map.bump_version",
+                side_effect=bump_after_another_change
+        ), self.captureOnCommitCallbacks(execute=True):
+            Ticket.objects.create(
+                row=1, seat=1, show_session=self.show_session,
+                reservation=self.reservation
+            )
+
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(seat_map_url(self.show_session.id))
+        self.assertTrue(queries)
+        self.assertEqual(taken_places(res.data), {(1, 1), (2, 4)})
+
+    def test_seat_map_built_before_a_ticket_commits_is_not_served(self):
+        build = SeatMap.build
+
+        def build_then_reserve(show_session):
+            seat_map = build(show_session)
+            with self.captureOnCommitCallbacks(execute=True):
+                Ticket.objects.create(
+                    row=1, seat=1, show_session=self.show_session,
+                    reservation=self.reservation
+                )
+            return seat_map
+
+        with mock.patch.object(
+                SeatMap, "build", side_effect=build_then_reserve
+        ):
+            res = self.client.get(seat_map_url(self.show_session.id))
+        self.assertEqual(taken_places(res.data), {(2, 4)})
+
+        res = self.client.get(seat_map_url(self.show_session.id))
+
+        self.assertEqual(taken_places(res.data), {(1, 1), (2, 4)})
+
+    def test_ticket_moved_within_a_session_updates_seat_map(self):
+        self.client.get(seat_map_url(self.show_session.id))
+        ticket = Ticket.objects.get()
+
+        ticket.seat = 5
+        with self.captureOnCommitCallbacks(execute=True):
+            ticket.save()
+
+        with self.assertNumQueries(0):
+            res = self.client.get(seat_map_url(self.show_session.id))
+        self.assertEqual(taken_places(res.data), {(2, 5)})
+
+    def test_seat_map_rebuilt_after_dome_change(self):
+        self.client.get(seat_map_url(self.show_session.id))
+        planetarium_dome = self.show_session.planetarium_dome
+        planetarium_dome.seats_in_row = 10
+        planetarium_dome.save()
+
+        res = self.client.get(seat_map_url(self.show_session.id))
+
+        self.assertEqual(res.data["seats_in_row"], 10)
+        self.assertEqual(taken_places(res.data), {(2, 4)})
+
+    def test_retrieve_includes_taken_places(self):
+        url = reverse(
+            "planetarium:showsession-detail", args=[self.show_session.id]
+        )
+        with CaptureQueriesContext(connection) as one_ticket:
+            self.client.get(url)
+        for seat in range(1, 6):
+            Ticket.objects.create(
+                row=3, seat=seat, show_session=self.show_session,
+                reservation=self.reservation
+            )
+        cache.clear()
+
+        with self.assertNumQueries(len(one_ticket)):
+            res = self.client.get(url)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["taken_places"]["encoding"], "bitmap-base64")
+        self.assertEqual(
+            taken_places({
+                "show_session": res.data["id"],
+                "rows": res.data["planetarium_dome"]["rows"],
+                "seats_in_row": res.data["planetarium_dome"]["seats_in_row"],
+                "taken": res.data["taken_places"]["taken"],
+            }),
+            {(2, 4)} | {(3, seat) for seat in range(1, 6)}
+        )
+
+    def test_seat_map_not_found(self):
+        res = self.client.get(seat_map_url(self.show_session.id + 1))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class TicketsSoldCounterTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test_user@example.com", password="testpassword"
+        )
+        self.client.force_authenticate(self.user)
+        self.show_session = sample_show_session()
+
+    def reserve(self, *places):
+        return self.client.post(
+            RESERVATION_URL,
+            {"tickets": [
+                {"row": row, "seat": seat,
+                 "show_session": self.show_session.id}
+                for row, seat in places
+            ]},
+            format="json"
+        )
+
+    def test_counter_follows_reservation_create_and_delete(self):
+        res = self.reserve((1, 1), (1, 2), (1, 3))
+        self.reserve((2, 1))
+        self.show_session.refresh_from_db()
+        self.assertEqual(self.show_session.tickets_sold, 4)
+        self.assertEqual(self.show_session.tickets_available, 11)
+
+        Reservation.objects.get(id=res.data["id"]).delete()
+
+        self.show_session.refresh_from_db()
+        self.assertEqual(self.show_session.tickets_sold, 1)
+
+    def test_counter_follows_ticket_moved_between_sessions(self):
+        other_session = sample_show_session()
+        reservation = Reservation.objects.create(user=self.user)
+        ticket = Ticket.objects.create(
+            row=1, seat=1, show_session=self.show_session,
+            reservation=reservation
+        )
+
+        ticket = Ticket.objects.get(id=ticket.id)
+        ticket.show_session = other_session
+        ticket.save()
+
+        self.show_session.refresh_from_db()
+        other_session.refresh_from_db()
+        self.assertEqual(self.show_session.tickets_sold, 0)
+        self.assertEqual(other_session.tickets_sold, 1)
+
+    def test_delete_query_count_does_not_grow_with_tickets(self):
+        queries = []
+        for count in (1, 8):
+            show_session = sample_show_session()
+            user = get_user_model().objects.create_user(
+                email=f"user_{count}@example.com", password="testpassword"
+            )
+            reservation = Reservation.objects.create(user=user)
+            for seat in range(1, count + 1):
+                for session in (show_session, self.show_session):
+                    Ticket.objects.create(
+                        row=seat % 3 + 1, seat=seat // 3 + 1,
+                        show_session=session, reservation=reservation
+                    )
+            with CaptureQueriesContext(connection) as deleted_session:
+                show_session.delete()
+            with CaptureQueriesContext(connection) as deleted_user:
+                user.delete()
+            queries.append((len(deleted_session), len(deleted_user)))
+
+        self.assertEqual(queries[0], queries[1])
+        self.show_session.refresh_from_db()
+        self.assertEqual(self.show_session.tickets_sold, 0)
+
+    def test_session_save_keeps_counter(self):
+        stale_session = ShowSession.objects.get(id=self.show_session.id)
+        self.reserve((1, 1), (1, 2))
+
+        stale_session.show_time = "2024-11-21 14:00:00+00:00"
+        stale_session.save()
+
+        self.show_session.refresh_from_db()
+        self.assertEqual(self.show_session.tickets_sold, 2)
+
+    def test_list_does_not_aggregate_tickets(self):
+        self.reserve((1, 1), (1, 2))
+
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(SHOW_SESSION_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            res.data["results"][0]["tickets_available"], 13
+        )
+        for query in queries.captured_queries:
+            self.assertNotIn("GROUP BY", query["sql"])
+            self.assertNotIn("COUNT(", query["sql"])
+
+    def test_recount_command_repairs_counter(self):
+        self.reserve((1, 1), (1, 2))
+        ShowSession.objects.update(tickets_sold=7)
+        out = StringIO()
+
+        call_command("recount_tickets_sold", stdout=out)
+
+        self.show_session.refresh_from_db()
+        self.assertEqual(self.show_session.tickets_sold, 2)
+        self.assertIn("1 show session(s)", out.getvalue())
+
+
+class ShowSessionPaginationTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test_user@example.com", password="testpassword"
+        )
+        self.client.force_authenticate(self.user)
+        self.show_session = sample_show_session()
+        self.other_show = AstronomyShow.objects.create(
+            title="Life in space", description="Is anybody out there?"
+        )
+        start = datetime(2024, 11, 20, 14, tzinfo=timezone.utc)
+        for hours in (0, 1, 1, 1, 2, 3, 5):
+            ShowSession.objects.create(
+                astronomy_show=self.other_show,
+                planetarium_dome=self.show_session.planetarium_dome,
+                show_time=start + timedelta(hours=hours),
+            )
+
+    def collect_pages(self, params):
+        ids = []
+        res = self.client.get(SHOW_SESSION_URL, params)
+        while True:
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            self.assertNotIn("count", res.data)
+            self.assertLessEqual(len(res.data["results"]), 2)
+            ids += [session["id"] for session in res.data["results"]]
+            if not res.data["next"]:
+                return ids
+            res = self.client.get(res.data["next"])
+
+    def test_pages_follow_show_time_and_id_ordering(self):
+        expected = list(
+            ShowSession.objects.order_by("-show_time", "id")
+            .values_list("id", flat=True)
+        )
+
+        self.assertEqual(self.collect_pages({"page_size": 2}), expected)
+
+    def test_pages_keep_filters(self):
+        expected = list(
+            ShowSession.objects.filter(astronomy_show=self.other_show)
+            .order_by("-show_time", "id")
+            .values_list("id", flat=True)
+        )
+
+        ids = self.collect_pages(
+            {"page_size": 2, "astronomy_show": self.other_show.id}
+        )
+
+        self.assertEqual(ids, expected)
+
+    def test_list_does_not_count_rows(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(SHOW_SESSION_URL)
+
+        for query in queries.captured_queries:
+            self.assertNotIn("COUNT(", query["sql"])
+
+
+class ShowSessionTimeFilterTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test_user@example.com", password="testpassword"
+        )
+        self.client.force_authenticate(self.user)
+        self.show_session = sample_show_session(
+            show_time="2024-11-20 00:00:00+00:00"
+        )
+        self.sessions = {
+            show_time: ShowSession.objects.create(
+                astronomy_show=self.show_session.astronomy_show,
+                planetarium_dome=self.show_session.planetarium_dome,
+                show_time=show_time,
+            ).id
+            for show_time in (
+                "2024-11-19 23:59:59+00:00",
+                "2024-11-20 23:59:59+00:00",
+                "2024-11-21 00:00:00+00:00",
+                "2024-11-22 18:00:00+00:00",
+            )
+        }
+        self.sessions["2024-11-20 00:00:00+00:00"] = self.show_session.id
+
+    def filtered_ids(self, params):
+        res = self.client.get(SHOW_SESSION_URL, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return {session["id"] for session in res.data["results"]}
+
+    def ids_at(self, *show_times):
+        return {self.sessions[show_time] for show_time in show_times}
+
+    def test_filter_by_date(self):
+        self.assertEqual(
+            self.filtered_ids({"date": "2024-11-20"}),
+            self.ids_at(
+                "2024-11-20 00:00:00+00:00", "2024-11-20 23:59:59+00:00"
+            )
+        )
+
+    def test_filter_by_date_range(self):
+        self.assertEqual(
+            self.filtered_ids({"from": "2024-11-20", "to": "2024-11-21"}),
+            self.ids_at(
+                "2024-11-20 00:00:00+00:00",
+                "2024-11-20 23:59:59+00:00",
+                "2024-11-21 00:00:00+00:00",
+            )
+        )
+
+    def test_filter_by_datetime_range(self):
+        self.assertEqual(
+            self.filtered_ids(
+                {"from": "2024-11-20T12:00", "to": "2024-11-22T18:00"}
+            ),
+            self.ids_at(
+                "2024-11-20 23:59:59+00:00", "2024-11-21 00:00:00+00:00"
+            )
+        )
+
+    def test_invalid_range_values_ignored(self):
+        self.assertEqual(
+            self.filtered_ids({"from": "2024-13-45", "to": "soon"}),
+            set(self.sessions.values())
+        )
+
+
+class ShowSessionScheduleTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(
+            get_user_model().objects.create_superuser(
+                "admin@myproject.com", "password"
+            )
+        )
+        self.show_session = sample_show_session(
+            show_time="2024-11-20 18:00:00+00:00"
+        )
+        self.payload = {
+            "astronomy_show": self.show_session.astronomy_show.id,
+            "planetarium_dome": self.show_session.planetarium_dome.id,
+        }
+
+    def test_schedule_recurrence(self):
+        # Mondays and Fridays of two weeks, twice a day.
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.post(
+                SCHEDULE_URL,
+                {
+                    **self.payload,
+                    "recurrence": {
+                        "weekdays": [0, 4],
+                        "times": ["12:00", "18:30"],
+                        "start_date": "2024-12-02",
+                        "end_date": "2024-12-13",
+                    },
+                },
+                format="json"
+            )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        show_sessions = ShowSession.objects.filter(id__in=res.data["ids"])
+        self.assertEqual(
+            sorted(
+                show_session.show_time.isoformat()
+                for show_session in show_sessions
+            ),
+            [
+                f"2024-12-{day:02}T{hour}+00:00"
+                for day in (2, 6, 9, 13)
+                for hour in ("12:00:00", "18:30:00")
+            ]
+        )
+        # Conflict check, insert, and the daily rollups refresh.
+        self.assertEqual(
+            [query["sql"].split()[0] for query in queries.captured_queries
+             if '"planetarium_showsession"' in query["sql"]],
+            ["SELECT", "INSERT", "SELECT"]
+        )
+
+    def test_schedule_explicit_show_times(self):
+        res = self.client.post(
+            SCHEDULE_URL,
+            {
+                **self.payload,
+                "show_times": [
+                    "2024-12-01T10:00:00Z", "2024-12-01T14:00:00Z"
+                ],
+            },
+            format="json"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(res.data["ids"]), 2)
+        self.assertEqual(
+            res.data["astronomy_show"], self.show_session.astronomy_show.id
+        )
+
+    def test_batch_rejected_as_a_whole(self):
+        for extra, error_field in (
+                ({"show_times": [
+                    "2024-12-01T10:00:00Z", "2024-12-01T10:00:00Z"
+                ]}, "show_times"),
+                ({"show_times": [
+                    "2024-12-01T10:00:00Z", "2024-11-20T18:00:00Z"
+                ]}, "show_times"),
+                ({"recurrence": {
+                    "weekdays": [6],
+                    "times": ["12:00"],
+                    "start_date": "2024-12-02",
+                    "end_date": "2024-12-06",
+                }}, "recurrence"),
+                ({}, "non_field_errors"),
+        ):
+            res = self.client.post(
+                SCHEDULE_URL, {**self.payload, **extra}, format="json"
+            )
+
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn(error_field, res.data)
+        self.assertEqual(ShowSession.objects.count(), 1)
+
+    def test_schedule_forbidden_for_non_admin(self):
+        self.client.force_authenticate(
+            get_user_model().objects.create_user(
+                email="test_user@example.com", password="testpassword"
+            )
+        )
+
+        res = self.client.post(
+            SCHEDULE_URL,
+            {**self.payload, "show_times": ["2024-12-01T10:00:00Z"]},
+            format="json"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class ShowSessionCalendarTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test_user@example.com", password="testpassword"
+        )
+        self.client.force_authenticate(self.user)
+        # Domes of 15 seats, two sessions on the 20th, one on the 22nd.
+        self.show_session = sample_show_session(
+            show_time="2024-11-20 10:00:00+00:00"
+        )
+        self.evening_session = sample_show_session(
+            show_time="2024-11-20 23:30:00+00:00"
+        )
+        self.later_session = ShowSession.objects.create(
+            astronomy_show=self.show_session.astronomy_show,
+            planetarium_dome=self.show_session.planetarium_dome,
+            show_time="2024-11-22 10:00:00+00:00",
+        )
+        self.reservation = Reservation.objects.create(user=self.user)
+        for seat in (1, 2, 3):
+            Ticket.objects.create(
+                row=1, seat=seat, show_session=self.show_session,
+                reservation=self.reservation
+            )
+
+    def calendar(self, **params):
+        res = self.client.get(
+            CALENDAR_URL, {"from": "2024-11-01", "to": "2024-11-30", **params}
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return [
+            (day["date"], day["show_sessions"], day["seats"],
+             day["tickets_available"])
+            for day in res.data
+        ]
+
+    def assert_rollups_rebuilt_unchanged(self):
+        fields = (
+            "day", "astronomy_show", "planetarium_dome",
+            "show_sessions", "seats", "tickets_sold"
+        )
+        rollups = sorted(
+            ShowSessionDailyRollup.objects.values_list(*fields)
+        )
+        ShowSessionDailyRollup.rebuild()
+        self.assertEqual(
+            rollups,
+            sorted(ShowSessionDailyRollup.objects.values_list(*fields))
+        )
+
+    def test_calendar_days(self):
+        with self.assertNumQueries(1):
+            self.client.get(
+                CALENDAR_URL, {"from": "2024-11-01", "to": "2024-11-30"}
+            )
+
+        self.assertEqual(
+            self.calendar(),
+            [("2024-11-20", 2, 30, 27), ("2024-11-22", 1, 15, 15)]
+        )
+        self.assertEqual(
+            self.calendar(
+                astronomy_show=self.evening_session.astronomy_show_id
+            ),
+            [("2024-11-20", 1, 15, 15)]
+        )
+        self.assertEqual(
+            self.calendar(
+                planetarium_dome=self.show_session.planetarium_dome_id
+            ),
+            [("2024-11-20", 1, 15, 12), ("2024-11-22", 1, 15, 15)]
+        )
+
+    def test_rollups_follow_tickets_and_sessions(self):
+        Ticket.objects.filter(seat=3).get().delete()
+        ticket = Ticket.objects.get(seat=2)
+        ticket.show_session = self.later_session
+        ticket.save()
+        self.later_session.show_time = "2024-11-23 10:00:00+00:00"
+        self.later_session.save()
+        self.evening_session.delete()
+        planetarium_dome = self.show_session.planetarium_dome
+        planetarium_dome.rows = 4
+        planetarium_dome.save()
+
+        self.assertEqual(
+            self.calendar(),
+            [("2024-11-20", 1, 20, 19), ("2024-11-23", 1, 20, 19)]
+        )
+        self.assert_rollups_rebuilt_unchanged()
+
+    def test_rollups_follow_reservations_and_bulk_scheduling(self):
+        admin = get_user_model().objects.create_superuser(
+            "admin@myproject.com", "password"
+        )
+        self.client.force_authenticate(admin)
+        self.client.post(
+            SCHEDULE_URL,
+            {
+                "astronomy_show": self.show_session.astronomy_show_id,
+                "planetarium_dome": self.show_session.planetarium_dome_id,
+                "show_times": [
+                    "2024-11-20T18:00:00Z", "2024-11-21T18:00:00Z"
+                ],
+            },
+            format="json"
+        )
+        self.client.post(
+            RESERVATION_URL,
+            {"tickets": [
+                {"row": 2, "seat": 1, "show_session": self.later_session.id}
+            ]},
+            format="json"
+        )
+        self.reservation.delete()
+
+        self.assertEqual(
+            self.calendar(),
+            [
+                ("2024-11-20", 3, 45, 45),
+                ("2024-11-21", 1, 15, 15),
+                ("2024-11-22", 1, 15, 14),
+            ]
+        )
+        self.assert_rollups_rebuilt_unchanged()
+
+    def test_rollup_refresh_reads_show_time_ranges(self):
+        with CaptureQueriesContext(connection) as queries:
+            ShowSessionDailyRollup.refresh([self.show_session.rollup_key])
+
+        sql = "\n".join(query["sql"] for query in queries)
+        self.assertIn("pg_advisory_xact_lock", sql)
+        self.assertIn('"planetarium_showsession"."show_time" >=', sql)
+        self.assertNotIn("::date IN", sql)
+        self.assertEqual(self.calendar()[0], ("2024-11-20", 2, 30, 27))
+
+    def test_recount_command_repairs_rollups(self):
+        ShowSession.objects.update(tickets_sold=7)
+
+        call_command("recount_tickets_sold", stdout=StringIO())
+
+        self.assertEqual(self.calendar()[0], ("2024-11-20", 2, 30, 27))
+
+    def test_invalid_calendar_params(self):
+        for params in (
+                {},
+                {"from": "2024-11-01"},
+                {"from": "2024-13-45", "to": "2024-11-30"},
+                {"from": "2024-11-30", "to": "2024-11-01"},
+                {"from": "2024-01-01", "to": "2025-12-31"},
+                {"from": "2024-11-01", "to": "2024-11-30",
+                 "astronomy_show": "first"},
+        ):
+            res = self.client.get(CALENDAR_URL, params)
+
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ShowSessionDailyRollupConcurrencyTests(TransactionTestCase):
+    def test_concurrent_sessions_of_a_day_are_all_counted(self):
+        show_session = sample_show_session()
+        scheduled = threading.Event()
+
+        def schedule_in_transaction():
+            try:
+                with transaction.atomic():
+                    ShowSession.objects.create(
+                        astronomy_show=show_session.astronomy_show,
+                        planetarium_dome=show_session.planetarium_dome,
+                        show_time="2024-11-20 16:00:00+00:00",
+                    )
+                    scheduled.set()
+                    # The other session is scheduled meanwhile.
+                    time.sleep(0.5)
+            finally:
+                connection.close()
+
+        thread = threading.Thread(target=schedule_in_transaction)
+        thread.start()
+        scheduled.wait(5)
+        ShowSession.objects.create(
+            astronomy_show=show_session.astronomy_show,
+            planetarium_dome=show_session.planetarium_dome,
+            show_time="2024-11-20 18:00:00+00:00",
+        )
+        thread.join()
+
+        rollup = ShowSessionDailyRollup.objects.get()
+        self.assertEqual(rollup.show_sessions, 3)
@@ -0,0 +1,127 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from planetarium.models import (
+    AstronomyShow,
+    PlanetariumDome,
+    Reservation,
+    ShowSession,
+    ShowTheme,
+    Ticket
+)
+
+
+ASTRONOMY_SHOW_URL = reverse("planetarium:astronomyshow-list")
+ASTRONOMY_SHOW_SEARCH_URL = reverse("planetarium:astronomyshow-search")
+PLANETARIUM_DOME_URL = reverse("planetarium:planetariumdome-list")
+SHOW_SESSION_URL = reverse("planetarium:showsession-list")
+RESERVATION_URL = reverse("planetarium:reservation-list")
+
+
+class SparseFieldsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test_user@example.com", password="testpassword"
+        )
+        self.client.force_authenticate(self.user)
+
+        show_theme = ShowTheme.objects.create(name="Galaxies")
+        planetarium_dome = PlanetariumDome.objects.create(
+            name="Glass", rows=10, seats_in_row=12
+        )
+        for number in range(3):
+            astronomy_show = AstronomyShow.objects.create(
+                title=f"Black Hole {number}", description="Deep space."
+            )
+            astronomy_show.show_themes.add(show_theme)
+            show_session = ShowSession.objects.create(
+                astronomy_show=astronomy_show,
+                planetarium_dome=planetarium_dome,
+                show_time=f"2024-11-2{number} 14:00:00+00:00",
+            )
+            Ticket.objects.create(
+                show_session=show_session,
+                reservation=Reservation.objects.create(user=self.user),
+                row=1,
+                seat=1,
+            )
+
+    def get(self, url, fields):
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(url, {"fields": fields})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return res, [query["sql"] for query in queries.captured_queries]
+
+    def test_show_session_list_fields(self):
+        res, queries = self.get(
+            SHOW_SESSION_URL, "id,show_time,tickets_available"
+        )
+
+        self.assertEqual(
+            [list(session) for session in res.data["results"]],
+            [["id", "show_time", "tickets_available"]] * 3
+        )
+        self.assertEqual(res.data["results"][0]["tickets_available"], 119)
+        # The page also reads the last modifications of its validators.
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn('"planetarium_astronomyshow"."title"', queries[0])
+        self.assertNotIn('"planetarium_planetariumdome"."name"', queries[0])
+
+    def test_astronomy_show_list_fields(self):
+        res, queries = self.get(ASTRONOMY_SHOW_URL, "id,title")
+
+        self.assertEqual(
+            res.data[0], {"id": res.data[0]["id"], "title": "Black Hole 0"}
+        )
+        self.assertEqual(len(queries), 2)
+        self.assertNotIn("description", queries[1])
+
+        res, queries = self.get(ASTRONOMY_SHOW_URL, "title,show_themes")
+        self.assertEqual(res.data[0]["show_themes"], ["Galaxies"])
+        self.assertEqual(len(queries), 3)
+
+    def test_astronomy_show_search_fields(self):
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(
+                ASTRONOMY_SHOW_SEARCH_URL, {"q": "black hole", "fields": "id"}
+            )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(list(res.data["results"][0]), ["id"])
+        self.assertNotIn("description", queries.captured_queries[-1]["sql"])
+
+    def test_planetarium_dome_capacity_field(self):
+        res, queries = self.get(PLANETARIUM_DOME_URL, "name,capacity")
+
+        self.assertEqual(res.data, [{"name": "Glass", "capacity": 120}])
+
+    def test_reservation_list_without_tickets(self):
+        res, queries = self.get(RESERVATION_URL, "id,created_at")
+
+        self.assertEqual(list(res.data["results"][0]), ["id", "created_at"])
+        self.assertFalse(
+            [sql for sql in queries if "planetarium_ticket" in sql]
+        )
+
+    def test_cursor_pagination_with_fields(self):
+        res = self.client.get(
+            SHOW_SESSION_URL, {"fields": "id", "page_size": 2}
+        )
+        res = self.client.get(res.data["next"])
+
+        self.assertEqual(len(res.data["results"]), 1)
+        self.assertEqual(list(res.data["results"][0]), ["id"])
+
+    def test_unknown_field(self):
+        res = self.client.get(SHOW_SESSION_URL, {"fields": "id,description"})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("description", res.data["fields"])
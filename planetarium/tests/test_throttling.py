@@ -0,0 +1,119 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+from rest_framework.throttling import SimpleRateThrottle
+
+from planetarium.throttling import UserRateThrottle
+
+
+SHOW_THEME_URL = reverse("planetarium:showtheme-list")
+RESERVATION_URL = reverse("planetarium:reservation-list")
+REGISTER_URL = reverse("user:create")
+
+THROTTLE_RATES = {
+    "anon": "2/minute",
+    "user": "3/minute",
+    "catalog": "4/minute",
+    "reservation_write": "2/minute",
+}
+
+
+@mock.patch.object(SimpleRateThrottle, "THROTTLE_RATES", THROTTLE_RATES)
+# Keep every request in the middle of one window.
+@mock.patch.object(SimpleRateThrottle, "timer", mock.Mock(return_value=90))
+class ThrottleApiTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test_user@example.com", password="testpassword"
+        )
+        self.client.force_authenticate(self.user)
+
+    def statuses(self, method, url, count):
+        return [
+            getattr(self.client, method)(url, {}, format="json").status_code
+            for _ in range(count)
+        ]
+
+    def test_catalog_reads_use_catalog_rate(self):
+        self.assertEqual(
+            self.statuses("get", SHOW_THEME_URL, 5),
+            [status.HTTP_200_OK] * 4 + [status.HTTP_429_TOO_MANY_REQUESTS]
+        )
+
+    def test_reservation_writes_use_their_own_rate(self):
+        self.assertEqual(
+            self.statuses("post", RESERVATION_URL, 3),
+            [status.HTTP_400_BAD_REQUEST] * 2
+            + [status.HTTP_429_TOO_MANY_REQUESTS]
+        )
+        # Reads of an unconfigured scope fall back to the user rate.
+        self.assertEqual(
+            self.statuses("get", RESERVATION_URL, 4),
+            [status.HTTP_200_OK] * 3 + [status.HTTP_429_TOO_MANY_REQUESTS]
+        )
+        self.assertEqual(
+            self.statuses("get", SHOW_THEME_URL, 1), [status.HTTP_200_OK]
+        )
+
+    def test_throttled_response_has_retry_after(self):
+        self.statuses("post", RESERVATION_URL, 2)
+
+        res = self.client.post(RESERVATION_URL, {}, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertTrue(0 < int(res["Retry-After"]) <= 60)
+
+    def test_anonymous_requests_are_throttled(self):
+        self.client.force_authenticate(None)
+
+        self.assertEqual(
+            self.statuses("post", REGISTER_URL, 3),
+            [status.HTTP_400_BAD_REQUEST] * 2
+            + [status.HTTP_429_TOO_MANY_REQUESTS]
+        )
+
+
+@mock.patch.object(SimpleRateThrottle, "THROTTLE_RATES", THROTTLE_RATES)
+class SlidingWindowTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.request = mock.Mock(
+            method="GET", user=mock.Mock(pk=1, is_authenticated=True)
+        )
+        self.view = mock.Mock(spec=[])
+
+    def allow_at(self, now):
+        throttle = UserRateThrottle()
+        throttle.timer = lambda: now
+        return throttle.allow_request(self.request, self.view), throttle
+
+    def test_previous_window_slides_out(self):
+        # Three requests at the end of the first window.
+        for _ in range(3):
+            self.assertTrue(self.allow_at(59)[0])
+
+        # A sixth into the next window, 2.5 requests are still counted.
+        allowed, _ = self.allow_at(70)
+        self.assertTrue(allowed)
+        allowed, throttle = self.allow_at(70)
+        self.assertFalse(allowed)
+        self.assertAlmostEqual(throttle.wait(), 10)
+
+        self.assertFalse(self.allow_at(80)[0])
+        self.assertTrue(self.allow_at(81)[0])
+
+    def test_full_current_window_waits_for_the_next(self):
+        for _ in range(3):
+            self.assertTrue(self.allow_at(0)[0])
+
+        allowed, throttle = self.allow_at(15)
+
+        self.assertFalse(allowed)
+        self.assertAlmostEqual(throttle.wait(), 45)
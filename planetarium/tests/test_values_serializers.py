@@ -0,0 +1,124 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework.renderers import JSONRenderer
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient, APIRequestFactory
+
+from planetarium.models import (
+    AstronomyShow,
+    PlanetariumDome,
+    ShowSession,
+    ShowTheme
+)
+from planetarium.serializers import (
+    AstronomyShowListSerializer,
+    ShowSessionListSerializer
+)
+from planetarium.values_serializers import ValuesListSerializer
+from planetarium.views import AstronomyShowViewSet, ShowSessionViewSet
+
+
+SHOW_SESSION_URL = reverse("planetarium:showsession-list")
+
+IMAGE_VARIANTS = {
+    "webp": {"160": "uploads/astronomy-shows/show-160.webp"},
+    "jpeg": {"160": "uploads/astronomy-shows/show-160.jpeg"},
+}
+
+
+class ValuesListSerializerParityTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        show_themes = [
+            ShowTheme.objects.create(name=name)
+            for name in ("Stars", "Galaxies", "Black holes")
+        ]
+        planetarium_domes = [
+            PlanetariumDome.objects.create(
+                name=f"Dome {number}", rows=10 + number, seats_in_row=12
+            )
+            for number in range(2)
+        ]
+        for number in range(6):
+            astronomy_show = AstronomyShow.objects.create(
+                title=f"Show {number}",
+                description="Deep \"space\" ✨" * number,
+                image_variants=IMAGE_VARIANTS if number % 2 else {},
+            )
+            # Added out of id order, with and without themes.
+            astronomy_show.show_themes.add(*show_themes[number % 3::-1])
+            ShowSession.objects.create(
+                astronomy_show=astronomy_show,
+                planetarium_dome=planetarium_domes[number % 2],
+                show_time=f"2024-11-2{number} 14:0{number}:00.{number}+00:00",
+                tickets_sold=number * 7,
+            )
+
+    def setUp(self):
+        self.request = APIRequestFactory().get("/")
+        self.client = APIClient()
+        self.client.force_authenticate(
+            get_user_model().objects.create_user(
+                email="test_user@example.com", password="testpassword"
+            )
+        )
+
+    def assert_same_json(self, data, expected):
+        self.assertEqual(
+            JSONRenderer().render(data), JSONRenderer().render(expected)
+        )
+
+    def assert_same_as_serializer(self, serializer_class, viewset_class):
+        context = {"request": self.request}
+        queryset = viewset_class.queryset.order_by("id")
+        values_serializer = ValuesListSerializer(
+            serializer_class(context=context),
+            viewset_class.values_expressions
+        )
+
+        self.assert_same_json(
+            values_serializer.to_representation(
+                values_serializer.values(queryset)
+            ),
+            serializer_class(queryset, many=True, context=context).data
+        )
+
+    def test_show_session_rows_match_serializer(self):
+        self.assert_same_as_serializer(
+            ShowSessionListSerializer, ShowSessionViewSet
+        )
+
+    def test_astronomy_show_rows_match_serializer(self):
+        self.assert_same_as_serializer(
+            AstronomyShowListSerializer, AstronomyShowViewSet
+        )
+
+    def test_show_session_list_matches_serializer(self):
+        queryset = ShowSessionViewSet.queryset.order_by("-show_time", "id")
+
+        res = self.client.get(SHOW_SESSION_URL, {"page_size": 4})
+
+        self.assert_same_json(
+            res.data["results"],
+            ShowSessionListSerializer(
+                queryset[:4], many=True, context={"request": res.wsgi_request}
+            ).data
+        )
+
+    def test_sparse_show_session_list_matches_serializer(self):
+        fields = ["show_time", "astronomy_show_title", "tickets_available"]
+        queryset = ShowSessionViewSet.queryset.order_by("-show_time", "id")
+
+        res = self.client.get(
+            SHOW_SESSION_URL, {"fields": ",".join(reversed(fields))}
+        )
+
+        self.assert_same_json(
+            res.data["results"],
+            [
+                {name: row[name] for name in fields}
+                for row in ShowSessionListSerializer(
+                    queryset, many=True, context={"request": res.wsgi_request}
+                ).data
+            ]
+        )
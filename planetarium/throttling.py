@@ -0,0 +1,83 @@
+from rest_framework import throttling
+from rest_framework.permissions import SAFE_METHODS
+
+
+class SlidingWindowRateThrottle(throttling.SimpleRateThrottle):
+    """
+    SimpleRateThrottle counting requests per fixed window in the cache
+    instead of keeping a list of request timestamps. The requests of
+    the last `duration` seconds are estimated from the counters of the
+    current and previous windows, so a check costs one get_many and
+    one incr whatever the rate. Counters live in the default cache,
+    shared by every worker.
+    """
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.now = self.timer()
+        window, self.elapsed = divmod(self.now, self.duration)
+        current_key = f"{self.key}:{int(window)}"
+        previous_key = f"{self.key}:{int(window) - 1}"
+        counts = self.cache.get_many([current_key, previous_key])
+        self.current = counts.get(current_key, 0)
+        self.previous = counts.get(previous_key, 0)
+
+        if self.requests() >= self.num_requests:
+            return self.throttle_failure()
+
+        try:
+            self.cache.incr(current_key)
+        except ValueError:
+            # First request of the window, unless another worker's
+            # request has just started the counter.
+            if not self.cache.add(current_key, 1, 2 * self.duration):
+                self.cache.incr(current_key)
+        return True
+
+    def requests(self) -> float:
+        """Estimate the requests made in the last `duration` seconds."""
+        return (
+            self.previous * (1 - self.elapsed / self.duration)
+            + self.current
+        )
+
+    def wait(self):
+        if self.current < self.num_requests:
+            # The previous window slides out until a request fits.
+            share = 1 - (self.num_requests - self.current) / self.previous
+            return share * self.duration - self.elapsed
+        share = 1 - self.num_requests / self.current
+        return self.duration - self.elapsed + share * self.duration
+
+
+class AnonRateThrottle(
+    SlidingWindowRateThrottle, throttling.AnonRateThrottle
+):
+    pass
+
+
+class UserRateThrottle(
+    SlidingWindowRateThrottle, throttling.UserRateThrottle
+):
+    """
+    Throttle requests to views with a `throttle_scope` at the rate of
+    that scope for safe methods and of `<throttle_scope>_write` for
+    the others, each with its own counters. Views without a scope, and
+    scopes without a configured rate, use the "user" rate.
+    """
+
+    def allow_request(self, request, view):
+        scope = getattr(view, "throttle_scope", None)
+        if scope and request.method not in SAFE_METHODS:
+            scope = f"{scope}_write"
+        if scope in self.THROTTLE_RATES:
+            self.scope = scope
+            self.rate = self.get_rate()
+            self.num_requests, self.duration = self.parse_rate(self.rate)
+        return super().allow_request(request, view)
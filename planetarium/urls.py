@@ -1,21 +1,26 @@
 from django.urls import path, include
 from rest_framework import routers
 
+from planetarium.async_views import (
+    AsyncAstronomyShowViewSet,
+    AsyncShowSessionViewSet,
+    AsyncReservationViewSet
+)
 from planetarium.views import (
     ShowThemeViewSet,
-    PlanetariumDomeViewSet,
-    AstronomyShowViewSet,
-    ShowSessionViewSet,
-    ReservationViewSet
+    PlanetariumDomeViewSet
 )
 
 router = routers.DefaultRouter()
 router.register("show_themes", ShowThemeViewSet)
 router.register("planetarium_domes", PlanetariumDomeViewSet)
-router.register("astronomy_shows", AstronomyShowViewSet)
-router.register("show_sessions", ShowSessionViewSet)
-router.register("reservations", ReservationViewSet)
+# The hot endpoints are served by coroutines, natively under ASGI.
+router.register("astronomy_shows", AsyncAstronomyShowViewSet)
+router.register("show_sessions", AsyncShowSessionViewSet)
+router.register("reservations", AsyncReservationViewSet)
 
-urlpatterns = [path("", include(router.urls))]
+urlpatterns = [
+    path("", include(router.urls)),
+]
 
 app_name = "planetarium"
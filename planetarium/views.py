@@ -1,9 +1,23 @@
-from django.db.models import Count, F
+import functools
+from datetime import timedelta
+
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    TrigramWordSimilarity,
+)
+from django.db import transaction
+from django.db.models import F, Prefetch, Q, Sum
+from django.http import StreamingHttpResponse
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 from django.utils.dateparse import parse_date
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import (
+    CursorPagination,
+    PageNumberPagination
+)
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework.response import Response
 
@@ -12,9 +26,28 @@ from planetarium.models import (
     PlanetariumDome,
     AstronomyShow,
     ShowSession,
-    Reservation
+    ShowSessionDailyRollup,
+    Reservation,
+    SeatHold,
+    Ticket
+)
+from planetarium.caching import CachedResponseMixin
+from planetarium.conditional import ConditionalGetMixin
+from planetarium.dates import day_start, parse_time_bound
+from planetarium.exports import (
+    EXPORT_FORMATS,
+    export_lines,
+    ticket_export_queryset
 )
+from planetarium.fieldsets import SPARSE_FIELDS_PARAMETER, SparseFieldsetMixin
+from planetarium.image_variants import (
+    delete_image_variants,
+    generate_image_variants
+)
+from planetarium.middleware import SerializerTimingMixin
 from planetarium.permissions import IsAdminOrIfAuthenticatedReadOnly
+from planetarium.replicas import ReplicaReadMixin
+from planetarium.seat_map import get_seat_map
 from planetarium.serializers import (
     ShowThemeSerializer,
     PlanetariumDomeSerializer,
@@ -25,34 +58,77 @@ from planetarium.serializers import (
     ShowSessionRetrieveSerializer,
     ReservationSerializer,
     ReservationListSerializer,
+    SeatMapSerializer,
+    SeatHoldSerializer,
+    ShowSessionScheduleSerializer,
+    ShowSessionCalendarSerializer,
     AstronomyShowDetailSerializer,
     AstronomyShowImageSerializer,
 )
+from planetarium.values_serializers import ValuesListMixin
 
 
-class ShowThemeViewSet(viewsets.ModelViewSet):
+class ShowThemeViewSet(
+    ReplicaReadMixin,
+    CachedResponseMixin,
+    ConditionalGetMixin,
+    SparseFieldsetMixin,
+    SerializerTimingMixin,
+    viewsets.ModelViewSet
+):
     queryset = ShowTheme.objects.all()
     serializer_class = ShowThemeSerializer
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
+    throttle_scope = "catalog"
+    cache_models = (ShowTheme,)
 
 
-class PlanetariumDomeViewSet(viewsets.ModelViewSet):
+class PlanetariumDomeViewSet(
+    ReplicaReadMixin,
+    CachedResponseMixin,
+    ConditionalGetMixin,
+    SparseFieldsetMixin,
+    SerializerTimingMixin,
+    viewsets.ModelViewSet
+):
     queryset = PlanetariumDome.objects.all()
     serializer_class = PlanetariumDomeSerializer
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
+    throttle_scope = "catalog"
+    cache_models = (PlanetariumDome,)
+    sparse_field_lookups = {"capacity": ("rows", "seats_in_row")}
+
+
+class AstronomyShowSearchPagination(PageNumberPagination):
+    page_size = 10
+    page_size_query_param = "page_size"
+    max_page_size = 50
 
 
-class AstronomyShowViewSet(viewsets.ModelViewSet):
-    queryset = AstronomyShow.objects.prefetch_related("show_themes")
+class AstronomyShowViewSet(
+    ReplicaReadMixin,
+    CachedResponseMixin,
+    ConditionalGetMixin,
+    SparseFieldsetMixin,
+    SerializerTimingMixin,
+    ValuesListMixin,
+    viewsets.ModelViewSet
+):
+    queryset = AstronomyShow.objects.prefetch_related(
+        "show_themes"
+    ).defer("search_vector")
     serializer_class = AstronomyShowSerializer
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
+    throttle_scope = "catalog"
+    cache_models = (AstronomyShow, ShowTheme)
+    sparse_actions = ("list", "search")
 
     @staticmethod
     def _params_to_ints(query_string):
         return [int(str_id) for str_id in query_string.split(",")]
 
     def get_queryset(self):
-        queryset = self.queryset
+        queryset = super().get_queryset()
         title = self.request.query_params.get("title")
         show_themes = self.request.query_params.get("show_themes")
 
@@ -60,11 +136,15 @@ class AstronomyShowViewSet(viewsets.ModelViewSet):
             queryset = queryset.filter(title__icontains=title)
         if show_themes:
             show_themes = self._params_to_ints(show_themes)
-            queryset = queryset.filter(show_themes__id__in=show_themes)
-        return queryset.distinct()
+            queryset = queryset.filter(
+                id__in=AstronomyShow.show_themes.through.objects.filter(
+                    showtheme_id__in=show_themes
+                ).values("astronomyshow_id")
+            )
+        return queryset
 
     def get_serializer_class(self):
-        if self.action == "list":
+        if self.action in ("list", "search"):
             return AstronomyShowListSerializer
         if self.action == "retrieve":
             return AstronomyShowDetailSerializer
@@ -78,14 +158,65 @@ class AstronomyShowViewSet(viewsets.ModelViewSet):
         permission_classes=[IsAdminUser],
         url_path="upload-image"
     )
-    def upload_image(self, request):
+    def upload_image(self, request, pk=None):
         movie = self.get_object()
+        stale_variants = movie.image_variants
         serializer = self.get_serializer(movie, data=request.data)
         if serializer.is_valid():
-            serializer.save()
+            astronomy_show = serializer.save(image_variants={})
+            transaction.on_commit(
+                functools.partial(delete_image_variants, stale_variants)
+            )
+            if astronomy_show.image:
+                transaction.on_commit(functools.partial(
+                    generate_image_variants,
+                    astronomy_show.id,
+                    astronomy_show.image.name
+                ))
             return Response(serializer.data, status=status.HTTP_200_OK)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "q",
+                type={"type": "string"},
+                required=True,
+                description="Search astronomy shows by title and description, "
+                            "tolerating typos and partial words in titles "
+                            "(ex. ?q=big bang)",
+            ),
+            SPARSE_FIELDS_PARAMETER,
+        ]
+    )
+    @action(
+        methods=["GET"],
+        detail=False,
+        url_path="search",
+        pagination_class=AstronomyShowSearchPagination
+    )
+    def search(self, request):
+        """Search astronomy shows ranked by relevance."""
+        text = request.query_params.get("q", "").strip()
+        if not text:
+            raise ValidationError({"q": "This query parameter is required."})
+
+        query = SearchQuery(text, config="english", search_type="websearch")
+        queryset = self.filter_queryset(
+            self.queryset
+            .filter(
+                Q(search_vector=query) | Q(title__trigram_word_similar=text)
+            )
+            .annotate(
+                rank=SearchRank(F("search_vector"), query)
+                + TrigramWordSimilarity(text, "title")
+            )
+            .order_by("-rank", "id")
+        )
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
     @extend_schema(
         parameters=[
             OpenApiParameter(
@@ -98,6 +229,7 @@ class AstronomyShowViewSet(viewsets.ModelViewSet):
                 type={"type": "list", "items": {"type": "number"}},
                 description="Filter by show themes id (ex. ?show_themes=4,5)",
             ),
+            SPARSE_FIELDS_PARAMETER,
         ]
     )
     def list(self, request, *args, **kwargs):
@@ -105,33 +237,86 @@ class AstronomyShowViewSet(viewsets.ModelViewSet):
         return super().list(request, *args, **kwargs)
 
 
-class ShowSessionViewSet(viewsets.ModelViewSet):
+MAX_CALENDAR_DAYS = 366
+
+
+class ShowSessionPagination(CursorPagination):
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    ordering = ("-show_time", "id")
+
+
+class ShowSessionViewSet(
+    ReplicaReadMixin,
+    ConditionalGetMixin,
+    SparseFieldsetMixin,
+    SerializerTimingMixin,
+    ValuesListMixin,
+    viewsets.ModelViewSet
+):
     queryset = ShowSession.objects.all().select_related(
         "astronomy_show", "planetarium_dome"
-    )
+    ).defer("astronomy_show__search_vector")
     serializer_class = ShowSessionSerializer
+    pagination_class = ShowSessionPagination
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
+    throttle_scope = "catalog"
+    last_modified_lookups = (
+        "updated_at",
+        "astronomy_show__updated_at",
+        "planetarium_dome__updated_at",
+    )
+    sparse_field_lookups = {
+        "planetarium_dome_capacity": (
+            "planetarium_dome__rows", "planetarium_dome__seats_in_row"
+        ),
+        "tickets_available": (
+            "tickets_sold",
+            "planetarium_dome__rows",
+            "planetarium_dome__seats_in_row"
+        ),
+    }
+    values_expressions = {
+        "planetarium_dome_capacity": (
+            F("planetarium_dome__rows") * F("planetarium_dome__seats_in_row")
+        ),
+        "tickets_available": (
+            F("planetarium_dome__rows") * F("planetarium_dome__seats_in_row")
+            - F("tickets_sold")
+        ),
+    }
 
     def get_queryset(self):
-        queryset = (
-            ShowSession.objects.all().select_related(
-                "astronomy_show", "planetarium_dome"
-            )
-            .annotate(
-                tickets_available=F("planetarium_dome__rows")
-                * F("planetarium_dome__seats_in_row")
-                - Count("tickets")
-            )
-        )
+        queryset = super().get_queryset()
         astronomy_show = self.request.query_params.get("astronomy_show")
         date = self.request.query_params.get("date")
+        time_from = self.request.query_params.get("from")
+        time_to = self.request.query_params.get("to")
 
         if astronomy_show:
             queryset = queryset.filter(astronomy_show__id=int(astronomy_show))
         if date:
             parsed_date = parse_date(date)
             if parsed_date:
-                queryset = queryset.filter(show_time__date=parsed_date)
+                queryset = queryset.filter(
+                    show_time__gte=day_start(parsed_date),
+                    show_time__lt=day_start(
+                        parsed_date + timedelta(days=1)
+                    ),
+                )
+        if time_from:
+            bound = parse_time_bound(time_from)
+            if bound:
+                queryset = queryset.filter(show_time__gte=bound)
+        if time_to:
+            bound = parse_time_bound(time_to, end=True)
+            if bound:
+                queryset = queryset.filter(show_time__lt=bound)
+        if self.action == "retrieve":
+            queryset = queryset.prefetch_related(
+                "astronomy_show__show_themes"
+            )
         return queryset
 
     def get_serializer_class(self):
@@ -139,8 +324,183 @@ class ShowSessionViewSet(viewsets.ModelViewSet):
             return ShowSessionListSerializer
         if self.action == "retrieve":
             return ShowSessionRetrieveSerializer
+        if self.action == "seat_map":
+            return SeatMapSerializer
+        if self.action == "hold":
+            return SeatHoldSerializer
+        if self.action == "schedule":
+            return ShowSessionScheduleSerializer
+        if self.action == "calendar":
+            return ShowSessionCalendarSerializer
         return ShowSessionSerializer
 
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "from",
+                type={"type": "string"},
+                required=True,
+                description="First day (ex. ?from=2024-11-01)",
+            ),
+            OpenApiParameter(
+                "to",
+                type={"type": "string"},
+                required=True,
+                description="Last day, inclusive (ex. ?to=2024-11-30)",
+            ),
+            OpenApiParameter(
+                "astronomy_show",
+                type={"type": "number"},
+                description="Only sessions of an astronomy show "
+                            "(ex. ?astronomy_show=4)",
+            ),
+            OpenApiParameter(
+                "planetarium_dome",
+                type={"type": "number"},
+                description="Only sessions in a planetarium dome "
+                            "(ex. ?planetarium_dome=2)",
+            ),
+        ]
+    )
+    @action(
+        methods=["GET"],
+        detail=False,
+        url_path="calendar",
+        pagination_class=None
+    )
+    def calendar(self, request):
+        """
+        Get the number of show sessions, seats and available seats of
+        every day with sessions in a date range, from the daily rollups.
+        """
+        params = request.query_params
+        days = {}
+        for param in ("from", "to"):
+            try:
+                days[param] = parse_date(params.get(param, ""))
+            except ValueError:
+                days[param] = None
+            if days[param] is None:
+                raise ValidationError({param: "Enter a valid date."})
+        if not 0 <= (days["to"] - days["from"]).days < MAX_CALENDAR_DAYS:
+            raise ValidationError({
+                "to": f"The range must span 1 to {MAX_CALENDAR_DAYS} days."
+            })
+
+        rollups = ShowSessionDailyRollup.objects.filter(
+            day__gte=days["from"], day__lte=days["to"]
+        )
+        for param in ("astronomy_show", "planetarium_dome"):
+            value = params.get(param)
+            if value:
+                if not value.isdigit():
+                    raise ValidationError({param: "Enter a valid id."})
+                rollups = rollups.filter(**{f"{param}_id": int(value)})
+        calendar_days = (
+            rollups.values("day")
+            .annotate(
+                total_show_sessions=Sum("show_sessions"),
+                total_seats=Sum("seats"),
+                total_tickets_available=Sum("seats") - Sum("tickets_sold"),
+            )
+            .order_by("day")
+        )
+        serializer = self.get_serializer(calendar_days, many=True)
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+    @action(
+        methods=["POST"],
+        detail=False,
+        url_path="schedule"
+    )
+    def schedule(self, request):
+        """
+        Schedule many sessions of a show in a dome at once, from a
+        weekly recurrence (weekdays, times, start and end dates) or an
+        explicit list of show times. Return the created session ids.
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Get a show session with its taken places as a base64 encoded
+        bitmap, like the seat map.
+        """
+        return self.conditional_response(
+            self.retrieve_show_session, request, *args, **kwargs
+        )
+
+    def retrieve_show_session(self, request, *args, **kwargs):
+        show_session = self.get_object()
+        show_session.seat_map = get_seat_map(show_session.id, show_session)
+        serializer = self.get_serializer(show_session)
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+    @action(
+        methods=["GET"],
+        detail=True,
+        url_path="seat-map"
+    )
+    def seat_map(self, request, pk=None):
+        """
+        Get taken seats of a show session as a base64 encoded bitmap:
+        one bit per seat, row by row, most significant bit first.
+        """
+        try:
+            seat_map = get_seat_map(int(pk))
+        except ValueError:
+            seat_map = None
+        if seat_map is None:
+            raise NotFound()
+        serializer = self.get_serializer(seat_map)
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+    @action(
+        methods=["GET", "POST", "DELETE"],
+        detail=True,
+        permission_classes=[IsAuthenticated],
+        url_path="hold"
+    )
+    def hold(self, request, pk=None):
+        """
+        Hold seats of a show session for a few minutes before
+        reserving them. Holding again replaces the previous hold.
+        """
+        show_session = self.get_object()
+
+        if request.method == "DELETE":
+            show_session.release_seats(request.user)
+            return Response(status=status.HTTP_204_NO_CONTENT)
+
+        if request.method == "POST":
+            serializer = self.get_serializer(
+                data=request.data,
+                context={
+                    **self.get_serializer_context(),
+                    "show_session": show_session
+                }
+            )
+            serializer.is_valid(raise_exception=True)
+            serializer.save()
+            return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+        seat_holds = list(
+            SeatHold.objects.active()
+            .filter(show_session=show_session, user=request.user)
+            .order_by("row", "seat")
+        )
+        if not seat_holds:
+            raise NotFound()
+        serializer = self.get_serializer({
+            "show_session_id": show_session.id,
+            "places": seat_holds,
+            "expires_at": seat_holds[0].expires_at,
+        })
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
     @extend_schema(
         parameters=[
             OpenApiParameter(
@@ -148,11 +508,24 @@ class ShowSessionViewSet(viewsets.ModelViewSet):
                 type={"type": "string"},
                 description="Filter by date (ex. ?date=2024-11-20)",
             ),
+            OpenApiParameter(
+                "from",
+                type={"type": "string"},
+                description="Filter by show time from a date or datetime "
+                            "(ex. ?from=2024-11-20 or ?from=2024-11-20T18:00)",
+            ),
+            OpenApiParameter(
+                "to",
+                type={"type": "string"},
+                description="Filter by show time up to a date (inclusive) "
+                            "or before a datetime (ex. ?to=2024-11-27)",
+            ),
             OpenApiParameter(
                 "astronomy_show",
                 type={"type": "number"},
                 description="Filter by astronomy show id (ex. ?astronomy_show=4)",
             ),
+            SPARSE_FIELDS_PARAMETER,
         ]
     )
     def list(self, request, *args, **kwargs):
@@ -160,25 +533,46 @@ class ShowSessionViewSet(viewsets.ModelViewSet):
         return super().list(request, *args, **kwargs)
 
 
-class ReservationPagination(PageNumberPagination):
+class ReservationPagination(CursorPagination):
     page_size = 5
     page_size_query_param = "page_size"
     max_page_size = 20
+    ordering = ("-created_at", "id")
 
 
-class ReservationViewSet(viewsets.ModelViewSet):
+class ReservationViewSet(
+    ReplicaReadMixin,
+    SparseFieldsetMixin,
+    SerializerTimingMixin,
+    viewsets.ModelViewSet
+):
     queryset = Reservation.objects.all()
     serializer_class = ReservationSerializer
     pagination_class = ReservationPagination
     permission_classes = (IsAuthenticated,)
+    throttle_scope = "reservation"
+    # Reservations are read from the primary, their writes pin the
+    # user to it.
+    replica_reads = False
 
     def get_queryset(self):
         queryset = self.queryset.filter(user=self.request.user)
 
         if self.action == "list":
+            # One query for the tickets of the whole page, joined to
+            # everything the nested show session reads.
+            # tickets_available comes from the tickets_sold counter.
             queryset = queryset.prefetch_related(
-                "tickets__show_session__planetarium_dome"
+                Prefetch(
+                    "tickets",
+                    queryset=Ticket.objects.select_related(
+                        "show_session__astronomy_show",
+                        "show_session__planetarium_dome"
+                    ).defer("show_session__astronomy_show__search_vector")
+                )
             )
+        elif self.action == "retrieve":
+            queryset = queryset.prefetch_related("tickets")
         return queryset
 
     def perform_create(self, serializer):
@@ -190,3 +584,75 @@ class ReservationViewSet(viewsets.ModelViewSet):
         if self.action == "list":
             serializer = ReservationListSerializer
         return serializer
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "output",
+                type={"type": "string", "enum": list(EXPORT_FORMATS)},
+                description="Export format, csv by default "
+                            "(ex. ?output=ndjson)",
+            ),
+            OpenApiParameter(
+                "from",
+                type={"type": "string"},
+                description="Only tickets reserved from a date or datetime "
+                            "(ex. ?from=2024-11-01)",
+            ),
+            OpenApiParameter(
+                "to",
+                type={"type": "string"},
+                description="Only tickets reserved up to a date (inclusive) "
+                            "or before a datetime (ex. ?to=2024-11-30)",
+            ),
+            OpenApiParameter(
+                "show_session",
+                type={"type": "number"},
+                description="Only tickets of a show session "
+                            "(ex. ?show_session=4)",
+            ),
+        ],
+        responses={(200, "text/csv"): str, (200, "application/x-ndjson"): str}
+    )
+    @action(
+        methods=["GET"],
+        detail=False,
+        permission_classes=[IsAdminUser],
+        url_path="export"
+    )
+    def export(self, request):
+        """
+        Stream all sold tickets with their reservation, user, show
+        session, show and dome as CSV or NDJSON.
+        """
+        params = request.query_params
+        export_format = params.get("output", "csv")
+        if export_format not in EXPORT_FORMATS:
+            raise ValidationError({
+                "output": f"Choose one of: {', '.join(EXPORT_FORMATS)}."
+            })
+        bounds = {}
+        for param, end in (("from", False), ("to", True)):
+            if params.get(param):
+                bounds[param] = parse_time_bound(params[param], end=end)
+                if bounds[param] is None:
+                    raise ValidationError(
+                        {param: "Enter a valid date or datetime."}
+                    )
+        show_session = params.get("show_session")
+        if show_session and not show_session.isdigit():
+            raise ValidationError({"show_session": "Enter a valid id."})
+
+        queryset = ticket_export_queryset(
+            reserved_from=bounds.get("from"),
+            reserved_to=bounds.get("to"),
+            show_session=show_session and int(show_session),
+        )
+        response = StreamingHttpResponse(
+            export_lines(queryset, export_format),
+            content_type=EXPORT_FORMATS[export_format]
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="tickets.{export_format}"'
+        )
+        return response
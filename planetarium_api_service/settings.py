@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
+import importlib.util
 import os
 
 from datetime import timedelta
@@ -23,9 +24,11 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 # See https://docs.djangoproject.com/en/5.1/howto/deployment/checklist/
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+DEBUG = os.environ.get("DEBUG") == "1"
 
-ALLOWED_HOSTS = []
+ALLOWED_HOSTS = os.environ.get(
+    "ALLOWED_HOSTS", "localhost,127.0.0.1"
+).split(",")
 
 INTERNAL_IPS = [
     "127.0.0.1",
@@ -40,10 +43,10 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "rest_framework",
     "rest_framework.authtoken",
     "drf_spectacular",
-    "debug_toolbar",
     "planetarium",
     "user",
 ]
@@ -52,15 +55,21 @@ AUTH_USER_MODEL = "user.User"
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
-    "debug_toolbar.middleware.DebugToolbarMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "planetarium.middleware.ServerTimingMiddleware",
 ]
 
+# The debug toolbar middleware is sync only: under ASGI it would run
+# every view, async ones included, in a thread.
+if DEBUG:
+    INSTALLED_APPS.append("debug_toolbar")
+    MIDDLEWARE.insert(1, "debug_toolbar.middleware.DebugToolbarMiddleware")
+
 ROOT_URLCONF = "planetarium_api_service.urls"
 
 TEMPLATES = [
@@ -93,6 +102,60 @@ DATABASES = {
         "PASSWORD": os.environ["POSTGRES_PASSWORD"],
         "HOST": os.environ["POSTGRES_HOST"],
         "PORT": os.environ["POSTGRES_PORT"],
+        # Reuse connections across requests, checking them before reuse,
+        # instead of connecting to PostgreSQL on every request.
+        "CONN_MAX_AGE": int(os.environ.get("DB_CONN_MAX_AGE", 600)),
+        "CONN_HEALTH_CHECKS": True,
+    }
+}
+
+# A pool of DB_POOL_MIN_SIZE to DB_POOL_MAX_SIZE connections per worker
+# instead of one persistent connection per thread, when DB_POOL_MAX_SIZE
+# is set. The ASGI server (manage.py serve --asgi) always pools them.
+DATABASE_POOL = {
+    "min_size": int(os.environ.get("DB_POOL_MIN_SIZE", 1)),
+    "max_size": int(os.environ.get("DB_POOL_MAX_SIZE", 10)),
+    "timeout": int(os.environ.get("DB_POOL_TIMEOUT", 10)),
+}
+if os.environ.get("DB_POOL_MAX_SIZE"):
+    DATABASES["default"]["CONN_MAX_AGE"] = 0
+    DATABASES["default"]["OPTIONS"] = {"pool": DATABASE_POOL}
+
+# Read replicas of the default database, for the safe requests of the
+# catalog endpoints: POSTGRES_REPLICAS="host[:port[:name]],..." adds
+# the aliases replica_1, replica_2... (see planetarium.replicas).
+DATABASE_REPLICAS = []
+for number, replica in enumerate(
+        filter(None, os.environ.get("POSTGRES_REPLICAS", "").split(",")),
+        start=1
+):
+    host, port, name = (replica.strip().split(":") + ["", ""])[:3]
+    DATABASES[f"replica_{number}"] = {
+        **DATABASES["default"],
+        "HOST": host,
+        "PORT": port or DATABASES["default"]["PORT"],
+        "NAME": name or DATABASES["default"]["NAME"],
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS.append(f"replica_{number}")
+
+DATABASE_ROUTERS = ["planetarium.replicas.ReplicaRouter"]
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+# Shared by every worker: throttling counters, cached responses, model
+# versions and seat maps must be seen by all of them.
+
+CACHES = {
+    "default": {
+        "BACKEND": os.environ.get(
+            "CACHE_BACKEND",
+            "django.core.cache.backends.redis.RedisCache"
+        ),
+        "LOCATION": os.environ.get(
+            "CACHE_LOCATION", "redis://localhost:6379/0"
+        ),
     }
 }
 
@@ -133,10 +196,16 @@ USE_TZ = True
 
 STATIC_URL = "static/"
 
+STATIC_ROOT = os.environ.get("STATIC_ROOT", "/files/static")
+
 MEDIA_URL = "/media/"
 
 MEDIA_ROOT = "/files/media"
 
+# Serve collected static files and uploaded media from the application,
+# when no web server in front serves STATIC_ROOT and MEDIA_ROOT.
+SERVE_FILES = DEBUG or os.environ.get("SERVE_FILES") == "1"
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
 
@@ -144,20 +213,44 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "user.authentication.CachedJWTAuthentication",
+    ],
+    "DEFAULT_RENDERER_CLASSES": [
+        "planetarium.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "planetarium.parsers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
     ],
     "DEFAULT_SCHEMA_CLASS":
         "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_THROTTLE_CLASSES": [
-        "rest_framework.throttling.AnonRateThrottle",
-        "rest_framework.throttling.UserRateThrottle"
+        "planetarium.throttling.AnonRateThrottle",
+        "planetarium.throttling.UserRateThrottle"
     ],
+    # Counters live in the default cache, shared by the workers. Views
+    # may set a throttle_scope: "<scope>" limits their reads and
+    # "<scope>_write" their writes, the "user" rate the rest.
     "DEFAULT_THROTTLE_RATES": {
         "anon": "20/minute",
-        "user": "40/minute"
+        "user": "40/minute",
+        "catalog": "120/minute",
+        "reservation_write": "10/minute",
     }
 }
 
+# MessagePack (Accept or Content-Type: application/msgpack) is served
+# when the optional msgpack package is installed.
+if importlib.util.find_spec("msgpack") is not None:
+    REST_FRAMEWORK["DEFAULT_RENDERER_CLASSES"].insert(
+        1, "planetarium.renderers.MessagePackRenderer"
+    )
+    REST_FRAMEWORK["DEFAULT_PARSER_CLASSES"].insert(
+        1, "planetarium.parsers.MessagePackParser"
+    )
+
 SPECTACULAR_SETTINGS = {
     "TITLE": "Planetarium Service API",
     "DESCRIPTION": "Order tickets for show sessions in planetarium",
@@ -170,6 +263,24 @@ SPECTACULAR_SETTINGS = {
     }
 }
 
+# Per-request SQL and timing lines of ServerTimingMiddleware.
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {
+            "class": "logging.StreamHandler",
+        },
+    },
+    "loggers": {
+        "planetarium.server_timing": {
+            "handlers": ["console"],
+            "level": os.environ.get("SERVER_TIMING_LOG_LEVEL", "INFO"),
+            "propagate": False,
+        },
+    },
+}
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=60),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=7),
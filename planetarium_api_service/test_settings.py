@@ -0,0 +1,27 @@
+"""
+Django settings for the test suite:
+
+    python manage.py test --settings=planetarium_api_service.test_settings
+"""
+
+import os
+
+from planetarium_api_service.settings import *  # noqa: F401,F403
+from planetarium_api_service.settings import DATABASES, LOGGING
+
+# A second connection to the test database stands in for a replica;
+# tests list it in DATABASE_REPLICAS where they need routing.
+DATABASES["replica_1"] = {
+    **DATABASES["default"], "TEST": {"MIRROR": "default"}
+}
+DATABASE_REPLICAS = []
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }
+}
+
+LOGGING["loggers"]["planetarium.server_timing"]["level"] = os.environ.get(
+    "SERVER_TIMING_LOG_LEVEL", "WARNING"
+)
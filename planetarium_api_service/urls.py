@@ -1,7 +1,9 @@
-from django.conf.urls.static import static
+import re
+
 from django.contrib import admin
 from django.conf import settings
-from django.urls import path, include
+from django.urls import path, include, re_path
+from django.views.static import serve
 from drf_spectacular.views import (
     SpectacularAPIView,
     SpectacularRedocView,
@@ -13,7 +15,6 @@ urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/planetarium/", include("planetarium.urls", namespace="planetarium")),
     path("api/user/", include("user.urls", namespace="user")),
-    path("__debug__/", include("debug_toolbar.urls")),
     path("api/schema/",
          SpectacularAPIView.as_view(),
          name="schema"),
@@ -23,4 +24,26 @@ urlpatterns = [
     path("api/doc/redoc/",
          SpectacularRedocView.as_view(url_name="schema"),
          name="redoc"),
-] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+]
+
+
+def file_urlpatterns() -> list:
+    if not settings.SERVE_FILES:
+        return []
+    return [
+        re_path(
+            rf"^{re.escape(prefix.lstrip('/'))}(?P<path>.*)$",
+            serve,
+            {"document_root": document_root}
+        )
+        for prefix, document_root in (
+            (settings.STATIC_URL, settings.STATIC_ROOT),
+            (settings.MEDIA_URL, settings.MEDIA_ROOT),
+        )
+    ]
+
+
+urlpatterns += file_urlpatterns()
+
+if settings.DEBUG:
+    urlpatterns.append(path("__debug__/", include("debug_toolbar.urls")))
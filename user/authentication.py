@@ -0,0 +1,105 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from django.contrib.auth.base_user import AbstractBaseUser
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import Token
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from planetarium.caching import bump_version, get_version
+
+
+USER_CACHE_SIZE = 1024
+USER_CACHE_TIMEOUT = 60
+
+
+def user_version_key(user_id) -> str:
+    return f"user:version:{user_id}"
+
+
+def get_user_version(user_id) -> int:
+    return get_version(user_version_key(user_id))
+
+
+def bump_user_version(user_id) -> None:
+    bump_version(user_version_key(user_id))
+
+
+class UserCache:
+    """
+    Bounded, thread-safe in-process cache of users by id. Entries
+    expire after `timeout` seconds and are only returned for the user
+    version they were loaded at; the least recently used entry is
+    dropped once `size` users are cached.
+    """
+
+    def __init__(self, size: int, timeout: float):
+        self.size = size
+        self.timeout = timeout
+        self._users = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id, version) -> Optional[AbstractBaseUser]:
+        with self._lock:
+            entry = self._users.get(user_id)
+            if entry is None:
+                return None
+            expires, entry_version, user = entry
+            if entry_version != version or expires <= time.monotonic():
+                del self._users[user_id]
+                return None
+            self._users.move_to_end(user_id)
+        # Requests may change their user, never the cached one.
+        return copy.copy(user)
+
+    def set(self, user_id, version, user: AbstractBaseUser) -> None:
+        entry = (time.monotonic() + self.timeout, version, copy.copy(user))
+        with self._lock:
+            self._users[user_id] = entry
+            self._users.move_to_end(user_id)
+            while len(self._users) > self.size:
+                self._users.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._users.clear()
+
+
+user_cache = UserCache(USER_CACHE_SIZE, USER_CACHE_TIMEOUT)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication resolving token users from `user_cache` instead
+    of loading them on every request. Saving or deleting a user bumps
+    its version in the shared cache, which makes every worker reload
+    it on its next request; `USER_CACHE_TIMEOUT` bounds how stale a
+    user changed without signals (e.g. queryset.update()) can be.
+    """
+
+    def get_user(self, validated_token: Token) -> AbstractBaseUser:
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None:
+            return super().get_user(validated_token)
+
+        # Read the version first: a user changed while it is loaded
+        # is cached under the version it had before the change.
+        version = get_user_version(user_id)
+        user = user_cache.get(user_id, version)
+        if user is None:
+            user = super().get_user(validated_token)
+            user_cache.set(user_id, version, user)
+        elif api_settings.CHECK_REVOKE_TOKEN and validated_token.get(
+                api_settings.REVOKE_TOKEN_CLAIM
+        ) != get_md5_hash_password(user.password):
+            raise AuthenticationFailed(
+                _("The user's password has been changed."),
+                code="password_changed"
+            )
+        return user
@@ -0,0 +1,15 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from user.authentication import bump_user_version
+
+
+@receiver(post_save, sender=get_user_model())
+@receiver(post_delete, sender=get_user_model())
+def user_changed(sender, instance, **kwargs):
+    # Bump again on commit: a user cached between the first bump and
+    # the commit was loaded before this write.
+    bump_user_version(instance.pk)
+    transaction.on_commit(lambda: bump_user_version(instance.pk))
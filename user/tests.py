@@ -1,3 +1,140 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from user.authentication import (
+    UserCache,
+    bump_user_version,
+    get_user_version,
+    user_cache
+)
+
+
+MANAGE_USER_URL = reverse("user:manage")
+PLANETARIUM_DOME_URL = reverse("planetarium:planetariumdome-list")
+
+
+class CachedJWTAuthenticationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        user_cache.clear()
+        self.user = get_user_model().objects.create_user(
+            email="test_user@example.com", password="testpassword"
+        )
+        self.client = APIClient()
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}"
+        )
+
+    def user_queries(self, url=MANAGE_USER_URL):
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(url)
+        return res, [
+            query["sql"] for query in queries.captured_queries
+            if '"user_user"' in query["sql"]
+        ]
+
+    def test_user_is_loaded_once(self):
+        res, queries = self.user_queries()
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(queries), 1)
+
+        res, queries = self.user_queries()
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["email"], "test_user@example.com")
+        self.assertEqual(queries, [])
+
+    def test_update_through_manage_user_view_reloads_user(self):
+        self.user_queries()
+
+        res = self.client.patch(MANAGE_USER_URL, {"email": "new@example.com"})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        res, queries = self.user_queries()
+        self.assertEqual(res.data["email"], "new@example.com")
+        self.assertEqual(len(queries), 1)
+
+    def test_is_staff_change_is_seen(self):
+        res = self.client.post(PLANETARIUM_DOME_URL, {})
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.user.is_staff = True
+        self.user.save()
+
+        res = self.client.post(
+            PLANETARIUM_DOME_URL,
+            {"name": "Glass", "rows": 10, "seats_in_row": 12}
+        )
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+    def test_deactivated_user_is_rejected(self):
+        self.user_queries()
+
+        self.user.is_active = False
+        self.user.save()
+
+        res = self.client.get(MANAGE_USER_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_version_bumped_by_another_worker_reloads_user(self):
+        self.user_queries()
+        get_user_model().objects.filter(id=self.user.id).update(
+            first_name="Ada"
+        )
+
+        bump_user_version(self.user.id)
+
+        res, queries = self.user_queries()
+        self.assertEqual(len(queries), 1)
+
+    def test_schema_documents_jwt_security(self):
+        res = self.client.get(reverse("schema"), {"format": "json"})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        schema = res.json()
+        self.assertIn("jwtAuth", schema["components"]["securitySchemes"])
+        self.assertIn(
+            {"jwtAuth": []},
+            schema["paths"]["/api/user/me/"]["get"]["security"]
+        )
+
+    def test_requests_do_not_change_the_cached_user(self):
+        self.user_queries()
+        cached = user_cache.get(self.user.id, get_user_version(self.user.id))
+        cached.email = "changed@example.com"
+
+        res, _ = self.user_queries()
+        self.assertEqual(res.data["email"], "test_user@example.com")
+
+
+class UserCacheTests(TestCase):
+    def test_least_recently_used_user_is_dropped(self):
+        users = UserCache(size=2, timeout=60)
+        for user_id in (1, 2):
+            users.set(user_id, 1, get_user_model()(id=user_id))
+        users.get(1, 1)
+
+        users.set(3, 1, get_user_model()(id=3))
+
+        self.assertIsNotNone(users.get(1, 1))
+        self.assertIsNone(users.get(2, 1))
+        self.assertIsNotNone(users.get(3, 1))
+
+    def test_stale_version_and_expired_entries_are_missed(self):
+        users = UserCache(size=2, timeout=60)
+        users.set(1, 1, get_user_model()(id=1))
+
+        self.assertIsNone(users.get(1, 2))
 
-# Create your tests here.
+        users.set(1, 2, get_user_model()(id=1))
+        with mock.patch("user.authentication.time.monotonic") as monotonic:
+            monotonic.return_value = 10 ** 12
+            self.assertIsNone(users.get(1, 2))